@@ -0,0 +1,91 @@
+"""
+Compiled sliding-window kernels for TechnicalAnalyzer.
+
+Each kernel mirrors the pure-Python loop it replaces (same summation order),
+so results are identical; warm-up positions are NaN. numba is optional: when
+it is not installed the kernels run as plain Python.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def sma_loop(values, window):
+    """Simple moving average; NaN until `window` values are available."""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    for i in range(window - 1, n):
+        total = 0.0
+        for j in range(i - window + 1, i + 1):
+            total += values[j]
+        out[i] = total / window
+    return out
+
+
+@njit(cache=True)
+def ema_loop(values, window):
+    """Exponential moving average seeded with the SMA of the first `window` values."""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+
+    alpha = 2 / (window + 1)
+    total = 0.0
+    for j in range(window):
+        total += values[j]
+    ema = total / window
+    out[window - 1] = ema
+
+    for i in range(window, n):
+        ema = alpha * values[i] + (1 - alpha) * ema
+        out[i] = ema
+    return out
+
+
+@njit(cache=True)
+def rsi_loop(values, window):
+    """Wilder RSI; the first value lands on the bar after `window` price changes."""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if n < window + 1:
+        return out
+
+    gains = np.empty(n - 1)
+    losses = np.empty(n - 1)
+    for i in range(1, n):
+        change = values[i] - values[i - 1]
+        gains[i - 1] = max(change, 0.0)
+        losses[i - 1] = abs(min(change, 0.0))
+
+    alpha = 1 / window
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(window - 1, n - 1):
+        if i == window - 1:
+            # First RSI calculation uses simple average
+            gain_total = 0.0
+            loss_total = 0.0
+            for j in range(window):
+                gain_total += gains[j]
+                loss_total += losses[j]
+            avg_gain = gain_total / window
+            avg_loss = loss_total / window
+        else:
+            avg_gain = alpha * gains[i] + (1 - alpha) * avg_gain
+            avg_loss = alpha * losses[i] + (1 - alpha) * avg_loss
+
+        if avg_loss == 0:
+            out[i + 1] = 100.0
+        else:
+            rs = avg_gain / avg_loss
+            out[i + 1] = 100 - (100 / (1 + rs))
+    return out
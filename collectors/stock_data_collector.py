@@ -1,7 +1,7 @@
 """
 Stock data collector using pykrx library.
 """
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Optional, Dict, Any
 import pandas as pd
 import logging
@@ -91,6 +91,8 @@ class StockDataCollector:
                 logger.warning(f"No OHLCV data found for {ticker} from {start_date} to {end_date}")
                 return []
             
+            # One creation timestamp shared by the whole batch
+            created_at = datetime.utcnow()
             ohlcv_data = []
             for date_idx, row in df.iterrows():
                 ohlcv = OHLCVData(
@@ -100,7 +102,8 @@ class StockDataCollector:
                     low=float(row['저가']),
                     close=float(row['종가']),
                     volume=int(row['거래량']),
-                    ticker=ticker
+                    ticker=ticker,
+                    created_at=created_at
                 )
                 ohlcv_data.append(ohlcv)
             
@@ -8,14 +8,54 @@
 import asyncio
 import logging
 from datetime import datetime, timezone, timedelta, date
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
-from schemas import OHLCVData, TechnicalIndicators, AnalyzedStockData
+from schemas import OHLCVData, TechnicalIndicators, AnalyzedStockDict
+from ._indicator_njit import ema_loop, rsi_loop, sma_loop
 
 logger = logging.getLogger(__name__)
 
+# Indicator columns produced by TechnicalAnalyzer.analyze_panel
+INDICATOR_COLUMNS = list(TechnicalIndicators.model_fields)
+
+# Smoothing state analyze_panel(with_state=True) adds for extract_state
+STATE_COLUMNS = ["rsi_avg_gain", "rsi_avg_loss"]
+
+# Bars kept in an indicator state: the longest rolling window (sma_60)
+STATE_WINDOW = 60
+
+
+def _to_optional_list(values: np.ndarray) -> List[Optional[float]]:
+    """Convert a kernel result to the list form used by calculate_*, NaN as None."""
+    return [None if np.isnan(value) else float(value) for value in values]
+
+
+def _window_mean(values: List[float]) -> float:
+    """Mean summed left to right, matching the sma_loop kernel."""
+    total = 0.0
+    for value in values:
+        total += value
+    return total / len(values)
+
+
+def _seeded_ewm(series: pd.Series, window: int, alpha: float) -> pd.Series:
+    """Exponential smoothing seeded with the SMA of the first `window` valid values.
+    
+    Mirrors calculate_ema/calculate_rsi: leading NaNs are skipped and every
+    position before the seed stays NaN.
+    """
+    valid = series.dropna()
+    if len(valid) < window:
+        return pd.Series(np.nan, index=series.index)
+    
+    seeded = valid.astype(float)
+    seeded.iloc[:window - 1] = np.nan
+    seeded.iloc[window - 1] = valid.iloc[:window].mean()
+    return seeded.ewm(alpha=alpha, adjust=False).mean().reindex(series.index)
+
 
 class TechnicalAnalyzer:
     """한국 주식 기술적 분석기"""
@@ -46,35 +86,15 @@ class TechnicalAnalyzer:
         if len(prices) < window:
             return [None] * len(prices)
         
-        sma_values = []
-        for i in range(len(prices)):
-            if i < window - 1:
-                sma_values.append(None)
-            else:
-                sma = sum(prices[i-window+1:i+1]) / window
-                sma_values.append(sma)
-        
-        return sma_values
+        return _to_optional_list(sma_loop(np.asarray(prices, dtype=np.float64), window))
     
     def calculate_ema(self, prices: List[float], window: int) -> List[Optional[float]]:
         """Calculate Exponential Moving Average."""
         if len(prices) < window:
             return [None] * len(prices)
         
-        alpha = 2 / (window + 1)
-        ema_values = []
-        
-        # First EMA is SMA
-        first_sma = sum(prices[:window]) / window
-        ema_values.extend([None] * (window - 1))
-        ema_values.append(first_sma)
-        
-        # Calculate subsequent EMAs
-        for i in range(window, len(prices)):
-            ema = alpha * prices[i] + (1 - alpha) * ema_values[-1]
-            ema_values.append(ema)
-        
-        return ema_values
+        # First EMA is SMA, then alpha = 2 / (window + 1) smoothing
+        return _to_optional_list(ema_loop(np.asarray(prices, dtype=np.float64), window))
     
     def calculate_macd(self, prices: List[float], 
                       fast_period: int = 12, slow_period: int = 26, 
@@ -133,37 +153,8 @@ class TechnicalAnalyzer:
         if len(prices) < window + 1:
             return [None] * len(prices)
         
-        # Calculate price changes
-        price_changes = []
-        for i in range(1, len(prices)):
-            price_changes.append(prices[i] - prices[i-1])
-        
-        rsi_values = [None]  # First value is always None
-        
-        # Calculate gains and losses
-        gains = [max(change, 0) for change in price_changes]
-        losses = [abs(min(change, 0)) for change in price_changes]
-        
-        for i in range(window - 1, len(price_changes)):
-            if i == window - 1:
-                # First RSI calculation uses simple average
-                avg_gain = sum(gains[i-window+1:i+1]) / window
-                avg_loss = sum(losses[i-window+1:i+1]) / window
-            else:
-                # Subsequent calculations use exponential smoothing
-                alpha = 1 / window
-                avg_gain = alpha * gains[i] + (1 - alpha) * avg_gain
-                avg_loss = alpha * losses[i] + (1 - alpha) * avg_loss
-            
-            if avg_loss == 0:
-                rsi = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-            
-            rsi_values.append(rsi)
-        
-        return rsi_values
+        # Simple average for the first window, exponential smoothing afterwards
+        return _to_optional_list(rsi_loop(np.asarray(prices, dtype=np.float64), window))
     
     def calculate_bollinger_bands(self, prices: List[float], window: int = 20, 
                                  std_dev: float = 2) -> Dict[str, List[Optional[float]]]:
@@ -259,7 +250,7 @@ class TechnicalAnalyzer:
             "d": d_values
         }
     
-    def analyze_ohlcv_data(self, ohlcv_data: List[OHLCVData]) -> List[AnalyzedStockData]:
+    def analyze_ohlcv_data(self, ohlcv_data: List[OHLCVData]) -> List[AnalyzedStockDict]:
         """Calculate all technical indicators for OHLCV data."""
         if not ohlcv_data:
             return []
@@ -267,112 +258,378 @@ class TechnicalAnalyzer:
         # Sort by date
         sorted_data = sorted(ohlcv_data, key=lambda x: x.date)
         
-        # Extract price series
-        opens = [d.open for d in sorted_data]
-        highs = [d.high for d in sorted_data]
-        lows = [d.low for d in sorted_data]
-        closes = [d.close for d in sorted_data]
+        # Extract contiguous price columns once
+        count = len(sorted_data)
+        arrays = {
+            column: np.fromiter((getattr(d, column) for d in sorted_data), dtype=np.float64, count=count)
+            for column in ("high", "low", "close")
+        }
         
-        logger.info(f"Calculating technical indicators for {len(sorted_data)} data points")
+        logger.info(f"Calculating technical indicators for {count} data points")
         
         # Calculate all indicators
-        sma_5 = self.calculate_sma(closes, 5)
-        sma_20 = self.calculate_sma(closes, 20)
-        sma_60 = self.calculate_sma(closes, 60)
-        ema_12 = self.calculate_ema(closes, 12)
-        ema_26 = self.calculate_ema(closes, 26)
-        
-        macd_data = self.calculate_macd(closes)
-        rsi_14 = self.calculate_rsi(closes, 14)
-        bollinger = self.calculate_bollinger_bands(closes)
-        stochastic = self.calculate_stochastic(highs, lows, closes)
-        
-        # Create analyzed data
-        analyzed_data = []
-        for i, ohlcv in enumerate(sorted_data):
-            technical_indicators = TechnicalIndicators(
-                sma_5=sma_5[i],
-                sma_20=sma_20[i],
-                sma_60=sma_60[i],
-                ema_12=ema_12[i],
-                ema_26=ema_26[i],
-                macd=macd_data["macd"][i],
-                macd_signal=macd_data["signal"][i],
-                macd_histogram=macd_data["histogram"][i],
-                rsi_14=rsi_14[i],
-                bollinger_upper=bollinger["upper"][i],
-                bollinger_middle=bollinger["middle"][i],
-                bollinger_lower=bollinger["lower"][i],
-                stoch_k=stochastic["k"][i],
-                stoch_d=stochastic["d"][i]
-            )
-            
-            analyzed_stock_data = AnalyzedStockData(
-                date=ohlcv.date,
-                ticker=ohlcv.ticker,
-                ohlcv=ohlcv,
-                technical_indicators=technical_indicators
-            )
-            
-            analyzed_data.append(analyzed_stock_data)
+        indicators = pd.DataFrame(self.analyze_arrays(arrays), columns=INDICATOR_COLUMNS)
+        
+        # Plain documents in the stored layout; no model is validated per row
+        analyzed_data = list(self.stream_analyze(sorted_data, indicators))
         
         logger.info(f"Technical analysis completed for {len(analyzed_data)} data points")
         return analyzed_data
     
-    def get_analysis_summary(self, analyzed_data: List[AnalyzedStockData]) -> Dict[str, Any]:
+    def analyze_arrays(self, arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Calculate all technical indicators for one ticker's column arrays.
+        
+        `arrays` holds date-ordered float64 "high", "low" and "close" arrays
+        (as built by analyze_ohlcv_data). Returns one float64
+        array per TechnicalIndicators field, NaN while warming up; values match
+        the calculate_* methods.
+        """
+        close = np.asarray(arrays["close"], dtype=np.float64)
+        high = np.asarray(arrays["high"], dtype=np.float64)
+        low = np.asarray(arrays["low"], dtype=np.float64)
+        count = close.shape[0]
+        result = {}
+        
+        # Moving averages
+        for window in (5, 20, 60):
+            result[f"sma_{window}"] = sma_loop(close, window)
+        for window in (12, 26):
+            result[f"ema_{window}"] = ema_loop(close, window)
+        
+        # MACD; the signal line is an EMA over the defined MACD values only
+        ema_fast = ema_loop(close, self.macd_config["fast_period"])
+        ema_slow = ema_loop(close, self.macd_config["slow_period"])
+        macd = ema_fast - ema_slow
+        macd_signal = np.full(count, np.nan)
+        defined = ~np.isnan(macd)
+        macd_signal[defined] = ema_loop(macd[defined], self.macd_config["signal_period"])
+        result["macd"] = macd
+        result["macd_signal"] = macd_signal
+        result["macd_histogram"] = macd - macd_signal
+        
+        result["rsi_14"] = rsi_loop(close, self.rsi_config["period"])
+        
+        # Bollinger Bands (population standard deviation)
+        bb_window = self.bb_config["period"]
+        middle = sma_loop(close, bb_window)
+        std = np.full(count, np.nan)
+        if count >= bb_window:
+            std[bb_window - 1:] = sliding_window_view(close, bb_window).std(axis=1)
+        result["bollinger_upper"] = middle + self.bb_config["std"] * std
+        result["bollinger_middle"] = middle
+        result["bollinger_lower"] = middle - self.bb_config["std"] * std
+        
+        # Stochastic oscillator
+        k_window, d_window = 14, 3
+        stoch_k = np.full(count, np.nan)
+        if count >= k_window:
+            highest_high = sliding_window_view(high, k_window).max(axis=1)
+            lowest_low = sliding_window_view(low, k_window).min(axis=1)
+            price_range = highest_high - lowest_low
+            with np.errstate(divide="ignore", invalid="ignore"):
+                k_percent = (close[k_window - 1:] - lowest_low) / price_range * 100
+            stoch_k[k_window - 1:] = np.where(price_range == 0, 50.0, k_percent)
+        result["stoch_k"] = stoch_k
+        result["stoch_d"] = sma_loop(stoch_k, d_window)
+        
+        return {column: result[column] for column in INDICATOR_COLUMNS}
+    
+    @staticmethod
+    def build_panel(history: Dict[str, List[OHLCVData]]) -> pd.DataFrame:
+        """Stack per-ticker OHLCV rows into a long-form frame indexed by (ticker, date)."""
+        records = [
+            (ticker, row.date, row.open_price, row.high, row.low, row.close, row.volume)
+            for ticker, rows in history.items()
+            for row in rows
+        ]
+        panel = pd.DataFrame.from_records(
+            records, columns=["ticker", "date", "open", "high", "low", "close", "volume"]
+        )
+        return panel.set_index(["ticker", "date"]).sort_index()
+    
+    def analyze_panel(self, panel: pd.DataFrame, with_state: bool = False) -> pd.DataFrame:
+        """Calculate all technical indicators for many tickers in one vectorized pass.
+        
+        `panel` is indexed by (ticker, date) and sorted by date within each
+        ticker (see build_panel). Returns a frame on the same index with one
+        column per TechnicalIndicators field; values match the per-list
+        calculate_* methods. With `with_state`, the RSI smoothing averages
+        needed by extract_state are appended as STATE_COLUMNS.
+        """
+        by_ticker = panel.groupby(level=0, sort=False)
+        close = by_ticker["close"]
+        indicators = pd.DataFrame(index=panel.index)
+        
+        # Moving averages
+        for window in (5, 20, 60):
+            indicators[f"sma_{window}"] = close.transform(lambda s, w=window: s.rolling(w).mean())
+        for window in (12, 26):
+            indicators[f"ema_{window}"] = close.transform(
+                _seeded_ewm, window=window, alpha=2 / (window + 1)
+            )
+        
+        # MACD
+        fast = self.macd_config["fast_period"]
+        slow = self.macd_config["slow_period"]
+        signal = self.macd_config["signal_period"]
+        ema_fast = close.transform(_seeded_ewm, window=fast, alpha=2 / (fast + 1))
+        ema_slow = close.transform(_seeded_ewm, window=slow, alpha=2 / (slow + 1))
+        macd = ema_fast - ema_slow
+        indicators["macd"] = macd
+        indicators["macd_signal"] = macd.groupby(level=0, sort=False).transform(
+            _seeded_ewm, window=signal, alpha=2 / (signal + 1)
+        )
+        indicators["macd_histogram"] = indicators["macd"] - indicators["macd_signal"]
+        
+        # RSI (Wilder smoothing of gains/losses)
+        rsi_window = self.rsi_config["period"]
+        change = close.diff()
+        smoothing = {"window": rsi_window, "alpha": 1 / rsi_window}
+        avg_gain = change.clip(lower=0).groupby(level=0, sort=False).transform(_seeded_ewm, **smoothing)
+        avg_loss = (-change.clip(upper=0)).groupby(level=0, sort=False).transform(_seeded_ewm, **smoothing)
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+        indicators["rsi_14"] = rsi.mask(avg_loss == 0, 100.0)
+        indicators["rsi_avg_gain"] = avg_gain
+        indicators["rsi_avg_loss"] = avg_loss
+        
+        # Bollinger Bands (population standard deviation, as in calculate_bollinger_bands)
+        bb_window = self.bb_config["period"]
+        middle = close.transform(lambda s: s.rolling(bb_window).mean())
+        std = close.transform(lambda s: s.rolling(bb_window).std(ddof=0))
+        indicators["bollinger_upper"] = middle + self.bb_config["std"] * std
+        indicators["bollinger_middle"] = middle
+        indicators["bollinger_lower"] = middle - self.bb_config["std"] * std
+        
+        # Stochastic oscillator
+        k_window, d_window = 14, 3
+        highest_high = by_ticker["high"].transform(lambda s: s.rolling(k_window).max())
+        lowest_low = by_ticker["low"].transform(lambda s: s.rolling(k_window).min())
+        stoch_k = (panel["close"] - lowest_low) / (highest_high - lowest_low) * 100
+        stoch_k = stoch_k.mask(highest_high == lowest_low, 50.0)
+        indicators["stoch_k"] = stoch_k
+        indicators["stoch_d"] = stoch_k.groupby(level=0, sort=False).transform(
+            lambda s: s.rolling(d_window).mean()
+        )
+        
+        return indicators[INDICATOR_COLUMNS + STATE_COLUMNS if with_state else INDICATOR_COLUMNS]
+    
+    @staticmethod
+    def extract_state(ticker: str, ohlcv_rows: List[OHLCVData],
+                      indicators: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """Build the state advance_state resumes from, after the last of `ohlcv_rows`.
+        
+        `indicators` is the ticker's analyze_panel(with_state=True) frame for
+        the same rows. Returns None while the recursive indicators are still
+        warming up.
+        """
+        if len(ohlcv_rows) < STATE_WINDOW:
+            return None
+        
+        last = indicators.iloc[-1]
+        stoch_k = indicators["stoch_k"].iloc[-3:]
+        recursive = last[["ema_12", "ema_26", "macd_signal", "rsi_avg_gain", "rsi_avg_loss"]]
+        if recursive.isna().any() or stoch_k.isna().any():
+            return None
+        
+        window = ohlcv_rows[-STATE_WINDOW:]
+        return {
+            "ticker": ticker,
+            "date": window[-1].date.isoformat(),
+            "closes": [float(row.close) for row in window],
+            "highs": [float(row.high) for row in window],
+            "lows": [float(row.low) for row in window],
+            "stoch_k": [float(value) for value in stoch_k],
+            **{name: float(value) for name, value in recursive.items()},
+            "updated_at": datetime.utcnow()
+        }
+    
+    @staticmethod
+    def resume_index(state: Dict[str, Any], ohlcv_rows: List[OHLCVData]) -> Optional[int]:
+        """Index of the first row after `state`, or None if the state does not fit the rows.
+        
+        The state only fits when its date is present and the stored price
+        window still matches the history (no backfill or correction since).
+        """
+        dates = [row.date.isoformat() for row in ohlcv_rows]
+        try:
+            end = dates.index(state["date"]) + 1
+        except ValueError:
+            return None
+        
+        window = ohlcv_rows[end - len(state["closes"]):end]
+        if end < len(state["closes"]) or (
+            [row.close for row in window] != state["closes"]
+            or [row.high for row in window] != state["highs"]
+            or [row.low for row in window] != state["lows"]
+        ):
+            return None
+        return end
+    
+    def advance_state(self, state: Dict[str, Any],
+                      ohlcv_rows: List[OHLCVData]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Extend indicators from a stored state by new bars, without the history.
+        
+        EMAs, the MACD signal and the RSI averages follow their recurrences
+        from the stored values; rolling indicators use the stored price
+        window. Returns the indicator rows for `ohlcv_rows` (same columns as
+        analyze_panel) and the state after the last row.
+        """
+        closes = list(state["closes"])
+        highs = list(state["highs"])
+        lows = list(state["lows"])
+        stoch_k = list(state["stoch_k"])
+        ema_fast, ema_slow = state["ema_12"], state["ema_26"]
+        macd_signal = state["macd_signal"]
+        avg_gain, avg_loss = state["rsi_avg_gain"], state["rsi_avg_loss"]
+        
+        fast_alpha = 2 / (self.macd_config["fast_period"] + 1)
+        slow_alpha = 2 / (self.macd_config["slow_period"] + 1)
+        signal_alpha = 2 / (self.macd_config["signal_period"] + 1)
+        rsi_alpha = 1 / self.rsi_config["period"]
+        bb_window, bb_std = self.bb_config["period"], self.bb_config["std"]
+        k_window = 14
+        
+        rows = []
+        for ohlcv in ohlcv_rows:
+            close = ohlcv.close
+            change = close - closes[-1]
+            closes = closes[1:] + [close]
+            highs = highs[1:] + [ohlcv.high]
+            lows = lows[1:] + [ohlcv.low]
+            
+            ema_fast = fast_alpha * close + (1 - fast_alpha) * ema_fast
+            ema_slow = slow_alpha * close + (1 - slow_alpha) * ema_slow
+            macd = ema_fast - ema_slow
+            macd_signal = signal_alpha * macd + (1 - signal_alpha) * macd_signal
+            
+            avg_gain = rsi_alpha * max(change, 0.0) + (1 - rsi_alpha) * avg_gain
+            avg_loss = rsi_alpha * abs(min(change, 0.0)) + (1 - rsi_alpha) * avg_loss
+            rsi = 100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss))
+            
+            bb_prices = closes[-bb_window:]
+            middle = _window_mean(bb_prices)
+            std = (sum((p - middle) ** 2 for p in bb_prices) / bb_window) ** 0.5
+            
+            highest_high, lowest_low = max(highs[-k_window:]), min(lows[-k_window:])
+            if highest_high == lowest_low:
+                k_percent = 50.0
+            else:
+                k_percent = (close - lowest_low) / (highest_high - lowest_low) * 100
+            stoch_k = stoch_k[1:] + [k_percent]
+            
+            rows.append({
+                "sma_5": _window_mean(closes[-5:]),
+                "sma_20": _window_mean(closes[-20:]),
+                "sma_60": _window_mean(closes[-60:]),
+                "ema_12": ema_fast,
+                "ema_26": ema_slow,
+                "macd": macd,
+                "macd_signal": macd_signal,
+                "macd_histogram": macd - macd_signal,
+                "rsi_14": rsi,
+                "bollinger_upper": middle + bb_std * std,
+                "bollinger_middle": middle,
+                "bollinger_lower": middle - bb_std * std,
+                "stoch_k": k_percent,
+                "stoch_d": _window_mean(stoch_k)
+            })
+        
+        new_state = {
+            **state,
+            "date": ohlcv_rows[-1].date.isoformat() if ohlcv_rows else state["date"],
+            "closes": closes,
+            "highs": highs,
+            "lows": lows,
+            "stoch_k": stoch_k,
+            "ema_12": ema_fast,
+            "ema_26": ema_slow,
+            "macd_signal": macd_signal,
+            "rsi_avg_gain": avg_gain,
+            "rsi_avg_loss": avg_loss,
+            "updated_at": datetime.utcnow()
+        }
+        return pd.DataFrame(rows, columns=INDICATOR_COLUMNS), new_state
+    
+    @staticmethod
+    def stream_analyze(ohlcv_rows: List[OHLCVData],
+                       indicators: pd.DataFrame) -> Iterator[AnalyzedStockDict]:
+        """Yield ready-to-store documents pairing OHLCV rows with analyze_panel rows.
+        
+        Documents follow the AnalyzedStockData layout without building a model
+        per row. Dates stay ISO strings like every other date key in the
+        database; timestamps are left as datetimes for BSON to encode.
+        """
+        analysis_timestamp = datetime.utcnow()
+        values = indicators.astype(object).where(indicators.notna(), None).to_dict("records")
+        for ohlcv, row in zip(ohlcv_rows, values):
+            date_str = ohlcv.date.isoformat()
+            yield {
+                "date": date_str,
+                "ticker": ohlcv.ticker,
+                "ohlcv": {**ohlcv.model_dump(), "date": date_str},
+                "technical_indicators": row,
+                "analysis_timestamp": analysis_timestamp
+            }
+    
+    def get_analysis_summary(self, analyzed_data: List[AnalyzedStockDict]) -> Dict[str, Any]:
         """Get summary of technical analysis."""
         if not analyzed_data:
             return {}
         
         latest_data = analyzed_data[-1]  # Most recent data
-        indicators = latest_data.technical_indicators
+        indicators = latest_data["technical_indicators"]
+        macd = indicators["macd"]
+        macd_signal = indicators["macd_signal"]
+        rsi_14 = indicators["rsi_14"]
+        sma_20 = indicators["sma_20"]
+        bollinger_upper = indicators["bollinger_upper"]
+        bollinger_lower = indicators["bollinger_lower"]
         
         # Determine trends and signals
         signals = {}
         
         # MACD signals
-        if indicators.macd is not None and indicators.macd_signal is not None:
-            if indicators.macd > indicators.macd_signal:
+        if macd is not None and macd_signal is not None:
+            if macd > macd_signal:
                 signals["macd"] = "bullish"
             else:
                 signals["macd"] = "bearish"
         
         # RSI signals
-        if indicators.rsi_14 is not None:
-            if indicators.rsi_14 > 70:
+        if rsi_14 is not None:
+            if rsi_14 > 70:
                 signals["rsi"] = "overbought"
-            elif indicators.rsi_14 < 30:
+            elif rsi_14 < 30:
                 signals["rsi"] = "oversold"
             else:
                 signals["rsi"] = "neutral"
         
         # Moving average signals
-        current_price = latest_data.ohlcv.close
-        if indicators.sma_20 is not None:
-            if current_price > indicators.sma_20:
+        current_price = latest_data["ohlcv"]["close"]
+        if sma_20 is not None:
+            if current_price > sma_20:
                 signals["sma_20"] = "above"
             else:
                 signals["sma_20"] = "below"
         
         # Bollinger Bands signals
-        if (indicators.bollinger_upper is not None and 
-            indicators.bollinger_lower is not None):
-            if current_price > indicators.bollinger_upper:
+        if bollinger_upper is not None and bollinger_lower is not None:
+            if current_price > bollinger_upper:
                 signals["bollinger"] = "above_upper"
-            elif current_price < indicators.bollinger_lower:
+            elif current_price < bollinger_lower:
                 signals["bollinger"] = "below_lower"
             else:
                 signals["bollinger"] = "within_bands"
         
         return {
-            "ticker": latest_data.ticker,
-            "analysis_date": latest_data.date.isoformat(),
+            "ticker": latest_data["ticker"],
+            "analysis_date": latest_data["date"],
             "current_price": current_price,
             "signals": signals,
             "indicators": {
-                "sma_20": indicators.sma_20,
-                "rsi_14": indicators.rsi_14,
-                "macd": indicators.macd,
-                "macd_signal": indicators.macd_signal
+                "sma_20": sma_20,
+                "rsi_14": rsi_14,
+                "macd": macd,
+                "macd_signal": macd_signal
             }
         }
\ No newline at end of file
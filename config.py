@@ -2,10 +2,11 @@
 Configuration management for Stock Collector application.
 """
 import os
+from functools import cached_property
 from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
-import pytz
+from zoneinfo import ZoneInfo
 
 
 class Settings(BaseSettings):
@@ -16,9 +17,13 @@ class Settings(BaseSettings):
     mongodb_system_db: str = Field(default="system_info", env="MONGODB_SYSTEM_DB")
     mongodb_stock_data_db: str = Field(default="stock_data", env="MONGODB_STOCK_DATA_DB")
     mongodb_analyzed_db: str = Field(default="stock_analyzed", env="MONGODB_ANALYZED_DB")
+    mongodb_max_pool_size: int = Field(default=200, env="MONGODB_MAX_POOL_SIZE")
+    mongodb_compressors: str = Field(default="zstd,zlib", env="MONGODB_COMPRESSORS")  # First one the server also supports wins
     
     # Google Gemini API Configuration
     google_api_key: str = Field(..., env="GOOGLE_API_KEY")
+    ai_max_inflight: int = Field(default=8, env="AI_MAX_INFLIGHT")  # Concurrent AI requests across all routes
+    ai_acquire_timeout: float = Field(default=2.0, env="AI_ACQUIRE_TIMEOUT")  # Seconds to wait for a slot before 429
     
     # Server Configuration
     api_host: str = Field(default="0.0.0.0", env="API_HOST")
@@ -33,6 +38,9 @@ class Settings(BaseSettings):
     min_market_cap: int = Field(default=100_000_000_000, env="MIN_MARKET_CAP")  # 1000억원
     max_analysis_per_hour: int = Field(default=50, env="MAX_ANALYSIS_PER_HOUR")
     analysis_time_limit_minutes: int = Field(default=50, env="ANALYSIS_TIME_LIMIT_MINUTES")
+    analysis_concurrency: int = Field(default=8, env="ANALYSIS_CONCURRENCY")  # Concurrent per-ticker writes
+    bulk_chunk: int = Field(default=500, env="BULK_CHUNK")  # Operations per bulk_write
+    bulk_flush_interval: int = Field(default=25, env="BULK_FLUSH_INTERVAL")  # Analyzed tickers per last_analyzed_date flush
     
     # Timezone Configuration
     timezone: str = Field(default="Asia/Seoul", env="TIMEZONE")
@@ -47,18 +55,23 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
         case_sensitive = False
     
-    @property
+    @cached_property
     def kst_timezone(self):
-        """Get Korean Standard Time timezone object."""
-        return pytz.timezone(self.timezone)
+        """Get Korean Standard Time timezone object (resolved once per instance)."""
+        return ZoneInfo(self.timezone)
     
-    def get_database_names(self) -> dict:
-        """Get all database names as a dictionary."""
+    @cached_property
+    def database_names(self) -> dict:
+        """Database names keyed by role, built once per instance."""
         return {
             "system_info": self.mongodb_system_db,
             "stock_data": self.mongodb_stock_data_db,
             "stock_analyzed": self.mongodb_analyzed_db
         }
+    
+    def get_database_names(self) -> dict:
+        """Get all database names as a dictionary."""
+        return self.database_names
 
 
 # Global settings instance
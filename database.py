@@ -1,18 +1,26 @@
 """
 MongoDB database connection and management.
 """
-from typing import Optional
-from pymongo import MongoClient
+from typing import Any, Dict, List, Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel, MongoClient
 from pymongo.database import Database
 from pymongo.collection import Collection
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 import logging
+import threading
+import time
 from contextlib import contextmanager
 
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Reuse a successful ping for this long before checking the server again
+PING_TTL_SECONDS = 30.0
+
+# OHLCV rows for every ticker live in one collection keyed by (ticker, date)
+OHLCV_COLLECTION = "ohlcv"
+
 
 class DatabaseManager:
     """MongoDB database connection manager."""
@@ -20,19 +28,29 @@ class DatabaseManager:
     def __init__(self):
         self._client: Optional[MongoClient] = None
         self._databases: dict[str, Database] = {}
+        self._last_ping: float = 0.0
     
     def connect(self) -> None:
-        """Establish connection to MongoDB."""
+        """Establish connection to MongoDB, reusing the open client if there is one."""
+        if self._client is not None:
+            return
+        
         try:
             self._client = MongoClient(
                 settings.mongodb_url,
                 serverSelectionTimeoutMS=5000,  # 5 second timeout
-                maxPoolSize=50,
-                minPoolSize=5
+                # Room for every concurrent analysis writer plus API traffic
+                maxPoolSize=max(settings.mongodb_max_pool_size, settings.analysis_concurrency * 2),
+                minPoolSize=5,
+                waitQueueTimeoutMS=30000,
+                # OHLCV/indicator documents are numeric and compress well
+                compressors=settings.mongodb_compressors,
+                retryWrites=True
             )
             
             # Test connection
             self._client.admin.command('ping')
+            self._last_ping = time.monotonic()
             
             # Initialize database references
             db_names = settings.get_database_names()
@@ -41,16 +59,34 @@ class DatabaseManager:
             
             logger.info(f"Connected to MongoDB at {settings.mongodb_url}")
             
+            self._warm_holiday_cache()
+            
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
+            # Don't keep a client that never connected; the next connect() retries
+            if self._client is not None:
+                self._client.close()
+                self._client = None
             raise
     
+    def _warm_holiday_cache(self) -> None:
+        """Preload market holidays in the background so date checks stay in memory."""
+        # Imported here because utils.date_utils depends on this module
+        from utils.date_utils import warm_holiday_cache
+        
+        threading.Thread(
+            target=warm_holiday_cache,
+            name="holiday-cache-warmup",
+            daemon=True
+        ).start()
+    
     def disconnect(self) -> None:
         """Close MongoDB connection."""
         if self._client:
             self._client.close()
             self._client = None
             self._databases.clear()
+            self._last_ping = 0.0
             logger.info("Disconnected from MongoDB")
     
     def get_database(self, db_name: str) -> Database:
@@ -83,28 +119,80 @@ class DatabaseManager:
         """Check if connected to MongoDB."""
         if not self._client:
             return False
+        
+        now = time.monotonic()
+        if now - self._last_ping < PING_TTL_SECONDS:
+            return True
+        
         try:
             self._client.admin.command('ping')
+            self._last_ping = now
             return True
         except Exception:
+            self._last_ping = 0.0
             return False
     
     def create_indexes(self) -> None:
         """Create necessary indexes for optimal performance."""
         try:
-            # target_tickers collection indexes
+            # target_tickers collection indexes (one batched command per collection)
             target_tickers = self.get_collection("system_info", "target_tickers")
-            target_tickers.create_index("ticker", unique=True)
-            target_tickers.create_index("market_cap")
-            target_tickers.create_index("is_active")
-            target_tickers.create_index("last_analyzed_date")
+            target_tickers.create_indexes([
+                IndexModel([("ticker", ASCENDING)], unique=True),
+                IndexModel([("market_cap", ASCENDING)]),
+                # Every query filters on is_active=True, so only index those documents
+                IndexModel(
+                    [("is_active", ASCENDING)],
+                    name="is_active_true",
+                    partialFilterExpression={"is_active": True}
+                ),
+                # Serves "active tickers not yet analyzed for date X"
+                IndexModel([("is_active", ASCENDING), ("last_analyzed_date", ASCENDING)]),
+                # Pending tickers by market cap: equality, sort, then range keys,
+                # so the top-N scan walks market_cap in order and stops at the limit
+                IndexModel([
+                    ("is_active", ASCENDING),
+                    ("market_cap", DESCENDING),
+                    ("last_analyzed_date", ASCENDING)
+                ])
+            ])
+            
+            # stock_data.ohlcv: every read is per ticker, newest first
+            ohlcv = self.get_collection("stock_data", OHLCV_COLLECTION)
+            ohlcv.create_indexes([
+                IndexModel([("ticker", ASCENDING), ("date", DESCENDING)], unique=True)
+            ])
             
             # job_status collection indexes
             job_status = self.get_collection("system_info", "job_status")
-            job_status.create_index("job_name")
-            job_status.create_index("date_kst")
-            job_status.create_index("status")
-            job_status.create_index("start_time_utc")
+            job_status.create_indexes([
+                IndexModel([("date_kst", ASCENDING)]),
+                IndexModel([("status", ASCENDING)]),
+                IndexModel([("start_time_utc", ASCENDING)]),
+                # Job history per job name, newest first
+                IndexModel([("job_name", ASCENDING), ("date_kst", DESCENDING)], name="jobname_date"),
+                # Last successful / failed jobs of a name, newest first
+                IndexModel(
+                    [("job_name", ASCENDING), ("status", ASCENDING), ("date_kst", DESCENDING)],
+                    name="jobname_status_date"
+                ),
+                # Running jobs, most recently started first
+                IndexModel([("status", ASCENDING), ("start_time_utc", DESCENDING)], name="status_start")
+            ])
+            
+            # stock_analyzed: one collection per ticker, read newest-first by date.
+            # Same spec as hourly_analysis._ensure_analyzed_index, so this is a no-op
+            # where the index already exists; a single-field index also serves
+            # the descending sort.
+            analyzed_db = self.stock_analyzed_db
+            for ticker in analyzed_db.list_collection_names():
+                analyzed_db[ticker].create_index([("date", ASCENDING)], unique=True)
+            
+            # stock_indicator_state: one document per ticker
+            indicator_state = self.get_collection("system_info", "stock_indicator_state")
+            indicator_state.create_indexes([
+                IndexModel([("ticker", ASCENDING)], unique=True)
+            ])
             
             logger.info("Database indexes created successfully")
             
@@ -113,6 +201,67 @@ class DatabaseManager:
             raise
 
 
+class TickerView:
+    """Collection wrapper that scopes every operation to a single ticker.
+    
+    Lets call sites keep treating the shared OHLCV collection like the old
+    per-ticker collection: filters get the ticker added and inserted
+    documents are stamped with it.
+    """
+    
+    def __init__(self, collection: Collection, ticker: str):
+        self.collection = collection
+        self.ticker = ticker
+    
+    def _scoped(self, filter_dict: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the filter with the ticker condition applied."""
+        return {**(filter_dict or {}), "ticker": self.ticker}
+    
+    def _stamped(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Make sure a document carries this view's ticker."""
+        document.setdefault("ticker", self.ticker)
+        return document
+    
+    def find(self, filter_dict: Optional[Dict[str, Any]] = None, *args, **kwargs):
+        return self.collection.find(self._scoped(filter_dict), *args, **kwargs)
+    
+    def find_one(self, filter_dict: Optional[Dict[str, Any]] = None, *args, **kwargs):
+        return self.collection.find_one(self._scoped(filter_dict), *args, **kwargs)
+    
+    def count_documents(self, filter_dict: Optional[Dict[str, Any]] = None, **kwargs) -> int:
+        return self.collection.count_documents(self._scoped(filter_dict), **kwargs)
+    
+    def estimated_document_count(self, **kwargs) -> int:
+        # The collection-wide estimate would include every ticker
+        return self.count_documents(None, **kwargs)
+    
+    def insert_one(self, document: Dict[str, Any], **kwargs):
+        return self.collection.insert_one(self._stamped(document), **kwargs)
+    
+    def insert_many(self, documents: List[Dict[str, Any]], **kwargs):
+        return self.collection.insert_many([self._stamped(doc) for doc in documents], **kwargs)
+    
+    def update_one(self, filter_dict: Dict[str, Any], update: Dict[str, Any], **kwargs):
+        return self.collection.update_one(self._scoped(filter_dict), update, **kwargs)
+    
+    def update_many(self, filter_dict: Dict[str, Any], update: Dict[str, Any], **kwargs):
+        return self.collection.update_many(self._scoped(filter_dict), update, **kwargs)
+    
+    def replace_one(self, filter_dict: Dict[str, Any], replacement: Dict[str, Any], **kwargs):
+        return self.collection.replace_one(
+            self._scoped(filter_dict), self._stamped(replacement), **kwargs
+        )
+    
+    def delete_one(self, filter_dict: Dict[str, Any], **kwargs):
+        return self.collection.delete_one(self._scoped(filter_dict), **kwargs)
+    
+    def delete_many(self, filter_dict: Dict[str, Any], **kwargs):
+        return self.collection.delete_many(self._scoped(filter_dict), **kwargs)
+    
+    def aggregate(self, pipeline: List[Dict[str, Any]], **kwargs):
+        return self.collection.aggregate([{"$match": {"ticker": self.ticker}}, *pipeline], **kwargs)
+
+
 # Global database manager instance
 db_manager = DatabaseManager()
 
@@ -143,9 +292,9 @@ def get_job_status_collection() -> Collection:
     return db_manager.get_collection("system_info", "job_status")
 
 
-def get_stock_data_collection(ticker: str) -> Collection:
+def get_stock_data_collection(ticker: str) -> "TickerView":
     """Get stock data collection for specific ticker."""
-    return db_manager.get_collection("stock_data", ticker)
+    return TickerView(db_manager.get_collection("stock_data", OHLCV_COLLECTION), ticker)
 
 
 def get_stock_analyzed_collection(ticker: str) -> Collection:
@@ -5,7 +5,9 @@ import logging
 from typing import List
 from datetime import datetime
 
-from database import db_manager
+from pymongo import ReplaceOne
+
+from database import db_manager, OHLCV_COLLECTION
 from repositories import TargetTickerRepository, JobStatusRepository
 from config import settings
 
@@ -159,6 +161,48 @@ def health_check() -> dict:
     return result
 
 
+def migrate_ticker_collections(batch_size: int = 1000) -> int:
+    """Copy legacy per-ticker stock_data collections into the shared OHLCV collection.
+    
+    Legacy collections are left in place so the copy can be verified before
+    they are dropped manually. Re-running is safe: rows are upserted by
+    (ticker, date).
+    """
+    stock_data_db = db_manager.stock_data_db
+    ohlcv = stock_data_db[OHLCV_COLLECTION]
+    migrated = 0
+    
+    for name in stock_data_db.list_collection_names():
+        # Legacy collections were named after the 6-digit ticker code
+        if not (len(name) == 6 and name.isdigit()):
+            continue
+        
+        operations = []
+        for doc in stock_data_db[name].find({}, {"_id": 0}):
+            doc.setdefault("ticker", name)
+            operations.append(
+                ReplaceOne({"ticker": doc["ticker"], "date": doc["date"]}, doc, upsert=True)
+            )
+            if len(operations) >= batch_size:
+                ohlcv.bulk_write(operations, ordered=False)
+                migrated += len(operations)
+                operations = []
+        
+        if operations:
+            ohlcv.bulk_write(operations, ordered=False)
+            migrated += len(operations)
+        
+        logger.info(f"Migrated stock_data.{name} into stock_data.{OHLCV_COLLECTION}")
+    
+    logger.info(f"Migrated {migrated} OHLCV records into stock_data.{OHLCV_COLLECTION}")
+    
+    # Copied rows keep their original created_at, so cached history cannot see them
+    if migrated:
+        from utils import ohlcv_cache
+        ohlcv_cache.clear_cache()
+    return migrated
+
+
 def reset_database(confirm: bool = False) -> bool:
     """Reset database (drop all collections). Use with caution!"""
     if not confirm:
@@ -217,6 +261,11 @@ if __name__ == "__main__":
             if result["status"] != "healthy":
                 sys.exit(1)
                 
+        elif command == "migrate":
+            initialize_database()
+            migrated = migrate_ticker_collections()
+            print(f"Migrated {migrated} OHLCV records")
+                
         elif command == "reset":
             confirm = len(sys.argv) > 2 and sys.argv[2] == "confirm"
             success = reset_database(confirm)
@@ -226,7 +275,7 @@ if __name__ == "__main__":
                 print("Database reset failed")
                 sys.exit(1)
         else:
-            print("Usage: python db_init.py [init|sample|health|reset]")
+            print("Usage: python db_init.py [init|sample|health|migrate|reset]")
             sys.exit(1)
     else:
         # Default: initialize database
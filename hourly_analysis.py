@@ -10,18 +10,22 @@ Cron schedule:
 """
 import logging
 import sys
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, datetime, timedelta
-from typing import List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
 import time
 
+from pymongo import ASCENDING, UpdateOne
+
 from database import db_manager
 from repositories import (
-    TargetTickerRepository, JobStatusRepository, 
-    StockDataRepository
+    TargetTickerRepository, JobStatusRepository, IndicatorStateRepository
 )
 from collectors import TechnicalAnalyzer
-from schemas import AnalyzedStockData
-from utils import get_kst_today, get_kst_now
+from collectors.technical_analysis import INDICATOR_COLUMNS
+from schemas import AnalyzedStockDict, OHLCVData
+from utils import get_kst_today, get_kst_now, ohlcv_cache
 from config import settings
 
 
@@ -50,10 +54,11 @@ def initialize_components():
         # Initialize repositories and analyzer
         target_ticker_repo = TargetTickerRepository()
         job_status_repo = JobStatusRepository()
+        state_repo = IndicatorStateRepository()
         analyzer = TechnicalAnalyzer()
         
         logger.info("Components initialized successfully")
-        return target_ticker_repo, job_status_repo, analyzer
+        return target_ticker_repo, job_status_repo, state_repo, analyzer
         
     except Exception as e:
         logger.error(f"Failed to initialize components: {e}")
@@ -89,88 +94,150 @@ def get_pending_analysis_tickers(target_ticker_repo: TargetTickerRepository,
     if max_count is None:
         max_count = settings.max_analysis_per_hour
     
-    # Get tickers that haven't been analyzed for target date
-    pending_tickers = target_ticker_repo.get_pending_analysis(target_date)
-    
-    if not pending_tickers:
+    # Counting first lets finished days exit without fetching any tickers
+    pending_count = target_ticker_repo.count_pending(target_date)
+    if pending_count == 0:
         logger.info(f"No tickers need analysis for {target_date}")
         return []
     
-    # Sort by market cap (descending) for priority processing
-    pending_tickers.sort(key=lambda x: x.market_cap, reverse=True)
-    
-    # Limit to max_count
-    limited_tickers = pending_tickers[:max_count]
+    # Highest market cap first; MongoDB sorts and stops at max_count
+    pending_tickers = target_ticker_repo.get_pending_analysis(
+        target_date, limit=max_count, sort=[("market_cap", -1)]
+    )
     
-    logger.info(f"Found {len(pending_tickers)} pending tickers, processing {len(limited_tickers)} this hour")
-    return limited_tickers
+    logger.info(f"Found {pending_count} pending tickers, processing {len(pending_tickers)} this hour")
+    return pending_tickers
 
 
-def analyze_ticker(ticker: str, target_date: date, 
-                  analyzer: TechnicalAnalyzer) -> Optional[List[AnalyzedStockData]]:
-    """Analyze a single ticker for target date."""
+def get_analysis_window(target_date: date) -> tuple[date, date]:
+    """Date range of OHLCV history needed to analyze target date."""
+    # Get last 100 business days to ensure we have enough for 60-day SMA
+    start_date = target_date - timedelta(days=200)  # Buffer for weekends/holidays
+    return start_date, target_date
+
+
+class TickerAnalysis(NamedTuple):
+    """Documents to store for a ticker and the indicator state after them."""
+    documents: Iterator[AnalyzedStockDict]
+    state: Optional[Dict[str, Any]]
+
+
+def analyze_tickers(tickers: List[str], target_date: date,
+                    analyzer: TechnicalAnalyzer,
+                    historical_by_ticker: Dict[str, List[OHLCVData]],
+                    states: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Optional[TickerAnalysis]]:
+    """Analyze many tickers for target date.
+    
+    Tickers with a stored indicator state that still fits their history are
+    extended by the bars after it; the rest are recomputed together in one
+    vectorized pass. Returns, per ticker, a lazy stream of ready-to-store
+    documents plus the new state, or None when it could not be analyzed.
+    """
     logger = logging.getLogger(__name__)
+    states = states or {}
     
-    try:
-        # Get stock data repository for this ticker
-        stock_repo = StockDataRepository(ticker)
-        
-        # Get historical data (we need enough data for technical indicators)
-        # Get last 100 business days to ensure we have enough for 60-day SMA
-        end_date = target_date
-        start_date = target_date - timedelta(days=200)  # Buffer for weekends/holidays
-        
-        historical_data = stock_repo.get_date_range(start_date, end_date)
-        
+    results: Dict[str, Optional[TickerAnalysis]] = {}
+    eligible: Dict[str, List[OHLCVData]] = {}
+    for ticker in tickers:
+        historical_data = sorted(historical_by_ticker.get(ticker, []), key=lambda row: row.date)
         if len(historical_data) < 60:  # Minimum data for technical analysis
             logger.warning(f"  Insufficient data for {ticker}: {len(historical_data)} records")
-            return None
-        
-        # Perform technical analysis
-        analyzed_data = analyzer.analyze_ohlcv_data(historical_data)
-        
-        if not analyzed_data:
-            logger.warning(f"  No analysis results for {ticker}")
-            return None
-        
-        # Filter to only return data for target_date and recent dates
-        recent_data = [
-            data for data in analyzed_data 
-            if data.date >= target_date - timedelta(days=30)
-        ]
-        
-        logger.debug(f"  Analyzed {ticker}: {len(analyzed_data)} total, {len(recent_data)} recent")
-        return recent_data
-        
+            results[ticker] = None
+            continue
+        
+        state = states.get(ticker)
+        start = analyzer.resume_index(state, historical_data) if state else None
+        if start is None:
+            eligible[ticker] = historical_data
+            continue
+        
+        # Only the bars after the stored state need indicators (and storing)
+        try:
+            new_rows = historical_data[start:]
+            indicators, new_state = analyzer.advance_state(state, new_rows)
+            results[ticker] = TickerAnalysis(analyzer.stream_analyze(new_rows, indicators), new_state)
+            logger.debug(f"  Advanced {ticker} from {state['date']} by {len(new_rows)} rows")
+        except Exception as e:
+            logger.warning(f"  Failed to advance {ticker} from stored state, recomputing: {e}")
+            eligible[ticker] = historical_data
+    
+    if not eligible:
+        return results
+    
+    try:
+        # Stack all histories and compute every indicator with grouped rolling/ewm ops
+        indicators = analyzer.analyze_panel(analyzer.build_panel(eligible), with_state=True)
     except Exception as e:
-        logger.error(f"  Failed to analyze {ticker}: {e}")
-        return None
+        logger.error(f"  Failed to analyze {len(eligible)} tickers: {e}")
+        results.update({ticker: None for ticker in eligible})
+        return results
+    
+    # Only return data for target_date and recent dates
+    cutoff = target_date - timedelta(days=30)
+    for ticker, historical_data in eligible.items():
+        try:
+            ticker_indicators = indicators.loc[ticker]
+            start = bisect_left(historical_data, cutoff, key=lambda row: row.date)
+            results[ticker] = TickerAnalysis(
+                analyzer.stream_analyze(
+                    historical_data[start:], ticker_indicators[INDICATOR_COLUMNS].iloc[start:]
+                ),
+                analyzer.extract_state(ticker, historical_data, ticker_indicators)
+            )
+            logger.debug(f"  Analyzed {ticker}: {len(historical_data)} total, {len(historical_data) - start} recent")
+        except Exception as e:
+            logger.error(f"  Failed to analyze {ticker}: {e}")
+            results[ticker] = None
+    
+    return results
 
 
-def store_analyzed_data(ticker: str, analyzed_data: List[AnalyzedStockData]) -> bool:
-    """Store analyzed data in the database."""
+def analyze_ticker(ticker: str, target_date: date, 
+                  analyzer: TechnicalAnalyzer,
+                  historical_data: Optional[List[OHLCVData]] = None) -> Optional[List[AnalyzedStockDict]]:
+    """Analyze a single ticker for target date, returning ready-to-store documents."""
+    if historical_data is None:
+        start_date, end_date = get_analysis_window(target_date)
+        historical_data = ohlcv_cache.load_history([ticker], start_date, end_date)[ticker]
+    
+    analysis = analyze_tickers([ticker], target_date, analyzer, {ticker: historical_data})[ticker]
+    return None if analysis is None else list(analysis.documents)
+
+
+# stock_analyzed collections already given their unique date index in this process
+_indexed_analyzed_collections: Set[str] = set()
+
+
+def _ensure_analyzed_index(ticker: str, analyzed_collection) -> None:
+    """Create the unique date index the upserts rely on, once per ticker."""
+    if ticker in _indexed_analyzed_collections:
+        return
+    analyzed_collection.create_index([("date", ASCENDING)], unique=True)
+    _indexed_analyzed_collections.add(ticker)
+
+
+def store_analyzed_documents(ticker: str, documents: Iterable[AnalyzedStockDict]) -> bool:
+    """Upsert analyzed documents by date, flushing every settings.bulk_chunk rows."""
     logger = logging.getLogger(__name__)
     
     try:
         # Get analyzed stock collection for this ticker
         analyzed_collection = db_manager.get_collection("stock_analyzed", ticker)
-        
-        # Convert to documents for storage
-        documents = []
-        for data in analyzed_data:
-            doc = data.dict()
-            doc["date"] = data.date.isoformat()
-            doc["analysis_timestamp"] = data.analysis_timestamp.isoformat()
-            documents.append(doc)
-        
-        if not documents:
-            return True
-        
-        # Clear existing data and insert new data (overwrite approach)
-        analyzed_collection.delete_many({})
-        result = analyzed_collection.insert_many(documents)
-        
-        logger.debug(f"  Stored {len(result.inserted_ids)} analyzed records for {ticker}")
+        _ensure_analyzed_index(ticker, analyzed_collection)
+        
+        # Documents are consumed as the analyzer yields them; rows outside this
+        # window are kept
+        stored_count = 0
+        operations: List[UpdateOne] = []
+        for doc in documents:
+            operations.append(UpdateOne({"date": doc["date"]}, {"$set": doc}, upsert=True))
+            if len(operations) >= settings.bulk_chunk:
+                stored_count += _flush_analyzed(analyzed_collection, operations)
+                operations = []
+        if operations:
+            stored_count += _flush_analyzed(analyzed_collection, operations)
+        
+        logger.debug(f"  Stored {stored_count} analyzed records for {ticker}")
         return True
         
     except Exception as e:
@@ -178,6 +245,39 @@ def store_analyzed_data(ticker: str, analyzed_data: List[AnalyzedStockData]) ->
         return False
 
 
+def _flush_analyzed(analyzed_collection, operations: List[UpdateOne]) -> int:
+    result = analyzed_collection.bulk_write(operations, ordered=False)
+    return result.upserted_count + result.modified_count
+
+
+def store_ticker_analysis(state_repo: IndicatorStateRepository, ticker: str,
+                          analysis: TickerAnalysis) -> bool:
+    """Store a ticker's analyzed documents and the indicator state after them."""
+    if not store_analyzed_documents(ticker, analysis.documents):
+        return False
+    
+    # The state is saved only once its documents are stored, so the next run
+    # never resumes past rows that were not written
+    if analysis.state is not None:
+        state_repo.save_state(analysis.state)
+    return True
+
+
+def flush_analyzed_tickers(target_ticker_repo: TargetTickerRepository,
+                           tickers: List[str], target_date: date) -> None:
+    """Mark stored tickers analyzed for target date and empty the list."""
+    logger = logging.getLogger(__name__)
+    
+    if not tickers:
+        return
+    try:
+        target_ticker_repo.bulk_update_last_analyzed(tickers, target_date)
+    except Exception as e:
+        # Their analysis is stored; the next run redoes them from the saved state
+        logger.error(f"  Failed to update last_analyzed_date for {len(tickers)} tickers: {e}")
+    tickers.clear()
+
+
 def run_hourly_analysis(max_runtime_minutes: int = None):
     """Main hourly analysis process with state-based recovery."""
     logger = logging.getLogger(__name__)
@@ -198,7 +298,7 @@ def run_hourly_analysis(max_runtime_minutes: int = None):
     
     try:
         # Initialize components
-        target_ticker_repo, job_status_repo, analyzer = initialize_components()
+        target_ticker_repo, job_status_repo, state_repo, analyzer = initialize_components()
         
         # Check prerequisites (daily_update must be completed)
         if not check_prerequisites(job_status_repo, target_date):
@@ -219,43 +319,71 @@ def run_hourly_analysis(max_runtime_minutes: int = None):
         success_count = 0
         error_count = 0
         
+        # Load every pending ticker's history in one pass; only rows written since
+        # the last run are read from MongoDB, the rest come from the local cache
+        pending_codes = [ticker_info.ticker for ticker_info in pending_tickers]
+        start_date, end_date = get_analysis_window(target_date)
+        historical_by_ticker = ohlcv_cache.load_history(pending_codes, start_date, end_date)
+        
+        # Tickers with a usable stored state are extended from it; the rest
+        # are recomputed together
+        analysis_results = analyze_tickers(
+            pending_codes, target_date, analyzer, historical_by_ticker,
+            states=state_repo.get_states(pending_codes)
+        )
+        
+        ready = []
         for ticker_info in pending_tickers:
-            ticker = ticker_info.ticker
-            
-            # Check time limit
-            elapsed_minutes = (datetime.now() - start_time).total_seconds() / 60
-            if elapsed_minutes >= max_runtime_minutes:
-                logger.info(f"Time limit reached ({max_runtime_minutes} minutes). Stopping.")
-                break
-            
-            logger.info(f"Analyzing {ticker} ({ticker_info.name}) - {processed_count + 1}/{len(pending_tickers)}")
+            if analysis_results.get(ticker_info.ticker) is None:
+                processed_count += 1
+                error_count += 1
+            else:
+                ready.append(ticker_info)
+        
+        # Writes are network-bound, so overlap them on a bounded thread pool
+        # (pymongo clients are thread-safe and pooled)
+        executor = ThreadPoolExecutor(max_workers=max(1, settings.analysis_concurrency))
+        # Tickers stored but not yet marked analyzed; flushed in batches
+        succeeded: List[str] = []
+        try:
+            futures = {
+                executor.submit(
+                    store_ticker_analysis,
+                    state_repo,
+                    ticker_info.ticker,
+                    analysis_results[ticker_info.ticker]
+                ): ticker_info
+                for ticker_info in ready
+            }
             
-            try:
-                # Analyze ticker
-                analyzed_data = analyze_ticker(ticker, target_date, analyzer)
-                
-                if analyzed_data is None:
-                    error_count += 1
-                    processed_count += 1
-                    continue
+            for future in as_completed(futures):
+                ticker_info = futures[future]
+                ticker = ticker_info.ticker
+                processed_count += 1
                 
-                # Store analyzed data
-                if store_analyzed_data(ticker, analyzed_data):
-                    # Update last_analyzed_date
-                    target_ticker_repo.update_last_analyzed_date(ticker, target_date)
-                    success_count += 1
-                    logger.info(f"  Successfully analyzed {ticker}")
-                else:
+                try:
+                    if future.result():
+                        success_count += 1
+                        succeeded.append(ticker)
+                        if len(succeeded) >= settings.bulk_flush_interval:
+                            flush_analyzed_tickers(target_ticker_repo, succeeded, target_date)
+                        logger.info(f"  Successfully analyzed {ticker} ({ticker_info.name}) - {processed_count}/{len(pending_tickers)}")
+                    else:
+                        error_count += 1
+                        logger.warning(f"  Failed to store analysis for {ticker}")
+                except Exception as e:
+                    logger.error(f"  Error processing {ticker}: {e}")
                     error_count += 1
-                    logger.warning(f"  Failed to store analysis for {ticker}")
-                
-                processed_count += 1
                 
-            except Exception as e:
-                logger.error(f"  Error processing {ticker}: {e}")
-                error_count += 1
-                processed_count += 1
-                continue
+                # Check time limit; unstored tickers are picked up next hour
+                elapsed_minutes = (datetime.now() - start_time).total_seconds() / 60
+                if elapsed_minutes >= max_runtime_minutes:
+                    logger.info(f"Time limit reached ({max_runtime_minutes} minutes). Stopping.")
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            # Persist progress even when stopped by the time limit
+            flush_analyzed_tickers(target_ticker_repo, succeeded, target_date)
         
         # Log summary
         total_time = (datetime.now() - start_time).total_seconds() / 60
@@ -290,15 +418,9 @@ def get_analysis_status(target_date: Optional[date] = None) -> dict:
         target_ticker_repo = TargetTickerRepository()
         job_status_repo = JobStatusRepository()
         
-        # Get total active tickers
-        all_active = target_ticker_repo.get_all_active()
-        total_active = len(all_active)
-        
-        # Get pending analysis tickers
-        pending_tickers = target_ticker_repo.get_pending_analysis(target_date)
-        pending_count = len(pending_tickers)
-        
-        analyzed_count = total_active - pending_count
+        # One aggregation; no ticker documents are fetched
+        total_active, analyzed_count = target_ticker_repo.get_analysis_counts(target_date)
+        pending_count = total_active - analyzed_count
         
         # Check daily_update status
         daily_job = job_status_repo.get_job_status("daily_update", target_date)
@@ -363,11 +485,12 @@ if __name__ == "__main__":
             print("It processes tickers that haven't been analyzed for the current date.")
             print("")
             print("Usage:")
-            print("  python hourly_analysis.py [--status] [--max-time MINUTES]")
+            print("  python hourly_analysis.py [--status] [--max-time MINUTES] [--rebuild-cache]")
             print("")
             print("Options:")
             print("  --status          Show current analysis status")
             print("  --max-time MIN    Maximum runtime in minutes (default: from config)")
+            print("  --rebuild-cache   Discard the OHLCV cache and indicator states, recompute from MongoDB")
             print("  --help, -h        Show this help message")
             print("")
             print("Cron schedule:")
@@ -406,6 +529,12 @@ if __name__ == "__main__":
                 print(f"Using maximum runtime: {max_time} minutes")
             except ValueError:
                 print("Invalid time value. Using default from config.")
+        
+        elif sys.argv[1] == "--rebuild-cache":
+            ohlcv_cache.clear_cache()
+            db_manager.connect()
+            IndicatorStateRepository().clear_states()
+            print("OHLCV cache and indicator states cleared; history will be reloaded from MongoDB")
     
     # Normal execution
     main()
\ No newline at end of file
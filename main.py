@@ -3,7 +3,9 @@ FastAPI application entry point for Stock Collector.
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 import logging
 import sys
@@ -46,10 +48,23 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to connect to database: {e}")
     
+    # Async client for the dict-based routers, shared by every request of this worker
+    from models.dict_models import (
+        init_async_mongodb_client, close_async_mongodb_client, run_top_tickers_refresh
+    )
+    app.state.mongo = init_async_mongodb_client(max_pool_size=20, min_pool_size=2)
+    
+    # Keep the market-cap ranked ticker list warm instead of sorting target_tickers per request
+    app.state.top_tickers_task = asyncio.create_task(run_top_tickers_refresh())
+    
     yield
     
     logger.info("Shutting down Stock Collector API server...")
     # Cleanup resources
+    from services import dict_ai_service
+    app.state.top_tickers_task.cancel()
+    dict_ai_service.close_batch_worker()
+    close_async_mongodb_client()
     if db_manager._client:
         db_manager.disconnect()
 
@@ -59,7 +74,9 @@ app = FastAPI(
     title="Stock Collector API",
     description="AI-powered Korean stock analysis pipeline",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes dates/datetimes and floats in C
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
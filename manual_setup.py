@@ -59,7 +59,7 @@ def collect_and_store_target_tickers(min_market_cap: int = None) -> List[TargetT
     target_ticker_repo = TargetTickerRepository()
     
     # Check if we already have target tickers
-    existing_count = target_ticker_repo.count_documents()
+    existing_count = target_ticker_repo.fast_count()
     if existing_count > 0:
         logger.warning(f"Found {existing_count} existing target tickers")
         response = input("Do you want to replace them? (y/N): ").lower().strip()
@@ -116,7 +116,7 @@ def load_historical_data(target_tickers: List[TargetTicker], days_back: int = 30
             stock_repo = StockDataRepository(ticker)
             
             # Check if we already have data
-            existing_count = stock_repo.count_documents()
+            existing_count = stock_repo.fast_count()
             if existing_count > 0:
                 logger.info(f"  Found {existing_count} existing records for {ticker}")
                 response = input(f"  Replace existing data for {ticker}? (y/N/a for all): ").lower().strip()
@@ -168,7 +168,7 @@ def verify_setup():
     
     # Check target tickers
     target_ticker_repo = TargetTickerRepository()
-    ticker_count = target_ticker_repo.count_documents()
+    ticker_count = target_ticker_repo.fast_count()
     active_count = target_ticker_repo.count_documents({"is_active": True})
     
     logger.info(f"Target tickers: {ticker_count} total, {active_count} active")
@@ -183,7 +183,7 @@ def verify_setup():
     
     for ticker_info in active_tickers[:5]:  # Check first 5 tickers
         stock_repo = StockDataRepository(ticker_info.ticker)
-        data_count = stock_repo.count_documents()
+        data_count = stock_repo.fast_count()
         
         if data_count > 0:
             recent_data = stock_repo.get_recent_data(1)
@@ -13,13 +13,19 @@ from .dict_models import (
     # 모델 생성 함수들
     create_target_ticker,
     create_ohlcv_data,
+    create_ohlcv_batch,
+    create_ohlcv_rows,
+    OHLCVRow,
+    ohlcv_rows_to_arrays,
     create_technical_indicators,
     create_job_status,
 
     # 검증 함수들
     validate_target_ticker,
     validate_ohlcv_data,
+    validate_ohlcv_batch,
     validate_technical_indicators,
+    validate_technical_indicators_batch,
     validate_job_status,
 
     # API 응답 함수들
@@ -29,6 +35,7 @@ from .dict_models import (
 
     # 유틸리티 함수들
     convert_date_fields,
+    convert_date_fields_inplace,
     sanitize_for_mongo,
     prepare_for_api,
 
@@ -46,13 +53,19 @@ __all__ = [
     # 모델 생성
     "create_target_ticker",
     "create_ohlcv_data",
+    "create_ohlcv_batch",
+    "create_ohlcv_rows",
+    "OHLCVRow",
+    "ohlcv_rows_to_arrays",
     "create_technical_indicators",
     "create_job_status",
 
     # 검증
     "validate_target_ticker",
     "validate_ohlcv_data",
+    "validate_ohlcv_batch",
     "validate_technical_indicators",
+    "validate_technical_indicators_batch",
     "validate_job_status",
 
     # API 응답
@@ -62,6 +75,7 @@ __all__ = [
 
     # 유틸리티
     "convert_date_fields",
+    "convert_date_fields_inplace",
     "sanitize_for_mongo",
     "prepare_for_api",
 
@@ -3,23 +3,166 @@ Pydantic 우회를 위한 딕셔너리 기반 모델 관리 시스템
 MongoDB와 호환되는 스키마 정의 및 검증 함수 제공
 """
 
+import asyncio
+import atexit
 import os
+from dataclasses import dataclass
 from datetime import datetime, date
-from typing import Dict, Any, List, Optional, Union
+from typing import Callable, Dict, Any, Iterable, List, Optional, Sequence, Tuple, Union, get_args
 import logging
+from functools import lru_cache
+from itertools import islice
+from operator import countOf, methodcaller
+import numpy as np
+import orjson
+from bson import ObjectId
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
 from pymongo import MongoClient
 from dotenv import load_dotenv
 
+from .technical_indicators_validate import validate_indicators_batch
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
 # 환경변수 로딩
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
 
-def get_mongodb_client():
-    """MongoDB 클라이언트 가져오기"""
-    mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-    return MongoClient(mongodb_url)
+_CLIENT: Optional[MongoClient] = None
+
+def get_mongodb_client() -> MongoClient:
+    """MongoDB 클라이언트 가져오기
+
+    MongoClient 는 스레드 안전하고 자체 커넥션 풀을 가지므로 프로세스당 하나만 만들어 재사용한다.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+        _CLIENT = MongoClient(mongodb_url, maxPoolSize=50)
+        atexit.register(_CLIENT.close)
+    return _CLIENT
+
+
+_ASYNC_CLIENT = None
+
+# 종목별 최신 문서 동시 조회 상한 (커넥션 풀 고갈 방지)
+_FETCH_CONCURRENCY = 32
+
+# 전략이 읽는 필드만 조회 (analysis_timestamp, _id 제외)
+_STRATEGY_PROJECTION = {"_id": 0, "ticker": 1, "date": 1, "ohlcv": 1, "technical_indicators": 1}
+
+# 최신 문서는 RawBSONDocument 로 받아 전략이 실제로 읽는 하위 문서만 디코딩
+# (읽기 전용 Mapping 이므로 전략 코드처럼 .get/[] 로만 접근해야 함)
+_RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+# 시가총액 상위 활성 종목 캐시 (API 서버에서 주기적으로 갱신, None 이면 아직 미적재)
+_TOP_TICKERS_SIZE = 200
+_TOP_TICKERS_REFRESH_SECONDS = 60
+_top_tickers: Optional[List[str]] = None
+
+def init_async_mongodb_client(max_pool_size: int = 20, min_pool_size: int = 2):
+    """비동기 MongoDB 클라이언트(motor) 생성
+
+    API 서버 시작 시(lifespan) 한 번 호출한다. 풀 크기는 워커 프로세스당 값이다.
+    """
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+        _ASYNC_CLIENT = AsyncIOMotorClient(
+            mongodb_url, maxPoolSize=max_pool_size, minPoolSize=min_pool_size
+        )
+    return _ASYNC_CLIENT
+
+
+def close_async_mongodb_client() -> None:
+    """비동기 MongoDB 클라이언트 종료 (API 서버 종료 시)"""
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is not None:
+        _ASYNC_CLIENT.close()
+        _ASYNC_CLIENT = None
+
+
+def get_async_mongodb_client():
+    """비동기 MongoDB 클라이언트(motor) 가져오기
+
+    async 핸들러에서 이벤트 루프를 막지 않도록 motor 를 사용한다.
+    서버 시작 시 만든 클라이언트를 재사용하며, 스크립트 등에서 초기화 전에 호출되면 그때 생성한다.
+    """
+    if _ASYNC_CLIENT is None:
+        return init_async_mongodb_client()
+    return _ASYNC_CLIENT
+
+
+async def _query_top_tickers(client, limit: int) -> List[str]:
+    """활성 종목을 시가총액 순으로 limit 개 조회"""
+    ticker_docs = await client.system_info.target_tickers.find(
+        {"is_active": True}, projection={"ticker": 1, "_id": 0}
+    ).sort("market_cap", -1).to_list(limit)
+    return [ticker_doc["ticker"] for ticker_doc in ticker_docs]
+
+
+async def refresh_top_tickers() -> List[str]:
+    """시가총액 상위 종목 캐시 갱신"""
+    global _top_tickers
+    _top_tickers = await _query_top_tickers(get_async_mongodb_client(), _TOP_TICKERS_SIZE)
+    return _top_tickers
+
+
+async def run_top_tickers_refresh(interval: float = _TOP_TICKERS_REFRESH_SECONDS) -> None:
+    """시가총액 상위 종목 캐시를 interval 초마다 갱신 (API 서버 lifespan 에서 태스크로 실행)
+
+    갱신에 실패하면 이전 목록을 그대로 쓰고 다음 주기에 다시 시도한다.
+    """
+    while True:
+        try:
+            await refresh_top_tickers()
+        except Exception as e:
+            logger.warning(f"상위 종목 캐시 갱신 실패: {e}")
+        await asyncio.sleep(interval)
+
+
+async def fetch_latest_stock_data(ticker_list: Optional[List[str]] = None,
+                                  limit: int = 100) -> List[Dict[str, Any]]:
+    """종목별 최신 분석 데이터 조회
+
+    종목 컬렉션마다 find_one 을 순차로 기다리지 않고 asyncio.gather 로 한 번에 보낸다.
+    ticker_list 가 없으면 활성 종목을 시가총액 순으로 limit 개 사용한다 (캐시가 있으면 캐시에서).
+    조회에 실패한 종목은 경고만 남기고 건너뛴다.
+    """
+    client = get_async_mongodb_client()
+    db = client.stock_analyzed
+
+    if not ticker_list:
+        if _top_tickers is not None and limit <= _TOP_TICKERS_SIZE:
+            ticker_list = _top_tickers[:limit]
+        else:
+            ticker_list = await _query_top_tickers(client, limit)
+
+    semaphore = asyncio.Semaphore(_FETCH_CONCURRENCY)
+
+    async def fetch_latest(ticker: str) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            # date 인덱스를 역방향으로 읽어 최신 문서 하나만 가져옴
+            collection = db.get_collection(ticker, codec_options=_RAW_CODEC_OPTIONS)
+            return await collection.find_one({}, sort=[("date", -1)], projection=_STRATEGY_PROJECTION)
+
+    docs = await asyncio.gather(*map(fetch_latest, ticker_list), return_exceptions=True)
+
+    stock_data_list = []
+    for ticker, doc in zip(ticker_list, docs):
+        if isinstance(doc, Exception):
+            logger.warning(f"종목 {ticker} 데이터 조회 실패: {doc}")
+        elif doc:
+            stock_data_list.append(doc)
+    return stock_data_list
 
 # ===== 스키마 정의 =====
 
@@ -27,64 +170,126 @@ class SchemaError(Exception):
     """스키마 검증 오류"""
     pass
 
+# 스키마 정의 (모듈 로딩 시 한 번만 생성)
+_TARGET_TICKER_SCHEMA: Dict[str, Any] = {
+    "ticker": str,
+    "name": str,
+    "market_cap": int,
+    "added_date": datetime,
+    "is_active": bool,
+    "last_analyzed_date": Optional[datetime]
+}
+
+_OHLCV_DATA_SCHEMA: Dict[str, Any] = {
+    "date": datetime,
+    "ticker": str,
+    "open": float,
+    "high": float,
+    "low": float,
+    "close": float,
+    "volume": int,
+    "created_at": datetime
+}
+
+_TECHNICAL_INDICATORS_SCHEMA: Dict[str, Any] = {
+    "date": datetime,
+    "ticker": str,
+    "sma_5": Optional[float],
+    "sma_20": Optional[float],
+    "sma_60": Optional[float],
+    "ema_12": Optional[float],
+    "ema_26": Optional[float],
+    "macd": Optional[float],
+    "macd_signal": Optional[float],
+    "macd_histogram": Optional[float],
+    "rsi_14": Optional[float],
+    "bollinger_upper": Optional[float],
+    "bollinger_middle": Optional[float],
+    "bollinger_lower": Optional[float],
+    "stoch_k": Optional[float],
+    "stoch_d": Optional[float],
+    "created_at": datetime
+}
+
+_JOB_STATUS_SCHEMA: Dict[str, Any] = {
+    "_id": str,
+    "job_name": str,
+    "date_kst": datetime,
+    "status": str,  # "running", "completed", "failed"
+    "start_time_utc": datetime,
+    "end_time_utc": Optional[datetime],
+    "error_message": Optional[str],
+    "records_processed": Optional[int]
+}
+
+# (필드명, 허용 타입, Optional 여부) 튜플
+SchemaFields = Tuple[Tuple[str, Any, bool], ...]
+
+# 타입별 검사 함수 (float 필드는 int 값도 허용, bool 은 숫자로 보지 않음)
+_TYPE_CHECKERS: Dict[type, Callable[[Any], bool]] = {
+    float: lambda v: isinstance(v, (float, int)) and not isinstance(v, bool),
+    str: lambda v: isinstance(v, str),
+    int: lambda v: isinstance(v, int) and not isinstance(v, bool),
+    datetime: lambda v: isinstance(v, datetime),
+    bool: lambda v: isinstance(v, bool),
+}
+
+
+def _compile_schema(schema: Dict[str, Any]) -> SchemaFields:
+    """스키마 딕셔너리를 검증용 (필드명, 타입, Optional 여부) 튜플로 변환
+
+    Optional[X] 는 여기서 한 번만 X 로 풀어 두므로 검증 시 타입 비교가 필요 없다.
+    """
+    fields = []
+    for field_name, expected_type in schema.items():
+        is_optional = type(None) in get_args(expected_type)
+        concrete_type = get_args(expected_type)[0] if is_optional else expected_type
+        fields.append((field_name, concrete_type, is_optional))
+    return tuple(fields)
+
+
+def _build_struct(name: str, schema: Dict[str, Any]) -> Optional[type]:
+    """스키마 딕셔너리로 msgspec.Struct 생성 (msgspec 미설치 시 None)
+
+    Optional 필드는 기본값 None 으로 누락을 허용하고, 밑줄로 시작하는 키(_id)는
+    속성 이름만 바꿔 원래 키로 매핑한다. 알 수 없는 키는 무시한다.
+    """
+    if msgspec is None:
+        return None
+    fields = []
+    for field_name, expected_type in schema.items():
+        is_optional = type(None) in get_args(expected_type)
+        spec = msgspec.field(name=field_name, default=None) if is_optional else msgspec.field(name=field_name)
+        fields.append((field_name.lstrip('_'), expected_type, spec))
+    return msgspec.defstruct(name, fields, kw_only=True)
+
+
+_TARGET_TICKER_FIELDS = _compile_schema(_TARGET_TICKER_SCHEMA)
+_OHLCV_DATA_FIELDS = _compile_schema(_OHLCV_DATA_SCHEMA)
+_TECHNICAL_INDICATORS_FIELDS = _compile_schema(_TECHNICAL_INDICATORS_SCHEMA)
+_JOB_STATUS_FIELDS = _compile_schema(_JOB_STATUS_SCHEMA)
+
+_TARGET_TICKER_STRUCT = _build_struct("TargetTickerStruct", _TARGET_TICKER_SCHEMA)
+_OHLCV_DATA_STRUCT = _build_struct("OHLCVDataStruct", _OHLCV_DATA_SCHEMA)
+_TECHNICAL_INDICATORS_STRUCT = _build_struct("TechnicalIndicatorsStruct", _TECHNICAL_INDICATORS_SCHEMA)
+_JOB_STATUS_STRUCT = _build_struct("JobStatusStruct", _JOB_STATUS_SCHEMA)
+
+
 def target_ticker_schema() -> Dict[str, Any]:
     """대상 종목 스키마"""
-    return {
-        "ticker": str,
-        "name": str,
-        "market_cap": int,
-        "added_date": datetime,
-        "is_active": bool,
-        "last_analyzed_date": Optional[datetime]
-    }
+    return dict(_TARGET_TICKER_SCHEMA)
 
 def ohlcv_data_schema() -> Dict[str, Any]:
     """OHLCV 데이터 스키마"""
-    return {
-        "date": datetime,
-        "ticker": str,
-        "open": float,
-        "high": float,
-        "low": float,
-        "close": float,
-        "volume": int,
-        "created_at": datetime
-    }
+    return dict(_OHLCV_DATA_SCHEMA)
 
 def technical_indicators_schema() -> Dict[str, Any]:
     """기술적 지표 스키마"""
-    return {
-        "date": datetime,
-        "ticker": str,
-        "sma_5": Optional[float],
-        "sma_20": Optional[float],
-        "sma_60": Optional[float],
-        "ema_12": Optional[float],
-        "ema_26": Optional[float],
-        "macd": Optional[float],
-        "macd_signal": Optional[float],
-        "macd_histogram": Optional[float],
-        "rsi_14": Optional[float],
-        "bollinger_upper": Optional[float],
-        "bollinger_middle": Optional[float],
-        "bollinger_lower": Optional[float],
-        "stoch_k": Optional[float],
-        "stoch_d": Optional[float],
-        "created_at": datetime
-    }
+    return dict(_TECHNICAL_INDICATORS_SCHEMA)
 
 def job_status_schema() -> Dict[str, Any]:
     """작업 상태 스키마"""
-    return {
-        "_id": str,
-        "job_name": str,
-        "date_kst": datetime,
-        "status": str,  # "running", "completed", "failed"
-        "start_time_utc": datetime,
-        "end_time_utc": Optional[datetime],
-        "error_message": Optional[str],
-        "records_processed": Optional[int]
-    }
+    return dict(_JOB_STATUS_SCHEMA)
 
 # ===== 모델 생성 함수 =====
 
@@ -123,6 +328,64 @@ def create_ohlcv_data(date: datetime, ticker: str, open_price: float, high: floa
         "created_at": created_at
     }
 
+@dataclass(slots=True, frozen=True)
+class OHLCVRow:
+    """OHLCV 한 행 (딕셔너리보다 작은 고정 슬롯 레코드)
+
+    대량 수집 중에는 이 형태로 보관하고, insert_many 직전에 as_mongo_dict 로
+    문서를 만든다. 필드 순서는 create_ohlcv_data 인자 순서와 같다.
+    """
+    date: datetime
+    ticker: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    created_at: Optional[datetime] = None
+
+    def as_mongo_dict(self) -> Dict[str, Any]:
+        """MongoDB 저장용 OHLCV 문서로 변환"""
+        return {
+            "date": self.date,
+            "ticker": self.ticker,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+            "created_at": self.created_at
+        }
+
+def create_ohlcv_rows(rows: List[Tuple[datetime, str, float, float, float, float, int]],
+                      *, created_at: Optional[datetime] = None) -> List[OHLCVRow]:
+    """OHLCVRow 일괄 생성
+
+    rows 는 (date, ticker, open, high, low, close, volume) 튜플 목록.
+    created_at 은 배치 전체가 같은 시각을 공유하도록 한 번만 계산한다.
+    """
+    if created_at is None:
+        created_at = datetime.utcnow()
+
+    return [OHLCVRow(*row, created_at=created_at) for row in rows]
+
+def create_ohlcv_batch(rows: List[Tuple[datetime, str, float, float, float, float, int]],
+                       *, created_at: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """OHLCV 데이터 모델 일괄 생성 (insert_many 용 딕셔너리 목록)"""
+    return [row.as_mongo_dict() for row in create_ohlcv_rows(rows, created_at=created_at)]
+
+def ohlcv_rows_to_arrays(rows: List[OHLCVRow]) -> Dict[str, np.ndarray]:
+    """OHLCVRow 목록을 열 배열로 변환 (열마다 np.fromiter 한 번)
+
+    date 는 datetime64[D], open/high/low/close 는 float64, volume 은 int64.
+    """
+    count = len(rows)
+    arrays = {"date": np.fromiter((row.date for row in rows), dtype="datetime64[D]", count=count)}
+    for column in ("open", "high", "low", "close"):
+        arrays[column] = np.fromiter((getattr(row, column) for row in rows), dtype=np.float64, count=count)
+    arrays["volume"] = np.fromiter((row.volume for row in rows), dtype=np.int64, count=count)
+    return arrays
+
 def create_technical_indicators(date: datetime, ticker: str,
                               sma_5: Optional[float] = None,
                               sma_20: Optional[float] = None,
@@ -186,40 +449,28 @@ def create_job_status(job_id: str, job_name: str, date_kst: datetime,
 
 # ===== 검증 함수 =====
 
-def validate_type(value: Any, expected_type: type, field_name: str) -> bool:
-    """타입 검증"""
-    if expected_type == Optional[datetime] or expected_type == Optional[float] or expected_type == Optional[int] or expected_type == Optional[str]:
-        if value is None:
-            return True
-        # Optional 타입에서 실제 타입 추출
-        actual_type = expected_type.__args__[0] if hasattr(expected_type, '__args__') else expected_type
-        return isinstance(value, actual_type)
-
-    if expected_type == datetime and isinstance(value, datetime):
-        return True
-    elif expected_type == str and isinstance(value, str):
-        return True
-    elif expected_type == int and isinstance(value, int):
-        return True
-    elif expected_type == float and (isinstance(value, float) or isinstance(value, int)):
-        return True
-    elif expected_type == bool and isinstance(value, bool):
-        return True
-
-    return False
-
-def validate_schema(data: Dict[str, Any], schema: Dict[str, Any]) -> bool:
-    """스키마 검증"""
+def validate_type(value: Any, expected_type: Any, is_optional: bool = False) -> bool:
+    """타입 검증 (expected_type 은 _compile_schema 가 풀어 둔 타입)"""
+    if value is None:
+        return is_optional
+    checker = _TYPE_CHECKERS.get(expected_type)
+    if checker is None:
+        return isinstance(value, expected_type)
+    return checker(value)
+
+def validate_schema(data: Dict[str, Any], schema: Union[Dict[str, Any], SchemaFields]) -> bool:
+    """스키마 검증 (스키마 딕셔너리 또는 미리 변환된 필드 튜플)"""
+    fields = schema if isinstance(schema, tuple) else _compile_schema(schema)
     try:
-        for field_name, expected_type in schema.items():
+        for field_name, expected_type, is_optional in fields:
             if field_name not in data:
                 # Optional 필드는 누락 허용
-                if str(expected_type).startswith('typing.Union') or str(expected_type).startswith('typing.Optional'):
+                if is_optional:
                     continue
                 raise SchemaError(f"Required field '{field_name}' is missing")
 
             value = data[field_name]
-            if not validate_type(value, expected_type, field_name):
+            if not validate_type(value, expected_type, is_optional):
                 raise SchemaError(f"Field '{field_name}' has invalid type. Expected {expected_type}, got {type(value)}")
 
         return True
@@ -231,13 +482,25 @@ def validate_schema(data: Dict[str, Any], schema: Dict[str, Any]) -> bool:
         logger.error(f"Unexpected validation error: {e}")
         return False
 
+def _schema_valid(data: Dict[str, Any], fields: SchemaFields, struct: Optional[type]) -> bool:
+    """msgspec 이 있으면 Struct 변환(C 구현)으로, 없으면 validate_schema 로 스키마 검증"""
+    if struct is None:
+        return validate_schema(data, fields)
+    try:
+        # datetime 은 객체만 허용 (문자열 자동 파싱 비활성화)
+        msgspec.convert(data, struct, builtin_types=(datetime,))
+        return True
+    except msgspec.ValidationError as e:
+        logger.error(f"Schema validation failed: {e}")
+        return False
+
 def validate_target_ticker(data: Dict[str, Any]) -> bool:
     """대상 종목 데이터 검증"""
-    return validate_schema(data, target_ticker_schema())
+    return _schema_valid(data, _TARGET_TICKER_FIELDS, _TARGET_TICKER_STRUCT)
 
 def validate_ohlcv_data(data: Dict[str, Any]) -> bool:
     """OHLCV 데이터 검증"""
-    schema_valid = validate_schema(data, ohlcv_data_schema())
+    schema_valid = _schema_valid(data, _OHLCV_DATA_FIELDS, _OHLCV_DATA_STRUCT)
     if not schema_valid:
         return False
 
@@ -256,9 +519,33 @@ def validate_ohlcv_data(data: Dict[str, Any]) -> bool:
 
     return True
 
+def validate_ohlcv_batch(rows: List[Dict[str, Any]]) -> np.ndarray:
+    """OHLCV 데이터 일괄 검증 (행별 통과 여부 bool 배열)
+
+    스키마는 행마다 확인하고, 가격/거래량 규칙은 열 배열로 한 번에 계산한다.
+    """
+    count = len(rows)
+    valid = np.fromiter((_schema_valid(row, _OHLCV_DATA_FIELDS, _OHLCV_DATA_STRUCT) for row in rows), dtype=bool, count=count)
+
+    def column(field_name: str) -> np.ndarray:
+        # 스키마 검증에 실패한 행은 0 으로 채워 규칙 검사에서도 실패하게 둔다
+        return np.fromiter(
+            (row[field_name] if ok else 0 for row, ok in zip(rows, valid)),
+            dtype=np.float64, count=count
+        )
+
+    opens, highs, lows, closes = column('open'), column('high'), column('low'), column('close')
+    volumes = column('volume')
+    valid &= (opens > 0) & (highs > 0) & (lows > 0) & (closes > 0) & (highs >= lows) & (volumes >= 0)
+
+    invalid = np.flatnonzero(~valid)
+    if invalid.size:
+        logger.error(f"Invalid OHLCV rows: {invalid.size}/{count} (indices {invalid[:20].tolist()})")
+    return valid
+
 def validate_technical_indicators(data: Dict[str, Any]) -> bool:
     """기술적 지표 데이터 검증"""
-    schema_valid = validate_schema(data, technical_indicators_schema())
+    schema_valid = _schema_valid(data, _TECHNICAL_INDICATORS_FIELDS, _TECHNICAL_INDICATORS_STRUCT)
     if not schema_valid:
         return False
 
@@ -280,9 +567,34 @@ def validate_technical_indicators(data: Dict[str, Any]) -> bool:
 
     return True
 
+def validate_technical_indicators_batch(rows: List[Dict[str, Any]]) -> np.ndarray:
+    """기술적 지표 데이터 일괄 검증 (행별 통과 여부 bool 배열)
+
+    스키마는 행마다 확인하고, RSI/Stochastic 범위는 컴파일된 커널로 한 번에 검사한다.
+    """
+    count = len(rows)
+    valid = np.fromiter(
+        (_schema_valid(row, _TECHNICAL_INDICATORS_FIELDS, _TECHNICAL_INDICATORS_STRUCT) for row in rows), dtype=bool, count=count
+    )
+
+    def column(field_name: str) -> np.ndarray:
+        # None 과 스키마 검증 실패 행은 NaN (범위 검사 통과, 스키마 결과로 걸러짐)
+        return np.fromiter(
+            (np.nan if not ok or row.get(field_name) is None else row[field_name]
+             for row, ok in zip(rows, valid)),
+            dtype=np.float64, count=count
+        )
+
+    valid &= validate_indicators_batch(column('rsi_14'), column('stoch_k'), column('stoch_d'))
+
+    invalid = np.flatnonzero(~valid)
+    if invalid.size:
+        logger.error(f"Invalid technical indicator rows: {invalid.size}/{count} (indices {invalid[:20].tolist()})")
+    return valid
+
 def validate_job_status(data: Dict[str, Any]) -> bool:
     """작업 상태 데이터 검증"""
-    schema_valid = validate_schema(data, job_status_schema())
+    schema_valid = _schema_valid(data, _JOB_STATUS_FIELDS, _JOB_STATUS_STRUCT)
     if not schema_valid:
         return False
 
@@ -314,9 +626,12 @@ def create_api_response(success: bool, data: Any = None, message: str = "",
 
     return response
 
+_GET_IS_ACTIVE = methodcaller('get', 'is_active', False)
+
 def create_stock_list_response(tickers: List[Dict[str, Any]]) -> Dict[str, Any]:
     """주식 목록 응답 생성"""
-    active_count = sum(1 for ticker in tickers if ticker.get('is_active', False))
+    # is_active 누락 시 False 로 보고, 개수 세기는 C 구현(countOf)에서 처리
+    active_count = countOf(map(_GET_IS_ACTIVE, tickers), True)
 
     return create_api_response(
         success=True,
@@ -327,63 +642,97 @@ def create_stock_list_response(tickers: List[Dict[str, Any]]) -> Dict[str, Any]:
         }
     )
 
+# 상세 응답에 포함하는 최근 데이터 개수
+RECENT_DATA_LIMIT = 30
+
 def create_stock_detail_response(ticker_info: Dict[str, Any],
-                                recent_data: List[Dict[str, Any]],
+                                recent_data: Iterable[Dict[str, Any]],
                                 last_update: Optional[datetime] = None) -> Dict[str, Any]:
-    """주식 상세 정보 응답 생성"""
+    """주식 상세 정보 응답 생성
+
+    recent_data 는 리스트 또는 MongoDB 커서. 커서를 넘길 때는 호출부에서
+    .limit(RECENT_DATA_LIMIT) 를 걸어 쓰지 않을 문서를 가져오지 않도록 한다.
+    """
     return create_api_response(
         success=True,
         data={
             "ticker_info": ticker_info,
-            "recent_data": recent_data[:30],  # 최근 30개만
+            "recent_data": list(islice(recent_data, RECENT_DATA_LIMIT)),  # 최근 30개만
             "last_update": last_update.isoformat() if last_update else None
         }
     )
 
 # ===== 유틸리티 함수 =====
 
-def convert_date_fields(data: Dict[str, Any], date_fields: List[str]) -> Dict[str, Any]:
-    """날짜 필드를 datetime 객체로 변환"""
-    converted = data.copy()
+# date → datetime 변환 시 사용하는 자정 시각
+_MIDNIGHT = datetime.min.time()
+
+# OHLCV 문서의 날짜 필드 (호출부에서 리스트를 매번 만들지 않도록 상수로 제공)
+_DATE_FIELDS_OHLCV = ('date', 'created_at')
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    """ISO 문자열 파싱 (같은 날짜 문자열이 반복되므로 결과를 캐시, 실패는 캐시되지 않음)"""
+    return datetime.fromisoformat(value)
 
+def convert_date_fields_inplace(data: Dict[str, Any], date_fields: Sequence[str]) -> Dict[str, Any]:
+    """날짜 필드를 datetime 객체로 변환 (입력 딕셔너리를 직접 수정)"""
     for field in date_fields:
-        if field in converted and isinstance(converted[field], str):
+        value = data.get(field)
+        if isinstance(value, str):
             try:
-                converted[field] = datetime.fromisoformat(converted[field])
+                data[field] = _parse_iso(value)
             except ValueError:
-                logger.warning(f"Failed to convert {field} to datetime: {converted[field]}")
+                logger.warning(f"Failed to convert {field} to datetime: {value}")
 
-    return converted
+    return data
+
+def convert_date_fields(data: Dict[str, Any], date_fields: Sequence[str]) -> Dict[str, Any]:
+    """날짜 필드를 datetime 객체로 변환
+
+    변환할 문자열 필드가 있을 때만 복사본을 만들고, 없으면 입력을 그대로 반환한다.
+    """
+    if not any(isinstance(data.get(field), str) for field in date_fields):
+        return data
+    return convert_date_fields_inplace(data.copy(), date_fields)
 
 def sanitize_for_mongo(data: Dict[str, Any]) -> Dict[str, Any]:
-    """MongoDB 저장을 위한 데이터 정리"""
-    sanitized = {}
+    """MongoDB 저장을 위한 데이터 정리
 
-    for key, value in data.items():
-        if value is not None:
-            # date 객체를 datetime으로 변환
-            if isinstance(value, date) and not isinstance(value, datetime):
-                sanitized[key] = datetime.combine(value, datetime.min.time())
-            else:
-                sanitized[key] = value
+    None 제거나 date 변환이 필요 없으면 새 딕셔너리를 만들지 않고 입력을 그대로 반환한다.
+    """
+    needs_copy = any(
+        value is None or (isinstance(value, date) and not isinstance(value, datetime))
+        for value in data.values()
+    )
+    if not needs_copy:
+        return data
 
-    return sanitized
+    # date 객체는 datetime 으로 변환, None 값은 제외
+    return {
+        key: datetime.combine(value, _MIDNIGHT) if isinstance(value, date) and not isinstance(value, datetime) else value
+        for key, value in data.items()
+        if value is not None
+    }
+
+def _api_default(value: Any) -> Any:
+    """orjson 이 기본 지원하지 않는 타입 변환 (MongoDB ObjectId)"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
 
 def prepare_for_api(data: Dict[str, Any]) -> Dict[str, Any]:
-    """API 응답을 위한 데이터 준비"""
-    prepared = {}
-
-    for key, value in data.items():
-        if key == '_id':
-            # MongoDB _id 필드는 제외하거나 id로 변경
-            prepared['id'] = str(value)
-        elif isinstance(value, datetime):
-            # datetime을 ISO 형식으로 변환
-            prepared[key] = value.isoformat()
-        else:
-            prepared[key] = value
+    """API 응답을 위한 데이터 준비
+
+    orjson 으로 한 번 직렬화/역직렬화해 중첩된 값까지 datetime 은 ISO 문자열로,
+    numpy 값은 기본 타입으로 변환한다 (필드별 isoformat 호출 없음).
+    """
+    prepared = dict(data)
+    if '_id' in prepared:
+        # MongoDB _id 필드는 id로 변경
+        prepared['id'] = str(prepared.pop('_id'))
 
-    return prepared
+    return orjson.loads(orjson.dumps(prepared, default=_api_default, option=orjson.OPT_SERIALIZE_NUMPY))
 
 # ===== 사용 예시 =====
 
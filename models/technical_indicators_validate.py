@@ -0,0 +1,34 @@
+"""
+기술적 지표 범위 일괄 검증 커널
+- RSI, Stochastic %K/%D 가 0~100 범위인지 한 번의 루프로 검사
+- None 값은 NaN 으로 넘기며 통과로 처리 (비교 결과가 모두 False)
+- numba 가 없으면 일반 Python 루프로 동작
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    prange = range
+
+    def njit(*args, **kwargs):
+        """numba.njit 대체 (no-op)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# 시그니처를 명시해 import 시점에 컴파일 (첫 호출 지연 방지, cache=True 로 재사용)
+@njit("boolean[:](float64[:], float64[:], float64[:])", cache=True, parallel=True)
+def validate_indicators_batch(rsi, stoch_k, stoch_d):
+    """행별로 RSI/%K/%D 가 모두 0~100 범위(또는 NaN)인지 여부"""
+    n = rsi.shape[0]
+    out = np.empty(n, dtype=np.bool_)
+    for i in prange(n):
+        out[i] = not (
+            rsi[i] < 0 or rsi[i] > 100
+            or stoch_k[i] < 0 or stoch_k[i] > 100
+            or stoch_d[i] < 0 or stoch_d[i] > 100
+        )
+    return out
@@ -2,17 +2,17 @@
 AI analysis prompts package.
 """
 from .base_prompt import BasePrompt, PromptManager, prompt_manager
-from .technical_analysis_prompt import TechnicalAnalysisPrompt
-from .market_overview_prompt import MarketOverviewPrompt
-from .trading_opportunity_prompt import TradingOpportunityPrompt
-from .risk_assessment_prompt import RiskAssessmentPrompt
+from .technical_analysis_prompt import create_technical_analysis_prompt
+from .market_overview_prompt import create_market_overview_prompt
+from .trading_opportunity_prompt import create_trading_opportunity_prompt
+from .risk_assessment_prompt import create_risk_assessment_prompt
 
 __all__ = [
     "BasePrompt",
     "PromptManager",
     "prompt_manager",
-    "TechnicalAnalysisPrompt",
-    "MarketOverviewPrompt", 
-    "TradingOpportunityPrompt",
-    "RiskAssessmentPrompt"
+    "create_technical_analysis_prompt",
+    "create_market_overview_prompt", 
+    "create_trading_opportunity_prompt",
+    "create_risk_assessment_prompt"
 ]
\ No newline at end of file
@@ -83,7 +83,6 @@ class PromptManager:
     
     def __init__(self):
         self.prompts: Dict[str, BasePrompt] = {}
-        self._register_default_prompts()
     
     def register_prompt(self, prompt: BasePrompt) -> None:
         """Register a new prompt template."""
@@ -127,18 +126,6 @@ class PromptManager:
         except Exception as e:
             logger.error(f"Failed to generate prompt {prompt_name}: {e}")
             return None
-    
-    def _register_default_prompts(self) -> None:
-        """Register default prompt templates."""
-        from .technical_analysis_prompt import TechnicalAnalysisPrompt
-        from .market_overview_prompt import MarketOverviewPrompt
-        from .trading_opportunity_prompt import TradingOpportunityPrompt
-        from .risk_assessment_prompt import RiskAssessmentPrompt
-        
-        self.register_prompt(TechnicalAnalysisPrompt())
-        self.register_prompt(MarketOverviewPrompt())
-        self.register_prompt(TradingOpportunityPrompt())
-        self.register_prompt(RiskAssessmentPrompt())
 
 
 # Global prompt manager instance
@@ -3,68 +3,29 @@
 """
 from typing import Dict, Any, List
 from datetime import datetime
+from string import Template
+from functools import lru_cache
 
 
-def create_market_overview_prompt(
-    multi_result: Dict[str, Any],
-    ticker_list: List[str],
-    analysis_focus: str = "market_overview"
-) -> str:
-    """
-    한국 주식 시장 특화 시장 개관 프롬프트 생성
-
-    Args:
-        multi_result: 다중 전략 분석 결과
-        ticker_list: 분석 대상 종목 리스트
-        analysis_focus: 분석 초점 (market_overview, sector_analysis, market_timing)
-
-    Returns:
-        한국 시장 특화 시장 개관 프롬프트
-    """
-    current_time = datetime.now()
-    market_status = "장중" if 9 <= current_time.hour <= 15 else "장후"
-
-    strategies_analyzed = multi_result.get('strategies_analyzed', 0)
-    successful_strategies = multi_result.get('successful_strategies', 0)
-    total_matches = multi_result.get('total_matches_found', 0)
-
-    prompt = f"""당신은 한국 주식 시장을 20년 이상 분석해온 수석 시장 애널리스트입니다.
+# 호출마다 바뀌는 값은 헤더 템플릿의 자리표시자로만 채운다
+_HEADER_TEMPLATE = Template("""당신은 한국 주식 시장을 20년 이상 분석해온 수석 시장 애널리스트입니다.
 KOSPI와 KOSDAQ의 역사적 패턴, 한국 특유의 시장 참여자 구조, 그리고 글로벌 시장과의 상관관계를 깊이 이해하고 있습니다.
 
 ## 🏛️ 한국 시장 개관 분석
 
 ### 📊 분석 현황
-- **분석 시점**: {current_time.strftime('%Y년 %m월 %d일 %H시 %M분')} KST ({market_status})
-- **분석 대상**: {len(ticker_list)}개 종목
-- **적용 전략**: {strategies_analyzed}개 (성공: {successful_strategies}개)
-- **발견된 기회**: {total_matches}개
+- **분석 시점**: ${analysis_time} KST (${market_status})
+- **분석 대상**: ${ticker_count}개 종목
+- **적용 전략**: ${strategies_analyzed}개 (성공: ${successful_strategies}개)
+- **발견된 기회**: ${total_matches}개
 
 ### 🎯 분석 대상 종목
-{', '.join(ticker_list)}
-
-## 📈 다중 전략 분석 결과:"""
+${tickers}
 
-    # 전략별 결과 상세 분석
-    if 'results_by_strategy' in multi_result:
-        for strategy_name, result in multi_result['results_by_strategy'].items():
-            strategy_korean_name = _get_strategy_korean_name(strategy_name)
-            matches_found = result.get('matches_found', 0)
-
-            prompt += f"""
-
-### 🔍 {strategy_korean_name} 전략
-- **매치된 종목**: {matches_found}개
-- **시장 시사점**: {_get_strategy_market_implication(strategy_name, matches_found)}"""
+## 📈 다중 전략 분석 결과:""")
 
-            if matches_found > 0 and 'results' in result:
-                prompt += "\n- **발견된 종목들**:"
-                for match in result['results'][:3]:  # 상위 3개만 표시
-                    ticker = match.get('ticker', 'N/A')
-                    signal_strength = match.get('signal_strength', 0)
-                    prompt += f"\n  - {ticker} (신호강도: {signal_strength:.3f})"
-
-    if analysis_focus == "market_overview":
-        prompt += f"""
+# 입력과 무관한 고정 섹션 (호출마다 다시 만들지 않도록 모듈 상수로 보관)
+_MARKET_OVERVIEW_SECTION = """
 
 ## 🌐 한국 시장 전체 분석
 
@@ -120,8 +81,7 @@ KOSPI와 KOSDAQ의 역사적 패턴, 한국 특유의 시장 참여자 구조, 
 
 **모든 분석은 한국 시장의 고유한 특성을 반영하여 실용적이고 구체적으로 작성해주세요.**"""
 
-    elif analysis_focus == "sector_analysis":
-        prompt += f"""
+_SECTOR_ANALYSIS_SECTION = """
 
 ## 🏭 섹터별 심층 분석
 
@@ -148,8 +108,7 @@ KOSPI와 KOSDAQ의 역사적 패턴, 한국 특유의 시장 참여자 구조, 
 ### 3. 업종별 리스크 요인
 각 주요 업종별로 현재 직면한 리스크와 기회 요인을 분석해주세요."""
 
-    else:  # market_timing
-        prompt += f"""
+_MARKET_TIMING_SECTION = """
 
 ## ⏰ 시장 타이밍 분석
 
@@ -176,7 +135,7 @@ KOSPI와 KOSDAQ의 역사적 패턴, 한국 특유의 시장 참여자 구조, 
 
 **시장 타이밍 분석은 확률적 관점에서 접근하여 구체적인 진입/청산 시점을 제시해주세요.**"""
 
-    prompt += f"""
+_CONCLUSION_SECTION = """
 
 ## 📋 종합 결론 및 실행 방안
 
@@ -198,44 +157,134 @@ KOSPI와 KOSDAQ의 역사적 패턴, 한국 특유의 시장 참여자 구조, 
 **모든 분석은 한국 투자자가 실제로 활용할 수 있도록 구체적이고 실용적으로 작성해주세요.
 특히 한국 시장의 특수성(개장/폐장 시간, 거래제도, 세금 등)을 반영하여 현실적인 조언을 제공해주세요.**"""
 
-    return prompt
+# analysis_focus 별 본문 (알 수 없는 값은 기본 섹션 사용)
+_FOCUS_SECTIONS = {
+    'market_overview': _MARKET_OVERVIEW_SECTION,
+    'sector_analysis': _SECTOR_ANALYSIS_SECTION,
+    'market_timing': _MARKET_TIMING_SECTION
+}
 
 
+def create_market_overview_prompt(
+    multi_result: Dict[str, Any],
+    ticker_list: List[str],
+    analysis_focus: str = "market_overview"
+) -> str:
+    """
+    한국 주식 시장 특화 시장 개관 프롬프트 생성
+
+    Args:
+        multi_result: 다중 전략 분석 결과
+        ticker_list: 분석 대상 종목 리스트
+        analysis_focus: 분석 초점 (market_overview, sector_analysis, market_timing)
+
+    Returns:
+        한국 시장 특화 시장 개관 프롬프트
+    """
+    current_time = datetime.now()
+    market_status = "장중" if 9 <= current_time.hour <= 15 else "장후"
+
+    header = _HEADER_TEMPLATE.substitute(
+        analysis_time=current_time.strftime('%Y년 %m월 %d일 %H시 %M분'),
+        market_status=market_status,
+        ticker_count=len(ticker_list),
+        strategies_analyzed=multi_result.get('strategies_analyzed', 0),
+        successful_strategies=multi_result.get('successful_strategies', 0),
+        total_matches=multi_result.get('total_matches_found', 0),
+        tickers=', '.join(ticker_list)
+    )
+
+    # 전략별 결과 상세 분석 (동일 입력 재요청 시 캐시 재사용)
+    strategy_section = ''
+    if 'results_by_strategy' in multi_result:
+        strategy_section = _format_strategy_results(
+            _strategy_results_key(multi_result['results_by_strategy'])
+        )
+
+    # 본문/결론은 고정 문자열이므로 분석 초점이 정해진 뒤 한 번에 이어 붙인다
+    body = _FOCUS_SECTIONS.get(analysis_focus, _MARKET_TIMING_SECTION)
+    return ''.join((header, strategy_section, body, _CONCLUSION_SECTION))
+
+
+def _strategy_results_key(results_by_strategy: Dict[str, Any]) -> tuple:
+    """프롬프트에 실제로 쓰이는 값만 추려 해시 가능한 캐시 키 생성"""
+    return tuple(
+        (
+            strategy_name,
+            result.get('matches_found', 0),
+            tuple(
+                (match.get('ticker', 'N/A'), match.get('signal_strength', 0))
+                for match in result['results'][:3]  # 상위 3개만 표시
+            ) if 'results' in result else None
+        )
+        for strategy_name, result in results_by_strategy.items()
+    )
+
+
+@lru_cache(maxsize=256)
+def _format_strategy_results(strategy_rows: tuple) -> str:
+    """전략별 결과 섹션 생성 (입력 내용 기준 메모이제이션)"""
+    parts: List[str] = []
+    # 루프 안에서 반복 참조하는 전역 함수/메서드는 지역 변수로 묶어 둔다
+    append = parts.append
+    korean_name = _get_strategy_korean_name
+    market_implication = _get_strategy_market_implication
+
+    for strategy_name, matches_found, top_matches in strategy_rows:
+        append(f"""
+
+### 🔍 {korean_name(strategy_name)} 전략
+- **매치된 종목**: {matches_found}개
+- **시장 시사점**: {market_implication(strategy_name, matches_found)}""")
+
+        if matches_found > 0 and top_matches is not None:
+            append("\n- **발견된 종목들**:")
+            for ticker, signal_strength in top_matches:
+                append(f"\n  - {ticker} (신호강도: {signal_strength:.3f})")
+
+    return ''.join(parts)
+
+
+_STRATEGY_NAMES = {
+    'dictmacdgoldencrossstrategy': 'MACD 골든크로스',
+    'dictrsioversoldstrategy': 'RSI 과매도 반등',
+    'dictbollingersqueezestrategy': '볼린저 밴드 스퀴즈',
+    'dictmovingaveragecrossoverstrategy': '이동평균선 교차'
+}
+
+
+@lru_cache(maxsize=64)
 def _get_strategy_korean_name(strategy_name: str) -> str:
     """전략명을 한국어로 변환"""
-    strategy_names = {
-        'dictmacdgoldencrossstrategy': 'MACD 골든크로스',
-        'dictrsioversoldstrategy': 'RSI 과매도 반등',
-        'dictbollingersqueezestrategy': '볼린저 밴드 스퀴즈',
-        'dictmovingaveragecrossoverstrategy': '이동평균선 교차'
+    return _STRATEGY_NAMES.get(strategy_name, strategy_name)
+
+
+_MARKET_IMPLICATIONS = {
+    'dictmacdgoldencrossstrategy': {
+        'high': '시장에 강한 상승 모멘텀이 형성되고 있으며, 기관투자자들의 적극적인 매수세가 예상됩니다.',
+        'medium': '선별적인 상승 모멘텀이 나타나고 있어, 종목별 차별화가 진행 중입니다.',
+        'low': '전반적인 상승 모멘텀이 부족한 상황으로, 시장이 방향성을 찾지 못하고 있습니다.'
+    },
+    'dictrsioversoldstrategy': {
+        'high': '과도한 매도 압력 이후 기술적 반등 구간에 진입했으며, 저가 매수 기회가 확대되고 있습니다.',
+        'medium': '일부 종목에서 과매도 반등 신호가 나타나고 있어, 선별적 접근이 필요합니다.',
+        'low': '시장 전반의 매도 압력이 지속되고 있어, 추가적인 조정 가능성을 염두에 두어야 합니다.'
+    },
+    'dictbollingersqueezestrategy': {
+        'high': '변동성 수축 이후 대규모 방향성 돌파가 임박했으며, 큰 가격 변동이 예상됩니다.',
+        'medium': '일부 종목에서 변동성 돌파 준비가 감지되고 있어, 모멘텀 투자 기회가 있습니다.',
+        'low': '시장이 박스권에서 벗어나지 못하고 있어, 추세 투자보다는 구간 매매가 적합합니다.'
+    },
+    'dictmovingaveragecrossoverstrategy': {
+        'high': '다수 종목에서 이평선 정배열이 형성되고 있어, 시장 전반의 상승 추세가 강화되고 있습니다.',
+        'medium': '선별적인 이평선 골든크로스가 나타나고 있어, 개별 종목의 추세 변화에 주목해야 합니다.',
+        'low': '이평선 배열이 불분명한 상황으로, 명확한 추세가 형성되지 않았습니다.'
     }
-    return strategy_names.get(strategy_name, strategy_name)
+}
 
 
+@lru_cache(maxsize=64)
 def _get_strategy_market_implication(strategy_name: str, matches_found: int) -> str:
     """전략별 시장 시사점 분석"""
-    implications = {
-        'dictmacdgoldencrossstrategy': {
-            'high': '시장에 강한 상승 모멘텀이 형성되고 있으며, 기관투자자들의 적극적인 매수세가 예상됩니다.',
-            'medium': '선별적인 상승 모멘텀이 나타나고 있어, 종목별 차별화가 진행 중입니다.',
-            'low': '전반적인 상승 모멘텀이 부족한 상황으로, 시장이 방향성을 찾지 못하고 있습니다.'
-        },
-        'dictrsioversoldstrategy': {
-            'high': '과도한 매도 압력 이후 기술적 반등 구간에 진입했으며, 저가 매수 기회가 확대되고 있습니다.',
-            'medium': '일부 종목에서 과매도 반등 신호가 나타나고 있어, 선별적 접근이 필요합니다.',
-            'low': '시장 전반의 매도 압력이 지속되고 있어, 추가적인 조정 가능성을 염두에 두어야 합니다.'
-        },
-        'dictbollingersqueezestrategy': {
-            'high': '변동성 수축 이후 대규모 방향성 돌파가 임박했으며, 큰 가격 변동이 예상됩니다.',
-            'medium': '일부 종목에서 변동성 돌파 준비가 감지되고 있어, 모멘텀 투자 기회가 있습니다.',
-            'low': '시장이 박스권에서 벗어나지 못하고 있어, 추세 투자보다는 구간 매매가 적합합니다.'
-        },
-        'dictmovingaveragecrossoverstrategy': {
-            'high': '다수 종목에서 이평선 정배열이 형성되고 있어, 시장 전반의 상승 추세가 강화되고 있습니다.',
-            'medium': '선별적인 이평선 골든크로스가 나타나고 있어, 개별 종목의 추세 변화에 주목해야 합니다.',
-            'low': '이평선 배열이 불분명한 상황으로, 명확한 추세가 형성되지 않았습니다.'
-        }
-    }
-
     level = 'high' if matches_found >= 5 else 'medium' if matches_found >= 2 else 'low'
-    return implications.get(strategy_name, {}).get(level, '시장 상황에 대한 추가 분석이 필요합니다.')
\ No newline at end of file
+    return _MARKET_IMPLICATIONS.get(strategy_name, {}).get(level, '시장 상황에 대한 추가 분석이 필요합니다.')
\ No newline at end of file
@@ -3,72 +3,30 @@
 """
 from typing import Dict, Any, List
 from datetime import datetime
+from string import Template
+from functools import lru_cache
 
 
-def create_risk_assessment_prompt(
-    multi_result: Dict[str, Any],
-    ticker_list: List[str],
-    analysis_focus: str = "risk_assessment"
-) -> str:
-    """
-    한국 주식 시장 특화 리스크 분석 프롬프트 생성
-
-    Args:
-        multi_result: 다중 전략 분석 결과
-        ticker_list: 분석 대상 종목 리스트
-        analysis_focus: 분석 초점 (risk_assessment, portfolio_risk, market_risk)
-
-    Returns:
-        한국 시장 특화 리스크 분석 프롬프트
-    """
-    current_time = datetime.now()
-    market_status = "장중" if 9 <= current_time.hour <= 15 else "장후"
-
-    strategies_analyzed = multi_result.get('strategies_analyzed', 0)
-    successful_strategies = multi_result.get('successful_strategies', 0)
-    total_matches = multi_result.get('total_matches_found', 0)
-
-    prompt = f"""당신은 한국 주식 시장에서 20년 이상 리스크 관리를 전문으로 해온 리스크 매니저입니다.
+# 호출마다 바뀌는 값은 헤더 템플릿의 자리표시자로만 채운다
+_HEADER_TEMPLATE = Template("""당신은 한국 주식 시장에서 20년 이상 리스크 관리를 전문으로 해온 리스크 매니저입니다.
 KOSPI와 KOSDAQ 시장의 다양한 위기 상황을 경험했으며, 한국 시장 특유의 리스크 요인들을 정확히 파악하고 있습니다.
 특히 외환위기, 금융위기, 코로나19 등 주요 시장 충격 시기의 대응 경험이 풍부합니다.
 
 ## ⚠️ 리스크 분석 리포트
 
 ### 📊 분석 개요
-- **분석 시점**: {current_time.strftime('%Y년 %m월 %d일 %H시 %M분')} KST ({market_status})
-- **분석 대상**: {len(ticker_list)}개 종목
-- **적용 전략**: {strategies_analyzed}개 (성공: {successful_strategies}개)
-- **발견된 기회**: {total_matches}개
+- **분석 시점**: ${analysis_time} KST (${market_status})
+- **분석 대상**: ${ticker_count}개 종목
+- **적용 전략**: ${strategies_analyzed}개 (성공: ${successful_strategies}개)
+- **발견된 기회**: ${total_matches}개
 
 ### 🎯 분석 포트폴리오
-{', '.join(ticker_list)}
+${tickers}
 
-## 📈 전략별 리스크 프로파일:"""
-
-    # 전략별 리스크 분석
-    if 'results_by_strategy' in multi_result:
-        for strategy_name, result in multi_result['results_by_strategy'].items():
-            strategy_korean_name = _get_strategy_korean_name(strategy_name)
-            matches_found = result.get('matches_found', 0)
-            risk_level = _get_strategy_risk_level(strategy_name, matches_found)
-
-            prompt += f"""
-
-### 🔍 {strategy_korean_name} 전략 리스크
-- **매치된 종목**: {matches_found}개
-- **리스크 등급**: {risk_level}
-- **위험 요인**: {_get_strategy_risk_factors(strategy_name)}"""
+## 📈 전략별 리스크 프로파일:""")
 
-            if matches_found > 0 and 'results' in result:
-                prompt += "\n- **위험도별 종목 분류**:"
-                for match in result['results'][:3]:
-                    ticker = match.get('ticker', 'N/A')
-                    signal_strength = match.get('signal_strength', 0)
-                    risk_grade = _get_individual_risk_grade(signal_strength)
-                    prompt += f"\n  - {ticker}: {risk_grade}"
-
-    if analysis_focus == "risk_assessment":
-        prompt += f"""
+# 입력과 무관한 고정 섹션 (호출마다 다시 만들지 않도록 모듈 상수로 보관)
+_RISK_ASSESSMENT_SECTION = """
 
 ## 🛡️ 종합 리스크 분석
 
@@ -136,8 +94,7 @@ KOSPI와 KOSDAQ 시장의 다양한 위기 상황을 경험했으며, 한국 시
 
 **모든 리스크 요인을 한국 시장의 특성을 고려하여 구체적으로 분석해주세요.**"""
 
-    elif analysis_focus == "portfolio_risk":
-        prompt += f"""
+_PORTFOLIO_RISK_SECTION = """
 
 ## 📊 포트폴리오 리스크 상세 분석
 
@@ -179,8 +136,7 @@ KOSPI와 KOSDAQ 시장의 다양한 위기 상황을 경험했으며, 한국 시
 - **섹터 로테이션**: 업종 자금 이동 시 수혜 가능성
 - **정책 호재**: 정부 부양책 발표 시 수혜도"""
 
-    else:  # market_risk
-        prompt += f"""
+_MARKET_RISK_SECTION = """
 
 ## 🌊 시장 리스크 전문 분석
 
@@ -221,7 +177,7 @@ KOSPI와 KOSDAQ 시장의 다양한 위기 상황을 경험했으며, 한국 시
 
 **각 리스크 요인별로 한국 시장에 미치는 구체적 영향도와 대응 방안을 제시해주세요.**"""
 
-    prompt += f"""
+_RISK_MANAGEMENT_SECTION = """
 
 ## 🎯 리스크 관리 전략
 
@@ -267,30 +223,108 @@ KOSPI와 KOSDAQ 시장의 다양한 위기 상황을 경험했으며, 한국 시
 **모든 리스크 관리는 한국 시장의 특성을 고려하여 실행 가능하고 구체적인 방안을 제시해주세요.
 특히 개인 투자자가 실제로 적용할 수 있는 현실적이고 실용적인 조언을 중심으로 작성해주세요.**"""
 
-    return prompt
+# analysis_focus 별 본문 (알 수 없는 값은 기본 섹션 사용)
+_FOCUS_SECTIONS = {
+    'risk_assessment': _RISK_ASSESSMENT_SECTION,
+    'portfolio_risk': _PORTFOLIO_RISK_SECTION,
+    'market_risk': _MARKET_RISK_SECTION
+}
 
 
+def create_risk_assessment_prompt(
+    multi_result: Dict[str, Any],
+    ticker_list: List[str],
+    analysis_focus: str = "risk_assessment"
+) -> str:
+    """
+    한국 주식 시장 특화 리스크 분석 프롬프트 생성
+
+    Args:
+        multi_result: 다중 전략 분석 결과
+        ticker_list: 분석 대상 종목 리스트
+        analysis_focus: 분석 초점 (risk_assessment, portfolio_risk, market_risk)
+
+    Returns:
+        한국 시장 특화 리스크 분석 프롬프트
+    """
+    current_time = datetime.now()
+    market_status = "장중" if 9 <= current_time.hour <= 15 else "장후"
+
+    header = _HEADER_TEMPLATE.substitute(
+        analysis_time=current_time.strftime('%Y년 %m월 %d일 %H시 %M분'),
+        market_status=market_status,
+        ticker_count=len(ticker_list),
+        strategies_analyzed=multi_result.get('strategies_analyzed', 0),
+        successful_strategies=multi_result.get('successful_strategies', 0),
+        total_matches=multi_result.get('total_matches_found', 0),
+        tickers=', '.join(ticker_list)
+    )
+
+    # 전략별 리스크 분석
+    strategy_section = ''
+    if 'results_by_strategy' in multi_result:
+        strategy_section = _format_strategy_risks(multi_result['results_by_strategy'])
+
+    # 본문/리스크 관리 섹션은 고정 문자열이므로 분석 초점이 정해진 뒤 한 번에 이어 붙인다
+    body = _FOCUS_SECTIONS.get(analysis_focus, _MARKET_RISK_SECTION)
+    return ''.join((header, strategy_section, body, _RISK_MANAGEMENT_SECTION))
+
+
+def _format_strategy_risks(results_by_strategy: Dict[str, Any]) -> str:
+    """전략별 리스크 프로파일 섹션 생성"""
+    parts: List[str] = []
+    # 루프 안에서 반복 참조하는 전역 함수/메서드는 지역 변수로 묶어 둔다
+    append = parts.append
+    korean_name = _get_strategy_korean_name
+    risk_level = _get_strategy_risk_level
+    risk_factors = _get_strategy_risk_factors
+    risk_grade = _get_individual_risk_grade
+
+    for strategy_name, result in results_by_strategy.items():
+        matches_found = result.get('matches_found', 0)
+
+        append(f"""
+
+### 🔍 {korean_name(strategy_name)} 전략 리스크
+- **매치된 종목**: {matches_found}개
+- **리스크 등급**: {risk_level(strategy_name, matches_found)}
+- **위험 요인**: {risk_factors(strategy_name)}""")
+
+        if matches_found > 0 and 'results' in result:
+            append("\n- **위험도별 종목 분류**:")
+            for match in result['results'][:3]:
+                get = match.get
+                append(f"\n  - {get('ticker', 'N/A')}: {risk_grade(get('signal_strength', 0))}")
+
+    return ''.join(parts)
+
+
+_STRATEGY_NAMES = {
+    'dictmacdgoldencrossstrategy': 'MACD 골든크로스',
+    'dictrsioversoldstrategy': 'RSI 과매도 반등',
+    'dictbollingersqueezestrategy': '볼린저 밴드 스퀴즈',
+    'dictmovingaveragecrossoverstrategy': '이동평균선 교차'
+}
+
+
+@lru_cache(maxsize=64)
 def _get_strategy_korean_name(strategy_name: str) -> str:
     """전략명을 한국어로 변환"""
-    strategy_names = {
-        'dictmacdgoldencrossstrategy': 'MACD 골든크로스',
-        'dictrsioversoldstrategy': 'RSI 과매도 반등',
-        'dictbollingersqueezestrategy': '볼린저 밴드 스퀴즈',
-        'dictmovingaveragecrossoverstrategy': '이동평균선 교차'
-    }
-    return strategy_names.get(strategy_name, strategy_name)
+    return _STRATEGY_NAMES.get(strategy_name, strategy_name)
+
 
+_BASE_RISK = {
+    'dictmacdgoldencrossstrategy': '중위험',
+    'dictrsioversoldstrategy': '고위험',
+    'dictbollingersqueezestrategy': '고위험',
+    'dictmovingaveragecrossoverstrategy': '중위험'
+}
 
+
+@lru_cache(maxsize=64)
 def _get_strategy_risk_level(strategy_name: str, matches_found: int) -> str:
     """전략별 리스크 등급 평가"""
-    base_risk = {
-        'dictmacdgoldencrossstrategy': '중위험',
-        'dictrsioversoldstrategy': '고위험',
-        'dictbollingersqueezestrategy': '고위험',
-        'dictmovingaveragecrossoverstrategy': '중위험'
-    }
-
-    risk = base_risk.get(strategy_name, '중위험')
+    risk = _BASE_RISK.get(strategy_name, '중위험')
 
     # 매치 수가 많으면 리스크 증가 (시장 과열 가능성)
     if matches_found >= 5:
@@ -304,15 +338,18 @@ def _get_strategy_risk_level(strategy_name: str, matches_found: int) -> str:
     return risk
 
 
+_RISK_FACTORS = {
+    'dictmacdgoldencrossstrategy': '하락장에서 거짓 신호, 후행성 지표 한계, 박스권에서 잦은 신호',
+    'dictrsioversoldstrategy': '지속적 하락 시 추가 손실, 단기 변동성, 반등 실패 위험',
+    'dictbollingersqueezestrategy': '방향성 예측 어려움, 높은 변동성, 빠른 손절 요구됨',
+    'dictmovingaveragecrossoverstrategy': '횡보장 거짓 신호, 후행성, 추세 전환점 파악 어려움'
+}
+
+
+@lru_cache(maxsize=64)
 def _get_strategy_risk_factors(strategy_name: str) -> str:
     """전략별 주요 위험 요인"""
-    risk_factors = {
-        'dictmacdgoldencrossstrategy': '하락장에서 거짓 신호, 후행성 지표 한계, 박스권에서 잦은 신호',
-        'dictrsioversoldstrategy': '지속적 하락 시 추가 손실, 단기 변동성, 반등 실패 위험',
-        'dictbollingersqueezestrategy': '방향성 예측 어려움, 높은 변동성, 빠른 손절 요구됨',
-        'dictmovingaveragecrossoverstrategy': '횡보장 거짓 신호, 후행성, 추세 전환점 파악 어려움'
-    }
-    return risk_factors.get(strategy_name, '일반적인 시장 리스크')
+    return _RISK_FACTORS.get(strategy_name, '일반적인 시장 리스크')
 
 
 def _get_individual_risk_grade(signal_strength: float) -> str:
@@ -1,76 +1,39 @@
 """
 한국 주식 시장 특화 기술적 분석 프롬프트
 """
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+from bisect import bisect_right
 from datetime import datetime
-
-
-def create_technical_analysis_prompt(
-    strategy_result: Dict[str, Any],
-    analysis_type: str = "detailed"
-) -> str:
-    """
-    한국 주식 시장 특화 기술적 분석 프롬프트 생성
-
-    Args:
-        strategy_result: 전략 분석 결과
-        analysis_type: 분석 타입 (detailed, summary, trading_signal)
-
-    Returns:
-        한국 시장 특화 기술적 분석 프롬프트
-    """
-    strategy_name = strategy_result.get('strategy_name', 'Unknown')
-    matches_found = strategy_result.get('matches_found', 0)
-    results = strategy_result.get('results', [])
-    total_analyzed = strategy_result.get('total_analyzed', 0)
-
-    # 전략별 한국 시장 특화 설명
-    strategy_descriptions = {
-        'dictmacdgoldencrossstrategy': {
-            'name': 'MACD 골든크로스',
-            'korean_context': 'KOSPI/KOSDAQ에서 외국인 매수 심리와 기관 투자자 유입을 나타내는 대표적인 강세 신호',
-            'market_timing': '한국 시장 특성상 오전 9시~11시, 오후 2시~3시 거래량 증가 시점과 연계하여 분석'
-        },
-        'dictrsioversoldstrategy': {
-            'name': 'RSI 과매도 반등',
-            'korean_context': '한국 투자자들의 공포 매도 후 기술적 반등을 포착하는 전략으로, 특히 중소형주에서 효과적',
-            'market_timing': '월말/분기말 리밸런싱과 연계된 매수 타이밍 분석이 중요'
-        },
-        'dictbollingersqueezestrategy': {
-            'name': '볼린저 밴드 스퀴즈',
-            'korean_context': '한국 시장의 박스권 횡보 후 급등/급락 패턴을 예측하는 변동성 돌파 전략',
-            'market_timing': '실적 발표 시즌과 정책 발표 전후 변동성 확대 구간에서 특히 유의미'
-        },
-        'dictmovingaveragecrossoverstrategy': {
-            'name': '이동평균선 교차',
-            'korean_context': '한국 개인투자자들이 가장 선호하는 기술적 분석 신호로, 대중적 매매 심리 반영',
-            'market_timing': '코스피 지수와의 동조화 현상 및 섹터 로테이션 관점에서 분석'
-        }
+from functools import lru_cache
+from operator import itemgetter
+
+
+# 전략별 한국 시장 특화 설명
+_STRATEGY_DESCRIPTIONS = {
+    'dictmacdgoldencrossstrategy': {
+        'name': 'MACD 골든크로스',
+        'korean_context': 'KOSPI/KOSDAQ에서 외국인 매수 심리와 기관 투자자 유입을 나타내는 대표적인 강세 신호',
+        'market_timing': '한국 시장 특성상 오전 9시~11시, 오후 2시~3시 거래량 증가 시점과 연계하여 분석'
+    },
+    'dictrsioversoldstrategy': {
+        'name': 'RSI 과매도 반등',
+        'korean_context': '한국 투자자들의 공포 매도 후 기술적 반등을 포착하는 전략으로, 특히 중소형주에서 효과적',
+        'market_timing': '월말/분기말 리밸런싱과 연계된 매수 타이밍 분석이 중요'
+    },
+    'dictbollingersqueezestrategy': {
+        'name': '볼린저 밴드 스퀴즈',
+        'korean_context': '한국 시장의 박스권 횡보 후 급등/급락 패턴을 예측하는 변동성 돌파 전략',
+        'market_timing': '실적 발표 시즌과 정책 발표 전후 변동성 확대 구간에서 특히 유의미'
+    },
+    'dictmovingaveragecrossoverstrategy': {
+        'name': '이동평균선 교차',
+        'korean_context': '한국 개인투자자들이 가장 선호하는 기술적 분석 신호로, 대중적 매매 심리 반영',
+        'market_timing': '코스피 지수와의 동조화 현상 및 섹터 로테이션 관점에서 분석'
     }
+}
 
-    current_strategy = strategy_descriptions.get(strategy_name, {
-        'name': strategy_name,
-        'korean_context': '한국 주식 시장 맞춤형 분석',
-        'market_timing': '한국 시장 거래 패턴 고려 분석'
-    })
-
-    prompt = f"""당신은 한국 주식 시장을 15년 이상 분석해온 전문 기술적 분석가입니다.
-KOSPI와 KOSDAQ의 고유한 특성을 깊이 이해하고 있으며, 한국 투자자들의 심리와 거래 패턴에 정통합니다.
-
-## 📊 기술적 분석 개요
-**분석 전략**: {current_strategy['name']}
-**한국 시장 맥락**: {current_strategy['korean_context']}
-**시장 타이밍**: {current_strategy['market_timing']}
-
-## 📈 분석 결과 요약
-- **조건 만족 종목**: {matches_found}개 (총 {total_analyzed}개 분석)
-- **분석 시점**: {datetime.now().strftime('%Y년 %m월 %d일 %H시 %M분')} KST
-- **시장 상황**: {"장중" if 9 <= datetime.now().hour <= 15 else "장후"}
-
-## 🎯 발견된 투자 기회:"""
-
-    if not results:
-        prompt += """
+# 입력과 무관한 고정 섹션 (호출마다 다시 만들지 않도록 모듈 상수로 보관)
+_NO_RESULTS_SECTION = """
 현재 설정된 기술적 조건을 만족하는 종목이 없습니다.
 
 ### 🔍 대안 분석
@@ -80,27 +43,8 @@ KOSPI와 KOSDAQ의 고유한 특성을 깊이 이해하고 있으며, 한국 투
 4. **복합 전략**: 다른 기술적 지표와의 조합 고려
 
 **추천 행동**: 전략 조건을 완화하거나 다른 시간대에 재분석을 권장합니다."""
-        return prompt
-
-    for i, result in enumerate(results[:5], 1):
-        ticker = result.get('ticker', 'N/A')
-        signal_strength = result.get('signal_strength', 0)
-        current_price = result.get('current_price', 0)
-        analysis_date = result.get('date', 'N/A')
-
-        # 신호 강도에 따른 한국어 표현
-        strength_desc = "매우 강함" if signal_strength >= 0.9 else "강함" if signal_strength >= 0.7 else "보통"
 
-        prompt += f"""
-
-### {i}. 📌 {ticker} (신호강도: {signal_strength:.3f} - {strength_desc})
-- **현재가**: {current_price:,}원
-- **분석일**: {analysis_date}
-- **기술적 상태**: {_get_technical_status(signal_strength)}
-- **한국 시장 포지션**: {_get_market_position(current_price)}"""
-
-    if analysis_type == "detailed":
-        prompt += f"""
+_DETAILED_SECTION = """
 
 ## 🔬 상세 기술적 분석
 
@@ -132,8 +76,7 @@ KOSPI와 KOSDAQ의 고유한 특성을 깊이 이해하고 있으며, 한국 투
 
 **모든 분석은 한국 투자자의 실전 매매에 도움이 되도록 구체적이고 실용적으로 작성해주세요.**"""
 
-    elif analysis_type == "summary":
-        prompt += f"""
+_SUMMARY_SECTION = """
 
 ## 💡 핵심 투자 포인트
 
@@ -153,8 +96,7 @@ KOSPI와 KOSDAQ의 고유한 특성을 깊이 이해하고 있으며, 한국 투
 
 **3-5개 문장으로 핵심만 간결하게 정리해주세요.**"""
 
-    else:  # trading_signal
-        prompt += f"""
+_TRADING_SIGNAL_SECTION = """
 
 ## 🚨 매매 신호 분석
 
@@ -177,7 +119,14 @@ KOSPI와 KOSDAQ의 고유한 특성을 깊이 이해하고 있으며, 한국 투
 
 **각 종목별로 구체적인 매수/매도 가격대를 제시해주세요.**"""
 
-    prompt += f"""
+# analysis_type 별 본문 (알 수 없는 값은 매매 신호 섹션 사용)
+_ANALYSIS_SECTIONS = {
+    'detailed': _DETAILED_SECTION,
+    'summary': _SUMMARY_SECTION,
+    'trading_signal': _TRADING_SIGNAL_SECTION
+}
+
+_CONSIDERATIONS_SECTION = """
 
 ## 📋 추가 고려사항
 - **업종 동향**: 해당 섹터의 최근 자금 흐름
@@ -187,32 +136,170 @@ KOSPI와 KOSDAQ의 고유한 특성을 깊이 이해하고 있으며, 한국 투
 
 **분석 결과는 반드시 한국어로 작성하고, 실제 매매에 활용할 수 있도록 구체적인 수치와 함께 제시해주세요.**"""
 
-    return prompt
+
+# 분석 개요/결과 요약 머리말 (str.format_map 자리표시자)
+_HEADER_TEMPLATE = """당신은 한국 주식 시장을 15년 이상 분석해온 전문 기술적 분석가입니다.
+KOSPI와 KOSDAQ의 고유한 특성을 깊이 이해하고 있으며, 한국 투자자들의 심리와 거래 패턴에 정통합니다.
+
+## 📊 기술적 분석 개요
+**분석 전략**: {strategy_label}
+**한국 시장 맥락**: {korean_context}
+**시장 타이밍**: {market_timing}
+
+## 📈 분석 결과 요약
+- **조건 만족 종목**: {matches_found}개 (총 {total_analyzed}개 분석)
+- **분석 시점**: {now_str} KST
+- **시장 상황**: {market_status}
+
+## 🎯 발견된 투자 기회:"""
+
+# 결과가 없을 때의 전체 프롬프트
+_TECH_EMPTY_TEMPLATE = _HEADER_TEMPLATE + _NO_RESULTS_SECTION
+
+# 스크리너 결과(screen_stocks)에 항상 포함되는 키를 한 번에 조회
+_RESULT_FIELDS = itemgetter('strategy_name', 'matches_found', 'results', 'total_analyzed')
+
+
+def create_technical_analysis_prompt(
+    strategy_result: Dict[str, Any],
+    analysis_type: str = "detailed"
+) -> str:
+    """
+    한국 주식 시장 특화 기술적 분석 프롬프트 생성
+
+    Args:
+        strategy_result: 전략 분석 결과
+        analysis_type: 분석 타입 (detailed, summary, trading_signal)
+
+    Returns:
+        한국 시장 특화 기술적 분석 프롬프트
+    """
+    try:
+        strategy_name, matches_found, results, total_analyzed = _RESULT_FIELDS(strategy_result)
+    except KeyError:
+        # 스크리너 결과가 아닌 부분 dict 는 기본값으로 보완
+        strategy_name = strategy_result.get('strategy_name', 'Unknown')
+        matches_found = strategy_result.get('matches_found', 0)
+        results = strategy_result.get('results', [])
+        total_analyzed = strategy_result.get('total_analyzed', 0)
+
+    # 분석 시점은 분 단위까지만 표시되므로 초 이하를 버려 캐시 키로 사용
+    now = datetime.now().replace(second=0, microsecond=0)
+
+    if not results:
+        # 가장 흔한 "조건 만족 종목 없음" 경로는 미리 합쳐 둔 템플릿 하나로 처리
+        return _TECH_EMPTY_TEMPLATE.format_map(
+            _header_fields(strategy_name, matches_found, total_analyzed, now)
+        )
+
+    # 프롬프트에 쓰이는 필드만 튜플로 추려 캐시 키로 사용
+    # (스크리너 결과는 signal_strength 로 정렬되므로 키가 항상 존재)
+    rows = tuple(
+        (result.get('ticker', 'N/A'), result['signal_strength'],
+         result.get('current_price', 0), result.get('date', 'N/A'))
+        for result in results[:5]
+    )
+    return _build_technical_prompt(strategy_name, analysis_type, matches_found, total_analyzed, rows, now)
+
+
+def _header_fields(strategy_name: str, matches_found: int, total_analyzed: int, now: datetime) -> Dict[str, Any]:
+    """머리말 템플릿에 채울 값"""
+    current_strategy = _STRATEGY_DESCRIPTIONS.get(strategy_name)
+    if current_strategy is None:
+        current_strategy = {
+            'name': strategy_name,
+            'korean_context': '한국 주식 시장 맞춤형 분석',
+            'market_timing': '한국 시장 거래 패턴 고려 분석'
+        }
+
+    return {
+        'strategy_label': current_strategy['name'],
+        'korean_context': current_strategy['korean_context'],
+        'market_timing': current_strategy['market_timing'],
+        'matches_found': matches_found,
+        'total_analyzed': total_analyzed,
+        'now_str': now.strftime('%Y년 %m월 %d일 %H시 %M분'),
+        'market_status': "장중" if 9 <= now.hour <= 15 else "장후"
+    }
+
+
+@lru_cache(maxsize=64)
+def _build_technical_prompt(
+    strategy_name: str,
+    analysis_type: str,
+    matches_found: int,
+    total_analyzed: int,
+    rows: Tuple[Tuple[Any, ...], ...],
+    now: datetime
+) -> str:
+    """
+    종목 결과가 있는 프롬프트 생성 (재시도/분석 타입별 재요청 시 같은 분 안에서 재사용)
+
+    Args:
+        rows: (ticker, signal_strength, current_price, date) 튜플들
+        now: 분 단위로 절삭된 분석 시점
+    """
+    return ''.join((
+        _HEADER_TEMPLATE.format_map(_header_fields(strategy_name, matches_found, total_analyzed, now)),
+        ''.join(map(_format_tech_row, enumerate(rows, 1))),
+        _ANALYSIS_SECTIONS.get(analysis_type, _TRADING_SIGNAL_SECTION),
+        _CONSIDERATIONS_SECTION
+    ))
+
+
+# 종목별 결과 행 (str.format 자리표시자)
+_ROW_TEMPLATE = """
+
+### {i}. 📌 {ticker} (신호강도: {signal_strength:.3f} - {strength_desc})
+- **현재가**: {current_price:,}원
+- **분석일**: {analysis_date}
+- **기술적 상태**: {technical_status}
+- **한국 시장 포지션**: {market_position}"""
+
+
+def _format_tech_row(item: Tuple[int, Tuple[Any, ...]]) -> str:
+    """(순번, (ticker, signal_strength, current_price, date)) 를 결과 행으로 변환"""
+    i, (ticker, signal_strength, current_price, analysis_date) = item
+    # 신호 강도에 따른 한국어 표현
+    strength_desc = "매우 강함" if signal_strength >= 0.9 else "강함" if signal_strength >= 0.7 else "보통"
+    return _ROW_TEMPLATE.format(
+        i=i,
+        ticker=ticker,
+        signal_strength=signal_strength,
+        strength_desc=strength_desc,
+        current_price=current_price,
+        analysis_date=analysis_date,
+        technical_status=_get_technical_status(signal_strength),
+        market_position=_get_market_position(current_price)
+    )
+
+# 구간 경계값 (bisect_right 로 라벨 인덱스를 구함: 경계값 이상이면 다음 구간)
+_SIGNAL_THRESHOLDS = (0.6, 0.7, 0.8, 0.9)
+_PRICE_THRESHOLDS = (5000, 20000, 50000, 100000)
+
+_TECHNICAL_STATUS_LABELS = (
+    "약한 신호 - 추가 확인 필요",
+    "보통 매수 신호 - 신중한 진입",
+    "양호한 매수 신호 - 분할 매수 권장",
+    "강한 매수 신호 - 적극 매수 고려",
+    "매우 강한 매수 신호 - 즉시 진입 권장"
+)
 
 
 def _get_technical_status(signal_strength: float) -> str:
     """신호 강도에 따른 기술적 상태 한국어 표현"""
-    if signal_strength >= 0.9:
-        return "매우 강한 매수 신호 - 즉시 진입 권장"
-    elif signal_strength >= 0.8:
-        return "강한 매수 신호 - 적극 매수 고려"
-    elif signal_strength >= 0.7:
-        return "양호한 매수 신호 - 분할 매수 권장"
-    elif signal_strength >= 0.6:
-        return "보통 매수 신호 - 신중한 진입"
-    else:
-        return "약한 신호 - 추가 확인 필요"
+    return _TECHNICAL_STATUS_LABELS[bisect_right(_SIGNAL_THRESHOLDS, signal_strength)]
+
+
+_MARKET_POSITION_LABELS = (
+    "저가주 (고위험 고수익)",
+    "소형주 (높은 변동성)",
+    "중소형주 (성장성 중심)",
+    "중형주 (안정성과 성장성 균형)",
+    "대형주 (외국인/기관 선호)"
+)
 
 
 def _get_market_position(price: float) -> str:
     """가격대에 따른 한국 시장 포지션 분류"""
-    if price >= 100000:
-        return "대형주 (외국인/기관 선호)"
-    elif price >= 50000:
-        return "중형주 (안정성과 성장성 균형)"
-    elif price >= 20000:
-        return "중소형주 (성장성 중심)"
-    elif price >= 5000:
-        return "소형주 (높은 변동성)"
-    else:
-        return "저가주 (고위험 고수익)"
\ No newline at end of file
+    return _MARKET_POSITION_LABELS[bisect_right(_PRICE_THRESHOLDS, price)]
\ No newline at end of file
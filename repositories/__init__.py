@@ -5,10 +5,12 @@ from .base import BaseRepository
 from .target_ticker_repository import TargetTickerRepository
 from .job_status_repository import JobStatusRepository
 from .stock_data_repository import StockDataRepository
+from .indicator_state_repository import IndicatorStateRepository
 
 __all__ = [
     "BaseRepository",
     "TargetTickerRepository",
     "JobStatusRepository",
-    "StockDataRepository"
+    "StockDataRepository",
+    "IndicatorStateRepository"
 ]
\ No newline at end of file
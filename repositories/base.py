@@ -136,6 +136,16 @@ class BaseRepository(Generic[T], ABC):
             logger.error(f"Error counting documents: {e}")
             raise
     
+    def fast_count(self, filter_dict: Optional[Dict[str, Any]] = None) -> int:
+        """Count documents, using collection metadata when no filter is given."""
+        if filter_dict:
+            return self.count_documents(filter_dict)
+        try:
+            return self.collection.estimated_document_count()
+        except PyMongoError as e:
+            logger.error(f"Error estimating document count: {e}")
+            raise
+    
     def upsert(self, filter_dict: Dict[str, Any], 
                document: Dict[str, Any]) -> bool:
         """Insert or update document."""
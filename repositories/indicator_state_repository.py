@@ -0,0 +1,43 @@
+"""
+Repository for per-ticker indicator state used by incremental analysis.
+"""
+from typing import Any, Dict, List
+import logging
+
+from pymongo.errors import PyMongoError
+
+from repositories.base import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+
+class IndicatorStateRepository(BaseRepository):
+    """Repository for the last indicator state of each analyzed ticker.
+
+    A state document holds everything TechnicalAnalyzer.advance_state needs to
+    extend a ticker's indicators by new bars without replaying its history.
+    """
+
+    def __init__(self):
+        super().__init__("system_info", "stock_indicator_state")
+
+    def get_states(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the stored state for each ticker that has one, in one query."""
+        if not tickers:
+            return {}
+        docs = self.find_many({"ticker": {"$in": list(tickers)}})
+        return {doc["ticker"]: doc for doc in docs}
+
+    def save_state(self, state: Dict[str, Any]) -> bool:
+        """Replace a ticker's stored state."""
+        try:
+            state = {key: value for key, value in state.items() if key != "_id"}
+            self.collection.replace_one({"ticker": state["ticker"]}, state, upsert=True)
+            return True
+        except PyMongoError as e:
+            logger.error(f"Error saving indicator state for {state.get('ticker')}: {e}")
+            raise
+
+    def clear_states(self) -> int:
+        """Drop every stored state so the next run recomputes from history."""
+        return self.delete_many({})
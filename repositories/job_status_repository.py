@@ -1,8 +1,8 @@
 """
 Repository for job status operations.
 """
-from typing import List, Optional
-from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime, timedelta, timezone
 import logging
 
 from repositories.base import BaseRepository
@@ -10,6 +10,15 @@ from schemas import JobStatusRecord, JobStatus
 
 logger = logging.getLogger(__name__)
 
+_RUNNING = JobStatus.RUNNING.value
+_COMPLETED = JobStatus.COMPLETED.value
+_FAILED = JobStatus.FAILED.value
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, matching stored job timestamps."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 
 class JobStatusRepository(BaseRepository):
     """Repository for managing job status records."""
@@ -17,10 +26,24 @@ class JobStatusRepository(BaseRepository):
     def __init__(self):
         super().__init__("system_info", "job_status")
     
-    def create_job_id(self, date_kst: date, job_name: str) -> str:
+    @staticmethod
+    def _to_record(doc: Dict[str, Any]) -> JobStatusRecord:
+        """Build a record from a stored document without re-running validation.
+        
+        Documents are written by this repository, so only the fields stored in a
+        different form are converted: the status string and the ISO date_kst.
+        """
+        date_kst = doc["date_kst"]
+        return JobStatusRecord.model_construct(**{
+            **doc,
+            "status": JobStatus(doc["status"]),
+            "date_kst": date.fromisoformat(date_kst) if isinstance(date_kst, str) else date_kst
+        })
+    
+    @staticmethod
+    def create_job_id(date_kst: date, job_name: str) -> str:
         """Create standardized job ID."""
-        date_str = date_kst.isoformat() if isinstance(date_kst, date) else date_kst
-        return f"{date_str}_{job_name}"
+        return f"{date_kst.isoformat()}_{job_name}"
     
     def start_job(self, job_name: str, date_kst: date) -> str:
         """Record job start."""
@@ -29,9 +52,9 @@ class JobStatusRepository(BaseRepository):
         job_record = {
             "_id": job_id,
             "job_name": job_name,
-            "date_kst": date_kst.isoformat() if isinstance(date_kst, date) else date_kst,
-            "status": JobStatus.RUNNING.value,
-            "start_time_utc": datetime.utcnow(),
+            "date_kst": date_kst.isoformat(),
+            "status": _RUNNING,
+            "start_time_utc": _utcnow(),
             "end_time_utc": None,
             "error_message": None,
             "records_processed": None
@@ -49,8 +72,8 @@ class JobStatusRepository(BaseRepository):
     def complete_job(self, job_id: str, records_processed: Optional[int] = None) -> bool:
         """Mark job as completed."""
         update_data = {
-            "status": JobStatus.COMPLETED.value,
-            "end_time_utc": datetime.utcnow()
+            "status": _COMPLETED,
+            "end_time_utc": _utcnow()
         }
         
         if records_processed is not None:
@@ -68,8 +91,8 @@ class JobStatusRepository(BaseRepository):
     def fail_job(self, job_id: str, error_message: str) -> bool:
         """Mark job as failed."""
         update_data = {
-            "status": JobStatus.FAILED.value,
-            "end_time_utc": datetime.utcnow(),
+            "status": _FAILED,
+            "end_time_utc": _utcnow(),
             "error_message": error_message
         }
         
@@ -87,55 +110,57 @@ class JobStatusRepository(BaseRepository):
         job_id = self.create_job_id(date_kst, job_name)
         doc = self.find_one({"_id": job_id})
         if doc:
-            return JobStatusRecord(**doc)
+            return self._to_record(doc)
         return None
     
     def get_last_successful_job(self, job_name: str) -> Optional[JobStatusRecord]:
         """Get the last successful job of given type."""
         docs = self.find_many(
-            {"job_name": job_name, "status": JobStatus.COMPLETED.value},
+            {"job_name": job_name, "status": _COMPLETED},
             sort=[("date_kst", -1)],
             limit=1
         )
         if docs:
-            return JobStatusRecord(**docs[0])
+            return self._to_record(docs[0])
         return None
     
     def get_last_successful_date(self, job_name: str) -> Optional[date]:
         """Get the date of the last successful job."""
-        last_job = self.get_last_successful_job(job_name)
-        if last_job:
-            date_str = last_job.date_kst
-            if isinstance(date_str, str):
-                return date.fromisoformat(date_str)
-            return date_str
-        return None
+        # Project just date_kst instead of building a full JobStatusRecord
+        doc = self.collection.find_one(
+            {"job_name": job_name, "status": _COMPLETED},
+            projection={"date_kst": 1, "_id": 0},
+            sort=[("date_kst", -1)]
+        )
+        if not doc:
+            return None
+        date_kst = doc["date_kst"]
+        return date.fromisoformat(date_kst) if isinstance(date_kst, str) else date_kst
     
     def get_failed_jobs(self, job_name: Optional[str] = None, 
                        days_back: int = 7) -> List[JobStatusRecord]:
         """Get failed jobs within specified days."""
-        cutoff_date = datetime.utcnow().date()
-        cutoff_date = date(cutoff_date.year, cutoff_date.month, cutoff_date.day - days_back)
+        cutoff_iso = (datetime.now(timezone.utc).date() - timedelta(days=days_back)).isoformat()
         
         filter_dict = {
-            "status": JobStatus.FAILED.value,
-            "date_kst": {"$gte": cutoff_date.isoformat()}
+            "status": _FAILED,
+            "date_kst": {"$gte": cutoff_iso}
         }
         
         if job_name:
             filter_dict["job_name"] = job_name
         
         docs = self.find_many(filter_dict, sort=[("date_kst", -1)])
-        return [JobStatusRecord(**doc) for doc in docs]
+        return [self._to_record(doc) for doc in docs]
     
     def get_running_jobs(self, job_name: Optional[str] = None) -> List[JobStatusRecord]:
         """Get currently running jobs."""
-        filter_dict = {"status": JobStatus.RUNNING.value}
+        filter_dict = {"status": _RUNNING}
         if job_name:
             filter_dict["job_name"] = job_name
         
         docs = self.find_many(filter_dict, sort=[("start_time_utc", -1)])
-        return [JobStatusRecord(**doc) for doc in docs]
+        return [self._to_record(doc) for doc in docs]
     
     def get_job_history(self, job_name: str, limit: int = 30) -> List[JobStatusRecord]:
         """Get job history for specific job type."""
@@ -144,16 +169,15 @@ class JobStatusRepository(BaseRepository):
             sort=[("date_kst", -1)],
             limit=limit
         )
-        return [JobStatusRecord(**docs) for doc in docs]
+        return [self._to_record(doc) for doc in docs]
     
     def cleanup_old_records(self, days_to_keep: int = 90) -> int:
         """Clean up old job status records."""
-        cutoff_date = datetime.utcnow().date()
-        cutoff_date = date(cutoff_date.year, cutoff_date.month, cutoff_date.day - days_to_keep)
+        cutoff_iso = (datetime.now(timezone.utc).date() - timedelta(days=days_to_keep)).isoformat()
         
         try:
             deleted_count = self.delete_many({
-                "date_kst": {"$lt": cutoff_date.isoformat()}
+                "date_kst": {"$lt": cutoff_iso}
             })
             logger.info(f"Cleaned up {deleted_count} old job status records")
             return deleted_count
@@ -164,41 +188,53 @@ class JobStatusRepository(BaseRepository):
     def get_job_statistics(self, job_name: Optional[str] = None, 
                           days_back: int = 30) -> dict:
         """Get job execution statistics."""
-        cutoff_date = datetime.utcnow().date()
-        cutoff_date = date(cutoff_date.year, cutoff_date.month, cutoff_date.day - days_back)
+        cutoff_iso = (datetime.now(timezone.utc).date() - timedelta(days=days_back)).isoformat()
         
-        filter_dict = {"date_kst": {"$gte": cutoff_date.isoformat()}}
+        filter_dict = {"date_kst": {"$gte": cutoff_iso}}
         if job_name:
             filter_dict["job_name"] = job_name
         
-        # Aggregate statistics
+        # Aggregate per-status counts and overall totals in a single round-trip
         pipeline = [
             {"$match": filter_dict},
-            {"$group": {
-                "_id": "$status",
-                "count": {"$sum": 1},
-                "avg_duration": {
-                    "$avg": {
-                        "$subtract": ["$end_time_utc", "$start_time_utc"]
-                    }
-                }
+            {"$project": {
+                "status": 1,
+                "duration_ms": {"$subtract": ["$end_time_utc", "$start_time_utc"]}
+            }},
+            {"$facet": {
+                "by_status": [
+                    {"$group": {
+                        "_id": "$status",
+                        "count": {"$sum": 1},
+                        "avg_duration": {"$avg": "$duration_ms"}
+                    }}
+                ],
+                "totals": [
+                    {"$group": {
+                        "_id": None,
+                        "total": {"$sum": 1},
+                        "completed": {"$sum": {
+                            "$cond": [{"$eq": ["$status", _COMPLETED]}, 1, 0]
+                        }},
+                        "failed": {"$sum": {
+                            "$cond": [{"$eq": ["$status", _FAILED]}, 1, 0]
+                        }}
+                    }}
+                ]
             }}
         ]
         
-        stats = list(self.collection.aggregate(pipeline))
+        # $facet always yields exactly one document; totals is empty when nothing matched
+        stats = next(self.collection.aggregate(pipeline), {})
+        totals = (stats.get("totals") or [{}])[0]
+        
+        completed_count = totals.get("completed", 0)
+        total_finished = completed_count + totals.get("failed", 0)
         
         result = {
-            "total_jobs": sum(stat["count"] for stat in stats),
-            "by_status": {stat["_id"]: stat["count"] for stat in stats}
+            "total_jobs": totals.get("total", 0),
+            "by_status": {stat["_id"]: stat["count"] for stat in stats.get("by_status", [])},
+            "success_rate": completed_count / total_finished if total_finished > 0 else 0.0
         }
         
-        # Add success rate
-        completed_count = result["by_status"].get(JobStatus.COMPLETED.value, 0)
-        total_finished = completed_count + result["by_status"].get(JobStatus.FAILED.value, 0)
-        
-        if total_finished > 0:
-            result["success_rate"] = completed_count / total_finished
-        else:
-            result["success_rate"] = 0.0
-        
         return result
\ No newline at end of file
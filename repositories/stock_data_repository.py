@@ -5,6 +5,7 @@ from typing import List, Optional, Dict, Any
 from datetime import date, datetime
 import logging
 
+from database import db_manager, OHLCV_COLLECTION
 from repositories.base import BaseRepository
 from schemas import OHLCVData
 
@@ -15,14 +16,40 @@ class StockDataRepository(BaseRepository):
     """Repository for managing stock OHLCV data."""
     
     def __init__(self, ticker: str):
-        super().__init__("stock_data", ticker)
+        # All tickers share one collection; every query below filters by ticker
+        super().__init__("stock_data", OHLCV_COLLECTION)
         self.ticker = ticker
     
-    def add_ohlcv_data(self, ohlcv: OHLCVData) -> bool:
+    def count_documents(self, filter_dict: Dict[str, Any] = None) -> int:
+        """Count documents for this ticker matching filter."""
+        return super().count_documents({**(filter_dict or {}), "ticker": self.ticker})
+    
+    def fast_count(self, filter_dict: Optional[Dict[str, Any]] = None) -> int:
+        """Count this ticker's documents (the collection-wide estimate covers all tickers)."""
+        return self.count_documents(filter_dict)
+    
+    def delete_many(self, filter_dict: Dict[str, Any]) -> int:
+        """Delete this ticker's documents matching filter."""
+        # delete_many({}) must only clear this ticker, not the shared collection
+        deleted_count = super().delete_many({**filter_dict, "ticker": self.ticker})
+        if deleted_count:
+            # Deleted rows leave nothing for the cache's created_at refresh to find
+            self._invalidate_cache()
+        return deleted_count
+    
+    def _invalidate_cache(self) -> None:
+        """Drop this ticker's local OHLCV cache file (see utils.ohlcv_cache)."""
+        from utils import ohlcv_cache
+        ohlcv_cache.invalidate(self.ticker)
+    
+    def add_ohlcv_data(self, ohlcv: OHLCVData,
+                       created_at: Optional[datetime] = None) -> bool:
         """Add OHLCV data for a specific date."""
         try:
             doc = ohlcv.dict()
             doc["date"] = ohlcv.date.isoformat() if isinstance(ohlcv.date, date) else ohlcv.date
+            # Always restamp: a corrected row must look newer than the cached copy
+            doc["created_at"] = created_at or datetime.utcnow()
             
             # Use upsert to prevent duplicates
             filter_dict = {"date": doc["date"], "ticker": self.ticker}
@@ -38,8 +65,9 @@ class StockDataRepository(BaseRepository):
     def add_multiple_ohlcv_data(self, ohlcv_list: List[OHLCVData]) -> int:
         """Add multiple OHLCV data records."""
         added_count = 0
+        created_at = datetime.utcnow()
         for ohlcv in ohlcv_list:
-            if self.add_ohlcv_data(ohlcv):
+            if self.add_ohlcv_data(ohlcv, created_at):
                 added_count += 1
         return added_count
     
@@ -64,6 +92,50 @@ class StockDataRepository(BaseRepository):
         docs = self.find_many(filter_dict, sort=[("date", 1)])
         return [OHLCVData(**doc) for doc in docs]
     
+    @classmethod
+    def get_date_range_bulk(cls, tickers: List[str], start_date: date,
+                            end_date: date) -> Dict[str, List[OHLCVData]]:
+        """Get OHLCV data for several tickers' date range in one query."""
+        start_str = start_date.isoformat() if isinstance(start_date, date) else start_date
+        end_str = end_date.isoformat() if isinstance(end_date, date) else end_date
+        
+        result: Dict[str, List[OHLCVData]] = {ticker: [] for ticker in tickers}
+        if not tickers:
+            return result
+        
+        collection = db_manager.get_collection("stock_data", OHLCV_COLLECTION)
+        cursor = collection.find(
+            {"ticker": {"$in": list(tickers)}, "date": {"$gte": start_str, "$lte": end_str}}
+        ).sort([("ticker", 1), ("date", 1)])
+        
+        for doc in cursor:
+            result[doc["ticker"]].append(OHLCVData(**doc))
+        return result
+    
+    @classmethod
+    def get_changed_since_bulk(cls, since: Dict[str, datetime], start_date: date,
+                               end_date: date) -> Dict[str, List[OHLCVData]]:
+        """Get rows in the date range written at or after each ticker's timestamp."""
+        start_str = start_date.isoformat() if isinstance(start_date, date) else start_date
+        end_str = end_date.isoformat() if isinstance(end_date, date) else end_date
+        
+        result: Dict[str, List[OHLCVData]] = {ticker: [] for ticker in since}
+        if not since:
+            return result
+        
+        collection = db_manager.get_collection("stock_data", OHLCV_COLLECTION)
+        cursor = collection.find({
+            "date": {"$gte": start_str, "$lte": end_str},
+            "$or": [
+                {"ticker": ticker, "created_at": {"$gte": written_at}}
+                for ticker, written_at in since.items()
+            ]
+        }).sort([("ticker", 1), ("date", 1)])
+        
+        for doc in cursor:
+            result[doc["ticker"]].append(OHLCVData(**doc))
+        return result
+    
     def get_recent_data(self, limit: int = 30) -> List[OHLCVData]:
         """Get most recent OHLCV data."""
         docs = self.find_many(
@@ -162,14 +234,18 @@ class StockDataRepository(BaseRepository):
     def restore_from_dict(self, data_list: List[Dict[str, Any]]) -> int:
         """Restore data from list of dictionaries."""
         try:
-            # Add ticker and created_at if missing
+            # Add ticker and created_at if missing (one timestamp for the batch)
+            created_at = datetime.utcnow()
             for doc in data_list:
                 if "ticker" not in doc:
                     doc["ticker"] = self.ticker
                 if "created_at" not in doc:
-                    doc["created_at"] = datetime.utcnow()
+                    doc["created_at"] = created_at
             
             self.insert_many(data_list)
+            # Restored rows keep their backed-up created_at, which the cache's
+            # created_at refresh would skip
+            self._invalidate_cache()
             logger.info(f"Restored {len(data_list)} records for {self.ticker}")
             return len(data_list)
         except Exception as e:
@@ -1,10 +1,12 @@
 """
 Repository for target ticker operations.
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import date, datetime
 import logging
 
+from pymongo import UpdateOne
+
 from repositories.base import BaseRepository
 from schemas import TargetTicker
 
@@ -43,20 +45,52 @@ class TargetTickerRepository(BaseRepository):
         docs = self.find_many(filter_dict, sort=[("market_cap", -1)])
         return [TargetTicker(**doc) for doc in docs]
     
-    def get_pending_analysis(self, target_date: date) -> List[TargetTicker]:
-        """Get tickers that need analysis for target date."""
-        filter_dict = {
+    @staticmethod
+    def _pending_filter(target_date: date) -> Dict[str, Any]:
+        """Filter for active tickers not yet analyzed for target date."""
+        date_str = target_date.isoformat() if isinstance(target_date, date) else target_date
+        return {
             "is_active": True,
             "$or": [
-                {"last_analyzed_date": {"$lt": target_date}},
+                {"last_analyzed_date": {"$lt": date_str}},
                 {"last_analyzed_date": {"$exists": False}},
                 {"last_analyzed_date": None}
             ]
         }
+    
+    def get_pending_analysis(self, target_date: date, limit: Optional[int] = None,
+                             sort: Optional[List[tuple]] = None) -> List[TargetTicker]:
+        """Get tickers that need analysis for target date.
         
-        docs = self.find_many(filter_dict, sort=[("market_cap", -1)])
+        Sorting (largest market cap first by default) and the limit are applied
+        by MongoDB, so only the returned tickers are decoded.
+        """
+        docs = self.find_many(
+            self._pending_filter(target_date), limit=limit, sort=sort or [("market_cap", -1)]
+        )
         return [TargetTicker(**doc) for doc in docs]
     
+    def count_pending(self, target_date: date) -> int:
+        """Count tickers that need analysis for target date, without fetching them."""
+        return self.count_documents(self._pending_filter(target_date))
+    
+    def get_analysis_counts(self, target_date: date) -> Tuple[int, int]:
+        """Count active tickers and those already analyzed for target date, in one round trip."""
+        date_str = target_date.isoformat() if isinstance(target_date, date) else target_date
+        pipeline = [
+            {"$match": {"is_active": True}},
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": 1},
+                # Complement of _pending_filter; missing/null dates sort below strings
+                "analyzed": {"$sum": {"$cond": [{"$gte": ["$last_analyzed_date", date_str]}, 1, 0]}}
+            }}
+        ]
+        result = list(self.collection.aggregate(pipeline))
+        if not result:
+            return 0, 0
+        return result[0]["total"], result[0]["analyzed"]
+    
     def add_ticker(self, ticker_data: TargetTicker) -> bool:
         """Add new target ticker."""
         try:
@@ -95,6 +129,24 @@ class TargetTickerRepository(BaseRepository):
             logger.error(f"Failed to update last_analyzed_date for {ticker}: {e}")
             return False
     
+    def bulk_update_last_analyzed(self, tickers: List[str], analyzed_date: date) -> int:
+        """Update last analyzed date for many tickers in one bulk write."""
+        if not tickers:
+            return 0
+        
+        date_str = analyzed_date.isoformat() if isinstance(analyzed_date, date) else analyzed_date
+        updated_at = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"ticker": ticker},
+                {"$set": {"last_analyzed_date": date_str, "updated_at": updated_at}}
+            )
+            for ticker in tickers
+        ]
+        result = self.collection.bulk_write(operations, ordered=False)
+        logger.debug(f"Updated last_analyzed_date for {result.matched_count} tickers to {date_str}")
+        return result.matched_count
+    
     def deactivate_ticker(self, ticker: str) -> bool:
         """Deactivate a ticker (set is_active to False)."""
         try:
@@ -2,18 +2,26 @@
 AI analysis API routers.
 """
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
 import logging
 
 from services import ai_service
 from schemas import AIAnalysisRequest, AIAnalysisResponse
+from utils.inflight import ai_limiter
+from utils.tickers import parse_ticker_csv
+from utils.ttl_cache import async_ttl_cache
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Responses that rarely change are cached for this many seconds
+_INFO_CACHE_TTL = 300
 
 
 @router.get("/model-info")
+@async_ttl_cache(_INFO_CACHE_TTL)
 async def get_model_info():
     """Get information about the AI model."""
     try:
@@ -24,6 +32,7 @@ async def get_model_info():
 
 
 @router.get("/prompts")
+@async_ttl_cache(_INFO_CACHE_TTL)
 async def list_available_prompts():
     """List all available AI analysis prompts."""
     try:
@@ -37,49 +46,54 @@ async def list_available_prompts():
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+async def _run_analysis(tickers: List[str], prompt_type: str,
+                        custom_prompt: Optional[str]) -> AIAnalysisResponse:
+    """Run AI analysis with already-parsed arguments (shared by POST and GET)."""
+    # Validate AI service availability
+    if not ai_service.is_available():
+        raise HTTPException(
+            status_code=503, 
+            detail="AI service is not available. Please check API key configuration."
+        )
+    
+    # Validate tickers
+    if not tickers:
+        raise HTTPException(status_code=400, detail="At least one ticker is required")
+    
+    if len(tickers) > 10:
+        raise HTTPException(status_code=400, detail="Maximum 10 tickers allowed per request")
+    
+    # Perform analysis
+    async with ai_limiter:
+        result = await ai_service.analyze_stocks(
+            tickers=tickers,
+            prompt_type=prompt_type,
+            custom_prompt=custom_prompt,
+            context={"request_source": "api"}
+        )
+    
+    # Check for errors in result
+    if "error" in result:
+        if "No stock data found" in result["error"]:
+            raise HTTPException(status_code=404, detail=result["error"])
+        elif "Unknown prompt type" in result["error"]:
+            raise HTTPException(status_code=400, detail=result["error"])
+        else:
+            raise HTTPException(status_code=500, detail=result["error"])
+    
+    # Convert to response model
+    return AIAnalysisResponse(
+        analysis_result=result["analysis_result"],
+        analyzed_tickers=result["analyzed_tickers"],
+        model_used=result["model_used"]
+    )
+
+
 @router.post("/analysis", response_model=AIAnalysisResponse)
 async def analyze_stocks(request: AIAnalysisRequest):
     """Perform AI analysis on selected stocks."""
     try:
-        # Validate AI service availability
-        if not ai_service.is_available():
-            raise HTTPException(
-                status_code=503, 
-                detail="AI service is not available. Please check API key configuration."
-            )
-        
-        # Validate tickers
-        if not request.tickers:
-            raise HTTPException(status_code=400, detail="At least one ticker is required")
-        
-        if len(request.tickers) > 10:
-            raise HTTPException(status_code=400, detail="Maximum 10 tickers allowed per request")
-        
-        # Perform analysis
-        result = await ai_service.analyze_stocks(
-            tickers=request.tickers,
-            prompt_type=request.prompt_type,
-            custom_prompt=request.custom_prompt,
-            context={"request_source": "api"}
-        )
-        
-        # Check for errors in result
-        if "error" in result:
-            if "No stock data found" in result["error"]:
-                raise HTTPException(status_code=404, detail=result["error"])
-            elif "Unknown prompt type" in result["error"]:
-                raise HTTPException(status_code=400, detail=result["error"])
-            else:
-                raise HTTPException(status_code=500, detail=result["error"])
-        
-        # Convert to response model
-        response = AIAnalysisResponse(
-            analysis_result=result["analysis_result"],
-            analyzed_tickers=result["analyzed_tickers"],
-            model_used=result["model_used"]
-        )
-        
-        return response
+        return await _run_analysis(request.tickers, request.prompt_type, request.custom_prompt)
         
     except HTTPException:
         raise
@@ -97,23 +111,13 @@ async def analyze_stocks_get(
     """Perform AI analysis using GET method."""
     try:
         # Parse tickers
-        ticker_list = [ticker.strip() for ticker in tickers.split(",") if ticker.strip()]
+        ticker_list = parse_ticker_csv(tickers)
         
         if not ticker_list:
-            raise HTTPException(status_code=400, detail="At least one ticker is required")
-        
-        if len(ticker_list) > 10:
-            raise HTTPException(status_code=400, detail="Maximum 10 tickers allowed per request")
+            raise HTTPException(status_code=400, detail="Tickers must be comma-separated 6-character KRX codes")
         
-        # Create request object
-        request = AIAnalysisRequest(
-            tickers=ticker_list,
-            prompt_type=prompt_type,
-            custom_prompt=custom_prompt
-        )
-        
-        # Use POST endpoint logic
-        return await analyze_stocks(request)
+        # Query parameters are already validated, so skip building an AIAnalysisRequest
+        return await _run_analysis(ticker_list, prompt_type, custom_prompt)
         
     except HTTPException:
         raise
@@ -132,18 +136,15 @@ async def analyze_screener_results(
     """Analyze stocks selected by screener strategy."""
     try:
         # Import here to avoid circular imports
-        from routers.screener import screen_stocks
-        from schemas import ScreenerRequest
+        from routers.screener import _screen_stocks_impl
         
         # Run screener first
-        screener_request = ScreenerRequest(
-            strategy_name=strategy_name,
-            parameters=strategy_parameters if strategy_parameters else None,
-            limit=limit
+        screener_result = await _screen_stocks_impl(
+            strategy_name,
+            strategy_parameters if strategy_parameters else None,
+            limit
         )
         
-        screener_result = await screen_stocks(screener_request)
-        
         if not screener_result.matched_tickers:
             return {
                 "message": f"No stocks found using {strategy_name} strategy",
@@ -152,16 +153,17 @@ async def analyze_screener_results(
             }
         
         # Analyze selected tickers
-        analysis_result = await ai_service.analyze_stocks(
-            tickers=screener_result.matched_tickers,
-            prompt_type=prompt_type,
-            context={
-                "strategy_used": strategy_name,
-                "strategy_parameters": strategy_parameters,
-                "screener_execution_time": screener_result.execution_time_ms,
-                "total_matches": screener_result.total_matches
-            }
-        )
+        async with ai_limiter:
+            analysis_result = await ai_service.analyze_stocks(
+                tickers=screener_result.matched_tickers,
+                prompt_type=prompt_type,
+                context={
+                    "strategy_used": strategy_name,
+                    "strategy_parameters": strategy_parameters,
+                    "screener_execution_time": screener_result.execution_time_ms,
+                    "total_matches": screener_result.total_matches
+                }
+            )
         
         # Add screener info to response
         analysis_result["screener_info"] = {
@@ -204,11 +206,12 @@ async def custom_analysis(
 
 구체적이고 실용적인 분석을 제공해주세요."""
         
-        result = await ai_service.analyze_stocks(
-            tickers=tickers,
-            custom_prompt=custom_prompt,
-            context=context or {}
-        )
+        async with ai_limiter:
+            result = await ai_service.analyze_stocks(
+                tickers=tickers,
+                custom_prompt=custom_prompt,
+                context=context or {}
+            )
         
         if "error" in result:
             raise HTTPException(status_code=400, detail=result["error"])
@@ -2,18 +2,37 @@
 딕셔너리 기반 AI 분석 API 라우터
 한국 주식 시장 특화 AI 분석 API 제공
 """
-from fastapi import APIRouter, HTTPException, Query, Body
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Body, Header, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import AsyncIterator, List, Optional, Dict, Any
+import asyncio
 import logging
 
-from services.dict_ai_service import dict_ai_service
+import orjson
+
+from services.dict_ai_service import BATCH_MAX_SIZE, dict_ai_service
+from utils.inflight import ai_limiter
+from utils.tickers import parse_ticker_csv
+from utils.ttl_cache import TTLCache, async_ttl_cache, cache_key
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/ai", tags=["AI Analysis"])
+router = APIRouter(prefix="/ai", tags=["AI Analysis"], default_response_class=ORJSONResponse)
+
+# 거의 바뀌지 않는 조회 응답의 캐시 유지 시간(초)
+_INFO_CACHE_TTL = 300
+# 헬스 체크 프로브가 몰릴 때 흡수할 만큼만 짧게 캐시
+_HEALTH_CACHE_TTL = 5
+
+# 같은 자유형 분석 요청의 AI 응답 재사용 (현재가에 좌우되므로 5분)
+_custom_analysis_cache = TTLCache(ttl=300)
+
+# 스트리밍 응답의 마지막 줄
+_STREAM_DONE = b'{"done":true}\n'
 
 
 @router.get("/service-info")
+@async_ttl_cache(_INFO_CACHE_TTL)
 async def get_service_info():
     """AI 서비스 정보 조회"""
     try:
@@ -25,15 +44,16 @@ async def get_service_info():
 
 @router.get("/strategies")
 async def list_available_strategies():
-    """사용 가능한 전략 목록 조회"""
+    """사용 가능한 전략 목록 조회 (목록은 전략 관리자가 레지스트리 버전별로 캐시)"""
     try:
         strategies = dict_ai_service.strategy_manager.list_strategies()
-        return {
+        content = orjson.dumps({
             "success": True,
             "strategies": strategies,
             "total_count": len(strategies),
             "korean_market_optimized": True
-        }
+        })
+        return Response(content=content, media_type="application/json")
     except Exception as e:
         logger.error(f"전략 목록 조회 실패: {e}")
         raise HTTPException(status_code=500, detail="내부 서버 오류")
@@ -64,13 +84,14 @@ async def analyze_with_strategy(
                 detail=f"유효하지 않은 분석 타입: {analysis_type}. 사용 가능: {valid_types}"
             )
 
-        # AI 분석 실행
-        result = await dict_ai_service.analyze_with_strategy(
-            strategy_name=strategy_name,
-            ticker_list=ticker_list,
-            limit=limit,
-            analysis_type=analysis_type
-        )
+        # AI 분석 실행 (동시 요청 상한 초과 시 429)
+        async with ai_limiter:
+            result = await dict_ai_service.analyze_with_strategy(
+                strategy_name=strategy_name,
+                ticker_list=ticker_list,
+                limit=limit,
+                analysis_type=analysis_type
+            )
 
         if not result.get("success"):
             error_msg = result.get("error", "알 수 없는 오류")
@@ -102,7 +123,9 @@ async def analyze_with_strategy_get(
         # 종목 파싱
         ticker_list = None
         if tickers:
-            ticker_list = [ticker.strip() for ticker in tickers.split(",") if ticker.strip()]
+            ticker_list = parse_ticker_csv(tickers)
+            if ticker_list is None:
+                raise HTTPException(status_code=400, detail="종목 코드는 쉼표로 구분된 6자리 코드여야 합니다")
 
         # POST 엔드포인트 로직 재사용
         return await analyze_with_strategy(
@@ -151,10 +174,11 @@ async def analyze_portfolio(
             )
 
         # 포트폴리오 분석 실행
-        result = await dict_ai_service.analyze_portfolio(
-            ticker_list=ticker_list,
-            analysis_focus=analysis_focus
-        )
+        async with ai_limiter:
+            result = await dict_ai_service.analyze_portfolio(
+                ticker_list=ticker_list,
+                analysis_focus=analysis_focus
+            )
 
         if not result.get("success"):
             error_msg = result.get("error", "알 수 없는 오류")
@@ -172,11 +196,117 @@ async def analyze_portfolio(
         raise HTTPException(status_code=500, detail="내부 서버 오류")
 
 
+def _validate_custom_request(ticker_list: List[str], analysis_request: str) -> None:
+    """자유형 분석 요청 검증"""
+    if len(ticker_list) > 10:
+        raise HTTPException(status_code=400, detail="최대 10개 종목까지 분석 가능합니다")
+
+    if not analysis_request.strip():
+        raise HTTPException(status_code=400, detail="분석 요청 내용을 입력해주세요")
+
+
+def _build_custom_prompt(ticker_list: List[str],
+                         analysis_request: str,
+                         context: Optional[Dict[str, Any]]) -> str:
+    """자유형 분석 프롬프트 생성"""
+    return f"""
+한국 주식 시장 전문 애널리스트로서 다음 종목들을 분석해주세요:
+
+## 분석 대상 종목: {', '.join(ticker_list)}
+
+## 분석 요청:
+{analysis_request}
+
+## 추가 정보:
+{context if context else '없음'}
+
+한국 주식 시장의 특성을 고려하여 구체적이고 실용적인 분석을 한국어로 제공해주세요.
+"""
+
+
+def _custom_result(ticker_list: List[str],
+                   analysis_request: str,
+                   context: Optional[Dict[str, Any]],
+                   ai_analysis: str) -> Dict[str, Any]:
+    """자유형 분석 응답 본문"""
+    return {
+        "success": True,
+        "ticker_list": ticker_list,
+        "analysis_request": analysis_request,
+        "ai_analysis": ai_analysis,
+        "context": context,
+        "analysis_type": "custom"
+    }
+
+
+async def _run_custom_analysis(ticker_list: List[str],
+                               analysis_request: str,
+                               context: Optional[Dict[str, Any]],
+                               batched: bool = False) -> Dict[str, Any]:
+    """자유형 분석 실행 (batched=True 면 다른 요청과 묶어 한 번에 생성)"""
+    key = cache_key(sorted(ticker_list), analysis_request, context)
+    cached = _custom_analysis_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    prompt = _build_custom_prompt(ticker_list, analysis_request, context)
+
+    # AI 분석 생성
+    if batched:
+        ai_analysis = await dict_ai_service.generate_batched(prompt)
+    else:
+        ai_analysis = (await dict_ai_service.model.generate_content_async(prompt)).text
+
+    result = _custom_result(ticker_list, analysis_request, context, ai_analysis)
+    _custom_analysis_cache.set(key, dict(result))
+    return result
+
+
+async def _stream_custom_analysis(ticker_list: List[str],
+                                  analysis_request: str,
+                                  context: Optional[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """
+    자유형 분석을 생성되는 대로 NDJSON 한 줄씩 전송
+
+    {"delta": ...} 줄이 이어지고 마지막에 {"done": true} 가 온다.
+    헤더가 이미 나간 뒤이므로 실패는 {"error": ...} 줄로 알린다.
+    """
+    key = cache_key(sorted(ticker_list), analysis_request, context)
+    cached = _custom_analysis_cache.get(key)
+    if cached is not None:
+        yield orjson.dumps({"delta": cached["ai_analysis"]}) + b"\n"
+        yield _STREAM_DONE
+        return
+
+    prompt = _build_custom_prompt(ticker_list, analysis_request, context)
+    parts = []
+    try:
+        # 스트림이 끝날 때까지 슬롯 유지 (연결이 끊기면 제너레이터 종료와 함께 반환)
+        async with ai_limiter:
+            response = await dict_ai_service.model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                parts.append(chunk.text)
+                yield orjson.dumps({"delta": chunk.text}) + b"\n"
+    except HTTPException as e:
+        yield orjson.dumps({"error": e.detail}) + b"\n"
+        return
+    except Exception as e:
+        logger.error(f"커스텀 분석 스트리밍 실패: {e}")
+        yield orjson.dumps({"error": "내부 서버 오류"}) + b"\n"
+        return
+
+    result = _custom_result(ticker_list, analysis_request, context, "".join(parts))
+    _custom_analysis_cache.set(key, result)
+    yield _STREAM_DONE
+
+
 @router.post("/analyze/custom")
 async def custom_analysis(
     ticker_list: List[str] = Body(..., description="분석할 종목 리스트"),
     analysis_request: str = Body(..., description="분석 요청 내용"),
-    context: Optional[Dict[str, Any]] = Body(None, description="추가 컨텍스트")
+    context: Optional[Dict[str, Any]] = Body(None, description="추가 컨텍스트"),
+    x_batch: Optional[str] = Header(None, description="1 이면 동시에 들어온 요청과 묶어 생성"),
+    stream: bool = Query(False, description="true(1) 면 생성되는 텍스트를 NDJSON 으로 바로 전송")
 ):
     """
     자유형 AI 분석
@@ -185,6 +315,8 @@ async def custom_analysis(
         ticker_list: 분석할 종목들
         analysis_request: 자연어로 작성된 분석 요청
         context: 추가 정보
+        x_batch: X-Batch 헤더
+        stream: 스트리밍 여부 (기존 JSON 응답 형식은 stream 을 주지 않을 때 그대로)
     """
     try:
         if not dict_ai_service.is_available():
@@ -193,47 +325,88 @@ async def custom_analysis(
                 detail="AI 서비스를 사용할 수 없습니다. API 키를 확인해주세요."
             )
 
-        if len(ticker_list) > 10:
-            raise HTTPException(status_code=400, detail="최대 10개 종목까지 분석 가능합니다")
+        _validate_custom_request(ticker_list, analysis_request)
 
-        if not analysis_request.strip():
-            raise HTTPException(status_code=400, detail="분석 요청 내용을 입력해주세요")
+        if stream:
+            return StreamingResponse(
+                _stream_custom_analysis(ticker_list, analysis_request, context),
+                media_type="application/x-ndjson"
+            )
 
-        # 커스텀 프롬프트 생성
-        prompt = f"""
-한국 주식 시장 전문 애널리스트로서 다음 종목들을 분석해주세요:
+        async with ai_limiter:
+            return await _run_custom_analysis(
+                ticker_list, analysis_request, context, batched=x_batch == "1"
+            )
 
-## 분석 대상 종목: {', '.join(ticker_list)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"커스텀 분석 실패: {e}")
+        raise HTTPException(status_code=500, detail="내부 서버 오류")
 
-## 분석 요청:
-{analysis_request}
 
-## 추가 정보:
-{context if context else '없음'}
+@router.post("/analyze/batch")
+async def batch_analysis(
+    requests: List[Dict[str, Any]] = Body(
+        ..., description="자유형 분석 요청 목록 (각 항목: ticker_list, analysis_request, context)"
+    )
+):
+    """
+    여러 자유형 AI 분석을 한 번의 모델 요청으로 묶어 실행
 
-한국 주식 시장의 특성을 고려하여 구체적이고 실용적인 분석을 한국어로 제공해주세요.
-"""
+    Args:
+        requests: /analyze/custom 본문과 같은 형식의 요청들 (최대 8개)
+    """
+    try:
+        if not dict_ai_service.is_available():
+            raise HTTPException(
+                status_code=503,
+                detail="AI 서비스를 사용할 수 없습니다. API 키를 확인해주세요."
+            )
 
-        # AI 분석 생성
-        response = dict_ai_service.model.generate_content(prompt)
+        if not requests:
+            raise HTTPException(status_code=400, detail="최소 1개 요청이 필요합니다")
+
+        if len(requests) > BATCH_MAX_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"배치 분석은 최대 {BATCH_MAX_SIZE}개 요청까지 가능합니다"
+            )
+
+        for item in requests:
+            ticker_list = item.get("ticker_list")
+            analysis_request = item.get("analysis_request")
+            if not isinstance(ticker_list, list) or not isinstance(analysis_request, str):
+                raise HTTPException(
+                    status_code=400,
+                    detail="각 요청에는 ticker_list(목록)와 analysis_request(문자열)가 필요합니다"
+                )
+            _validate_custom_request(ticker_list, analysis_request)
+
+        # 묶음 전체가 한 번의 모델 요청이므로 슬롯 하나만 사용
+        async with ai_limiter:
+            results = await asyncio.gather(*(
+                _run_custom_analysis(
+                    item["ticker_list"], item["analysis_request"], item.get("context"), batched=True
+                )
+                for item in requests
+            ))
 
         return {
             "success": True,
-            "ticker_list": ticker_list,
-            "analysis_request": analysis_request,
-            "ai_analysis": response.text,
-            "context": context,
-            "analysis_type": "custom"
+            "batch_size": len(results),
+            "results": results
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"커스텀 분석 실패: {e}")
+        logger.error(f"배치 분석 실패: {e}")
         raise HTTPException(status_code=500, detail="내부 서버 오류")
 
 
 @router.get("/health")
+@async_ttl_cache(_HEALTH_CACHE_TTL)
 async def health_check():
     """AI 서비스 헬스 체크"""
     try:
@@ -254,43 +427,58 @@ async def health_check():
         }
 
 
+# 고정된 사용 예시 (import 시 한 번만 JSON 직렬화해 매 요청 같은 바이트 반환)
+_USAGE_EXAMPLES = {
+    "strategy_analysis_example": {
+        "url": "/ai/analyze/strategy",
+        "method": "POST",
+        "body": {
+            "strategy_name": "dictmacdgoldencrossstrategy",
+            "ticker_list": ["005930", "000660"],
+            "limit": 5,
+            "analysis_type": "detailed"
+        }
+    },
+    "portfolio_analysis_example": {
+        "url": "/ai/analyze/portfolio",
+        "method": "POST",
+        "body": {
+            "ticker_list": ["005930", "000660", "035420"],
+            "analysis_focus": "risk_assessment"
+        }
+    },
+    "custom_analysis_example": {
+        "url": "/ai/analyze/custom",
+        "method": "POST",
+        "body": {
+            "ticker_list": ["005930"],
+            "analysis_request": "현재 매수 타이밍이 적절한지 분석해주세요",
+            "context": {"investment_horizon": "3개월"}
+        }
+    },
+    "batch_analysis_example": {
+        "url": "/ai/analyze/batch",
+        "method": "POST",
+        "body": [
+            {"ticker_list": ["005930"], "analysis_request": "단기 매수 타이밍을 분석해주세요"},
+            {"ticker_list": ["000660"], "analysis_request": "주요 리스크 요인을 정리해주세요"}
+        ]
+    },
+    "available_strategies": [
+        "dictmacdgoldencrossstrategy",
+        "dictrsioversoldstrategy",
+        "dictbollingersqueezestrategy",
+        "dictmovingaveragecrossoverstrategy"
+    ],
+    "available_analysis_types": ["detailed", "summary", "trading_signal"],
+    "available_focus_areas": ["risk_assessment", "growth_potential", "market_timing"]
+}
+
+
+_USAGE_EXAMPLES_JSON = orjson.dumps(_USAGE_EXAMPLES)
+
+
 @router.get("/examples")
 async def get_usage_examples():
     """API 사용 예시 제공"""
-    return {
-        "strategy_analysis_example": {
-            "url": "/ai/analyze/strategy",
-            "method": "POST",
-            "body": {
-                "strategy_name": "dictmacdgoldencrossstrategy",
-                "ticker_list": ["005930", "000660"],
-                "limit": 5,
-                "analysis_type": "detailed"
-            }
-        },
-        "portfolio_analysis_example": {
-            "url": "/ai/analyze/portfolio",
-            "method": "POST",
-            "body": {
-                "ticker_list": ["005930", "000660", "035420"],
-                "analysis_focus": "risk_assessment"
-            }
-        },
-        "custom_analysis_example": {
-            "url": "/ai/analyze/custom",
-            "method": "POST",
-            "body": {
-                "ticker_list": ["005930"],
-                "analysis_request": "현재 매수 타이밍이 적절한지 분석해주세요",
-                "context": {"investment_horizon": "3개월"}
-            }
-        },
-        "available_strategies": [
-            "dictmacdgoldencrossstrategy",
-            "dictrsioversoldstrategy",
-            "dictbollingersqueezestrategy",
-            "dictmovingaveragecrossoverstrategy"
-        ],
-        "available_analysis_types": ["detailed", "summary", "trading_signal"],
-        "available_focus_areas": ["risk_assessment", "growth_potential", "market_timing"]
-    }
\ No newline at end of file
+    return Response(content=_USAGE_EXAMPLES_JSON, media_type="application/json")
\ No newline at end of file
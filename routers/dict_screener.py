@@ -2,31 +2,41 @@
 딕셔너리 기반 주식 스크리너 API 라우터
 한국 주식 시장 특화 전략 스크리닝 API 제공
 """
-from fastapi import APIRouter, HTTPException, Query, Body
+from fastapi import APIRouter, HTTPException, Query, Body, Response
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
 
+import orjson
+
 from strategies.dict_base_strategy import DictStrategyManager
+from utils.tickers import parse_ticker_csv
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/screener", tags=["Stock Screener"])
+router = APIRouter(prefix="/screener", tags=["Stock Screener"], default_response_class=ORJSONResponse)
 
 # 전역 전략 관리자
 strategy_manager = DictStrategyManager()
 
+# 다중 전략 스크리닝용 스레드 풀 (요청당 최대 5개 전략을 동시에 실행)
+_strategy_pool = ThreadPoolExecutor(max_workers=5, thread_name_prefix="strategy")
+
 
 @router.get("/strategies")
 async def list_strategies():
-    """사용 가능한 스크리닝 전략 목록 조회"""
+    """사용 가능한 스크리닝 전략 목록 조회 (목록은 전략 관리자가 레지스트리 버전별로 캐시)"""
     try:
         strategies = strategy_manager.list_strategies()
-        return {
+        content = orjson.dumps({
             "success": True,
             "strategies": strategies,
             "total_count": len(strategies),
             "korean_market_optimized": True
-        }
+        })
+        return Response(content=content, media_type="application/json")
     except Exception as e:
         logger.error(f"전략 목록 조회 실패: {e}")
         raise HTTPException(status_code=500, detail="내부 서버 오류")
@@ -93,7 +103,9 @@ async def screen_stocks_get(
         # 종목 파싱
         ticker_list = None
         if tickers:
-            ticker_list = [ticker.strip() for ticker in tickers.split(",") if ticker.strip()]
+            ticker_list = parse_ticker_csv(tickers)
+            if ticker_list is None:
+                raise HTTPException(status_code=400, detail="종목 코드는 쉼표로 구분된 6자리 코드여야 합니다")
 
         # POST 엔드포인트 로직 재사용
         return await screen_stocks(
@@ -140,14 +152,17 @@ async def multi_strategy_screen(
                 "error": "스크리닝할 주식 데이터를 찾을 수 없습니다"
             }
 
-        # 다중 전략 분석 실행
-        result = strategy_manager.get_multi_strategy_analysis(
-            stock_data_list=stock_data_list,
-            strategy_names=strategy_names,
-            limit_per_strategy=limit_per_strategy
-        )
+        # 전략별 스크리닝을 스레드 풀에서 동시에 실행 (이벤트 루프는 다른 요청 처리)
+        loop = asyncio.get_running_loop()
+        strategy_results = await asyncio.gather(*(
+            loop.run_in_executor(
+                _strategy_pool, strategy_manager.screen_stocks,
+                strategy_name, stock_data_list, None, limit_per_strategy
+            )
+            for strategy_name in strategy_names
+        ))
 
-        return result
+        return strategy_manager.merge_strategy_results(dict(zip(strategy_names, strategy_results)))
 
     except HTTPException:
         raise
@@ -239,112 +254,76 @@ async def test_strategy(
         raise HTTPException(status_code=500, detail="내부 서버 오류")
 
 
+# 고정된 사용 예시 (import 시 한 번만 JSON 직렬화해 매 요청 같은 바이트 반환)
+_USAGE_EXAMPLES = {
+    "single_strategy_example": {
+        "url": "/screener/screen",
+        "method": "POST",
+        "body": {
+            "strategy_name": "dictmacdgoldencrossstrategy",
+            "ticker_list": ["005930", "000660", "035420"],
+            "limit": 10
+        }
+    },
+    "multi_strategy_example": {
+        "url": "/screener/multi-strategy",
+        "method": "POST",
+        "body": {
+            "strategy_names": [
+                "dictmacdgoldencrossstrategy",
+                "dictrsioversoldstrategy"
+            ],
+            "limit_per_strategy": 5
+        }
+    },
+    "strategy_test_example": {
+        "url": "/screener/strategy/dictmacdgoldencrossstrategy/test",
+        "method": "POST",
+        "body": {
+            "ticker": "005930",
+            "date": "2024-12-20",
+            "ohlcv": {
+                "open": 52700,
+                "high": 53100,
+                "low": 51900,
+                "close": 53000,
+                "volume": 24674774
+            },
+            "technical_indicators": {
+                "sma_20": 52500,
+                "sma_60": 51000,
+                "macd": 200,
+                "macd_signal": 150,
+                "macd_histogram": 120,
+                "rsi_14": 58
+            }
+        }
+    },
+    "available_strategies": [
+        "dictmacdgoldencrossstrategy",
+        "dictrsioversoldstrategy",
+        "dictbollingersqueezestrategy",
+        "dictmovingaveragecrossoverstrategy"
+    ]
+}
+
+
+_USAGE_EXAMPLES_JSON = orjson.dumps(_USAGE_EXAMPLES)
+
+
 @router.get("/examples")
 async def get_usage_examples():
     """스크리너 API 사용 예시 제공"""
-    return {
-        "single_strategy_example": {
-            "url": "/screener/screen",
-            "method": "POST",
-            "body": {
-                "strategy_name": "dictmacdgoldencrossstrategy",
-                "ticker_list": ["005930", "000660", "035420"],
-                "limit": 10
-            }
-        },
-        "multi_strategy_example": {
-            "url": "/screener/multi-strategy",
-            "method": "POST",
-            "body": {
-                "strategy_names": [
-                    "dictmacdgoldencrossstrategy",
-                    "dictrsioversoldstrategy"
-                ],
-                "limit_per_strategy": 5
-            }
-        },
-        "strategy_test_example": {
-            "url": "/screener/strategy/dictmacdgoldencrossstrategy/test",
-            "method": "POST",
-            "body": {
-                "ticker": "005930",
-                "date": "2024-12-20",
-                "ohlcv": {
-                    "open": 52700,
-                    "high": 53100,
-                    "low": 51900,
-                    "close": 53000,
-                    "volume": 24674774
-                },
-                "technical_indicators": {
-                    "sma_20": 52500,
-                    "sma_60": 51000,
-                    "macd": 200,
-                    "macd_signal": 150,
-                    "macd_histogram": 120,
-                    "rsi_14": 58
-                }
-            }
-        },
-        "available_strategies": [
-            "dictmacdgoldencrossstrategy",
-            "dictrsioversoldstrategy",
-            "dictbollingersqueezestrategy",
-            "dictmovingaveragecrossoverstrategy"
-        ]
-    }
+    return Response(content=_USAGE_EXAMPLES_JSON, media_type="application/json")
 
 
 async def _get_stock_data_list(ticker_list: Optional[List[str]] = None, limit: int = 100) -> List[Dict[str, Any]]:
     """MongoDB에서 주식 데이터 수집 (내부 함수)"""
     try:
-        from models.dict_models import get_mongodb_client
-
-        client = get_mongodb_client()
-        db = client.stock_analyzed
-
-        stock_data_list = []
-
-        if ticker_list:
-            # 지정된 종목들만 조회
-            for ticker in ticker_list:
-                try:
-                    collection = db[ticker]
-                    # 최신 데이터 1개 조회
-                    doc = collection.find_one(sort=[("date", -1)])
-                    if doc:
-                        # MongoDB ObjectId 제거
-                        if "_id" in doc:
-                            del doc["_id"]
-                        stock_data_list.append(doc)
-                except Exception as e:
-                    logger.warning(f"종목 {ticker} 데이터 조회 실패: {e}")
-                    continue
-        else:
-            # 시가총액 상위 종목들 조회
-            system_db = client.system_info
-            target_tickers = system_db.target_tickers
-
-            # 활성 종목 조회 (시가총액 순)
-            active_tickers = target_tickers.find(
-                {"is_active": True}
-            ).sort("market_cap", -1).limit(limit)
-
-            for ticker_doc in active_tickers:
-                ticker = ticker_doc["ticker"]
-                try:
-                    collection = db[ticker]
-                    doc = collection.find_one(sort=[("date", -1)])
-                    if doc:
-                        if "_id" in doc:
-                            del doc["_id"]
-                        stock_data_list.append(doc)
-                except Exception as e:
-                    logger.warning(f"종목 {ticker} 데이터 조회 실패: {e}")
-                    continue
-
-        return stock_data_list
+        from models.dict_models import fetch_latest_stock_data
+
+        return await fetch_latest_stock_data(ticker_list, limit)
 
     except Exception as e:
         logger.error(f"주식 데이터 수집 실패: {e}")
-        return []
\ No newline at end of file
+        return []
@@ -5,7 +5,7 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional, Dict, Any
 import time
 import logging
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 
 from database import db_manager
 from repositories import TargetTickerRepository
@@ -52,47 +52,54 @@ async def get_strategy_info(strategy_name: str):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.post("/", response_model=ScreenerResponse)
-async def screen_stocks(request: ScreenerRequest):
-    """Screen stocks using the specified strategy."""
+async def _screen_stocks_impl(strategy_name: str,
+                             parameters: Optional[Dict[str, Any]],
+                             limit: int) -> ScreenerResponse:
+    """Screen stocks with already-validated arguments (shared by POST and GET)."""
     start_time = time.time()
     
-    try:
-        # Validate strategy exists
-        strategy = strategy_manager.get_strategy(request.strategy_name)
-        if not strategy:
-            raise HTTPException(status_code=404, detail=f"Strategy '{request.strategy_name}' not found")
-        
-        # Get analyzed stock data
-        analyzed_data = await _get_analyzed_stock_data(request.limit * 2)  # Get extra data for filtering
-        
-        if not analyzed_data:
-            return ScreenerResponse(
-                strategy_name=request.strategy_name,
-                matched_tickers=[],
-                total_matches=0,
-                execution_time_ms=0.0
-            )
-        
-        # Screen stocks using strategy
-        screening_results = strategy_manager.screen_stocks(
-            request.strategy_name,
-            analyzed_data,
-            request.parameters
-        )
-        
-        # Limit results
-        limited_results = screening_results[:request.limit]
-        matched_tickers = [result["ticker"] for result in limited_results]
-        
-        execution_time = (time.time() - start_time) * 1000  # Convert to milliseconds
-        
+    # Validate strategy exists
+    strategy = strategy_manager.get_strategy(strategy_name)
+    if not strategy:
+        raise HTTPException(status_code=404, detail=f"Strategy '{strategy_name}' not found")
+    
+    # Get analyzed stock data
+    analyzed_data = await _get_analyzed_stock_data(limit * 2)  # Get extra data for filtering
+    
+    if not analyzed_data:
         return ScreenerResponse(
-            strategy_name=request.strategy_name,
-            matched_tickers=matched_tickers,
-            total_matches=len(screening_results),
-            execution_time_ms=execution_time
+            strategy_name=strategy_name,
+            matched_tickers=[],
+            total_matches=0,
+            execution_time_ms=0.0
         )
+    
+    # Screen stocks using strategy
+    screening_results = strategy_manager.screen_stocks(
+        strategy_name,
+        analyzed_data,
+        parameters
+    )
+    
+    # Limit results
+    limited_results = screening_results[:limit]
+    matched_tickers = [result["ticker"] for result in limited_results]
+    
+    execution_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+    
+    return ScreenerResponse(
+        strategy_name=strategy_name,
+        matched_tickers=matched_tickers,
+        total_matches=len(screening_results),
+        execution_time_ms=execution_time
+    )
+
+
+@router.post("/", response_model=ScreenerResponse)
+async def screen_stocks(request: ScreenerRequest):
+    """Screen stocks using the specified strategy."""
+    try:
+        return await _screen_stocks_impl(request.strategy_name, request.parameters, request.limit)
         
     except HTTPException:
         raise
@@ -110,22 +117,19 @@ async def screen_stocks_get(
 ):
     """Screen stocks using GET method with query parameters."""
     try:
-        # Convert query parameters to ScreenerRequest
         # Filter out FastAPI internal parameters
         strategy_params = {
             k: v for k, v in parameters.items() 
             if k not in ["strategy_name", "limit", "min_signal_strength"]
         }
         
-        request = ScreenerRequest(
-            strategy_name=strategy_name,
-            parameters=strategy_params if strategy_params else None,
-            limit=limit
+        # Query parameters are already validated, so skip building a ScreenerRequest
+        response = await _screen_stocks_impl(
+            strategy_name,
+            strategy_params if strategy_params else None,
+            limit
         )
         
-        # Use the POST endpoint logic
-        response = await screen_stocks(request)
-        
         # Add additional filtering by signal strength
         if min_signal_strength > 0.0:
             analyzed_data = await _get_analyzed_stock_data_by_tickers(response.matched_tickers)
@@ -241,7 +245,7 @@ async def _get_analyzed_stock_data(limit: int = 200) -> List[AnalyzedStockData]:
                 if isinstance(doc["date"], str):
                     doc["date"] = date.fromisoformat(doc["date"])
                 if isinstance(doc["analysis_timestamp"], str):
-                    doc["analysis_timestamp"] = date.fromisoformat(doc["analysis_timestamp"])
+                    doc["analysis_timestamp"] = datetime.fromisoformat(doc["analysis_timestamp"])
                 
                 # Convert to AnalyzedStockData
                 analyzed_stock_data = AnalyzedStockData(**doc)
@@ -280,7 +284,7 @@ async def _get_analyzed_stock_data_by_tickers(tickers: List[str]) -> List[Analyz
             if isinstance(doc["date"], str):
                 doc["date"] = date.fromisoformat(doc["date"])
             if isinstance(doc["analysis_timestamp"], str):
-                doc["analysis_timestamp"] = date.fromisoformat(doc["analysis_timestamp"])
+                doc["analysis_timestamp"] = datetime.fromisoformat(doc["analysis_timestamp"])
             
             # Convert to AnalyzedStockData
             analyzed_stock_data = AnalyzedStockData(**doc)
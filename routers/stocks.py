@@ -6,7 +6,7 @@ from typing import List, Optional
 from datetime import date, datetime
 import logging
 
-from database import db_manager
+from database import db_manager, get_stock_data_collection
 from repositories import TargetTickerRepository
 from schemas import (
     StockListResponse, StockDetailResponse, TargetTicker, AnalyzedStockData
@@ -129,7 +129,7 @@ async def get_stock_raw_data(
             raise HTTPException(status_code=404, detail=f"Ticker {ticker} not found")
         
         # Get raw stock data
-        stock_collection = db_manager.get_collection("stock_data", ticker)
+        stock_collection = get_stock_data_collection(ticker)
         
         # Build query
         query = {"ticker": ticker}
@@ -178,7 +178,7 @@ async def get_stock_statistics(
             raise HTTPException(status_code=404, detail=f"Ticker {ticker} not found")
         
         # Get basic statistics
-        stock_collection = db_manager.get_collection("stock_data", ticker)
+        stock_collection = get_stock_data_collection(ticker)
         analyzed_collection = db_manager.get_collection("stock_analyzed", ticker)
         
         # Raw data statistics
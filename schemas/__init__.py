@@ -8,6 +8,9 @@ from .models import (
     OHLCVData,
     TechnicalIndicators,
     AnalyzedStockData,
+    OHLCVDict,
+    TechnicalIndicatorsDict,
+    AnalyzedStockDict,
     StockListResponse,
     StockDetailResponse,
     ScreenerRequest,
@@ -23,6 +26,9 @@ __all__ = [
     "OHLCVData",
     "TechnicalIndicators",
     "AnalyzedStockData",
+    "OHLCVDict",
+    "TechnicalIndicatorsDict",
+    "AnalyzedStockDict",
     "StockListResponse",
     "StockDetailResponse",
     "ScreenerRequest",
@@ -1,12 +1,16 @@
 """
 Pydantic v2 호환 모델 정의
 """
+import re
 from datetime import datetime, date
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from typing import Optional, List, Dict, Any, TypedDict
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
 from enum import Enum
 
 
+_TICKER_RE = re.compile(r'^\d{6}$')
+
+
 class JobStatus(str, Enum):
     """Job execution status enumeration."""
     RUNNING = "running"
@@ -26,7 +30,7 @@ class TargetTicker(BaseModel):
     @field_validator('ticker')
     @classmethod
     def validate_ticker(cls, v):
-        if not v.isdigit():
+        if not _TICKER_RE.match(v):
             raise ValueError('Ticker must be numeric')
         return v
 
@@ -80,14 +84,13 @@ class OHLCVData(BaseModel):
     close: float = Field(..., description="Closing price")
     volume: int = Field(..., description="Trading volume", ge=0)
     ticker: str = Field(..., description="Stock ticker code")
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Record creation time in UTC")
+    created_at: Optional[datetime] = Field(None, description="Record creation time in UTC (stamped once per batch)")
 
-    @field_validator('open_price', 'high', 'low', 'close')
-    @classmethod
-    def validate_prices(cls, v):
-        if v <= 0:
+    @model_validator(mode='after')
+    def validate_prices(self):
+        if min(self.open_price, self.high, self.low, self.close) <= 0:
             raise ValueError('Prices must be positive')
-        return v
+        return self
 
     model_config = ConfigDict(
         populate_by_name=True,
@@ -155,6 +158,48 @@ class AnalyzedStockData(BaseModel):
     )
 
 
+# Internal pipeline documents: the stock_analyzed layout as plain dicts, for
+# code that builds rows in bulk without per-row validation. AnalyzedStockData
+# stays the model at the API boundary.
+class OHLCVDict(TypedDict):
+    """Stored OHLCV row inside an analyzed document."""
+    date: str  # ISO date
+    open_price: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    ticker: str
+    created_at: Optional[datetime]
+
+
+class TechnicalIndicatorsDict(TypedDict):
+    """Technical indicator values; None while an indicator is warming up."""
+    sma_5: Optional[float]
+    sma_20: Optional[float]
+    sma_60: Optional[float]
+    ema_12: Optional[float]
+    ema_26: Optional[float]
+    macd: Optional[float]
+    macd_signal: Optional[float]
+    macd_histogram: Optional[float]
+    rsi_14: Optional[float]
+    bollinger_upper: Optional[float]
+    bollinger_middle: Optional[float]
+    bollinger_lower: Optional[float]
+    stoch_k: Optional[float]
+    stoch_d: Optional[float]
+
+
+class AnalyzedStockDict(TypedDict):
+    """One stock_analyzed document as written by the hourly analysis."""
+    date: str  # ISO date
+    ticker: str
+    ohlcv: OHLCVDict
+    technical_indicators: TechnicalIndicatorsDict
+    analysis_timestamp: datetime
+
+
 # API Response Models
 class StockListResponse(BaseModel):
     """Response model for stock list API."""
@@ -11,15 +11,20 @@ from langchain.schema import HumanMessage, SystemMessage
 from schemas import AnalyzedStockData
 from prompts import prompt_manager
 from config import settings
+from utils.ttl_cache import TTLCache, cache_key
 
 logger = logging.getLogger(__name__)
 
+# Analyses depend on current prices, so identical requests are reused for 5 minutes
+ANALYSIS_CACHE_TTL = 300
+
 
 class AIAnalysisService:
     """Service for AI-powered stock analysis using Google Gemini."""
     
     def __init__(self):
         self.model = None
+        self._analysis_cache = TTLCache(ttl=ANALYSIS_CACHE_TTL)
         self._initialize_model()
     
     def _initialize_model(self):
@@ -63,6 +68,12 @@ class AIAnalysisService:
             if not self.is_available():
                 raise ValueError("AI service is not available. Check API key configuration.")
             
+            # Identical requests within the TTL reuse the earlier model response
+            key = cache_key(sorted(tickers), prompt_type, custom_prompt, context)
+            cached = self._analysis_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+            
             # Get stock data
             stocks_data = await self._get_stocks_data(tickers)
             if not stocks_data:
@@ -93,7 +104,7 @@ class AIAnalysisService:
             
             execution_time = time.time() - start_time
             
-            return {
+            result = {
                 "analysis_result": analysis_result,
                 "analyzed_tickers": [data.ticker for data in stocks_data],
                 "prompt_type": prompt_type,
@@ -101,6 +112,9 @@ class AIAnalysisService:
                 "model_used": "gemini-pro",
                 "context": context or {}
             }
+            # Callers add their own keys to the result, so cache a copy
+            self._analysis_cache.set(key, dict(result))
+            return result
             
         except Exception as e:
             logger.error(f"AI analysis failed: {e}")
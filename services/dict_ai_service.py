@@ -2,9 +2,11 @@
 딕셔너리 기반 AI 분석 서비스 (Google Gemini)
 한국 주식 시장 특화 분석을 위한 AI 서비스
 """
+import asyncio
+import json
 import os
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 import time
 from datetime import datetime
 
@@ -12,17 +14,65 @@ import google.generativeai as genai
 from dotenv import load_dotenv
 
 from strategies.dict_base_strategy import DictStrategyManager
-from models.dict_models import get_mongodb_client
+from models.dict_models import fetch_latest_stock_data
 from prompts.technical_analysis_prompt import create_technical_analysis_prompt
 from prompts.market_overview_prompt import create_market_overview_prompt
 from prompts.trading_opportunity_prompt import create_trading_opportunity_prompt
 from prompts.risk_assessment_prompt import create_risk_assessment_prompt
+from utils.ttl_cache import TTLCache, cache_key
 
 # 환경변수 로딩
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# 같은 요청의 AI 응답 재사용 시간(초): 전략 분석은 현재가에 좌우되므로 짧게, 포트폴리오 분석은 길게
+STRATEGY_ANALYSIS_CACHE_TTL = 300
+PORTFOLIO_ANALYSIS_CACHE_TTL = 3600
+
+# 배치 생성: 이 시간(초) 안에 들어온 프롬프트를 최대 BATCH_MAX_SIZE 개까지 한 번의 요청으로 묶음
+BATCH_WINDOW = 0.05
+BATCH_MAX_SIZE = 8
+
+
+def _frame_batch_prompt(prompts: List[str]) -> str:
+    """여러 프롬프트를 JSON 배열 응답을 요구하는 하나의 프롬프트로 묶음"""
+    sections = "".join(f"\n\n### 요청 {i}\n{prompt.strip()}" for i, prompt in enumerate(prompts))
+    return (
+        f"아래 {len(prompts)}개의 독립적인 분석 요청에 각각 답해주세요.\n"
+        "다른 설명 없이 JSON 배열 하나로만 응답하고, 각 원소는 "
+        '{"index": 요청 번호, "analysis": "분석 내용"} 형식으로 작성해주세요.'
+        f"{sections}"
+    )
+
+
+def _parse_batch_response(text: str, expected: int) -> Optional[List[str]]:
+    """배치 응답에서 요청 순서대로 분석 텍스트를 꺼냄 (형식이 맞지 않으면 None)"""
+    body = text.strip()
+    if body.startswith("```"):
+        # ```json ... ``` 코드 블록으로 감싼 응답 처리
+        body = body.split("\n", 1)[-1].rstrip("`").strip()
+
+    try:
+        items = json.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(items, list):
+        return None
+
+    pairs = [
+        (item["index"], item["analysis"])
+        for item in items
+        if isinstance(item, dict)
+        and isinstance(item.get("index"), int)
+        and isinstance(item.get("analysis"), str)
+    ]
+    by_index = dict(pairs)
+    # 번호가 빠지거나 중복되면 어느 응답이 어느 요청의 것인지 확신할 수 없음
+    if len(pairs) != expected or set(by_index) != set(range(expected)):
+        return None
+    return [by_index[i] for i in range(expected)]
+
 
 class DictAIAnalysisService:
     """딕셔너리 기반 AI 주식 분석 서비스"""
@@ -30,6 +80,11 @@ class DictAIAnalysisService:
     def __init__(self):
         self.model = None
         self.strategy_manager = DictStrategyManager()
+        self._strategy_cache = TTLCache(ttl=STRATEGY_ANALYSIS_CACHE_TTL)
+        self._portfolio_cache = TTLCache(ttl=PORTFOLIO_ANALYSIS_CACHE_TTL)
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_worker: Optional[asyncio.Task] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
         self._initialize_model()
 
     def _initialize_model(self):
@@ -52,6 +107,75 @@ class DictAIAnalysisService:
         """AI 서비스 사용 가능 여부 확인"""
         return self.model is not None
 
+    async def generate_batched(self, prompt: str) -> str:
+        """
+        프롬프트 하나에 대한 AI 응답 생성 (배치 경유)
+
+        BATCH_WINDOW 안에 들어온 다른 호출과 묶어 한 번의 Gemini 요청으로 보낸다.
+        """
+        if self._batch_worker is None or self._batch_worker.done():
+            self._batch_queue = asyncio.Queue()
+            self._batch_worker = asyncio.create_task(self._run_batch_worker(self._batch_queue))
+
+        future = asyncio.get_running_loop().create_future()
+        await self._batch_queue.put((prompt, future))
+        return await future
+
+    def close_batch_worker(self) -> None:
+        """배치 수집 태스크와 진행 중인 배치 생성 태스크 취소 (앱 종료 시 호출)"""
+        if self._batch_worker is not None:
+            self._batch_worker.cancel()
+            self._batch_worker = None
+        for task in list(self._batch_tasks):
+            task.cancel()
+
+    async def _run_batch_worker(self, queue: asyncio.Queue) -> None:
+        """큐에서 프롬프트를 모아 배치 단위로 생성 태스크를 띄움"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + BATCH_WINDOW
+            while len(batch) < BATCH_MAX_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # 생성은 별도 태스크로 실행해 다음 배치 수집을 막지 않음
+            task = asyncio.create_task(self._generate_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _generate_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """묶인 프롬프트들을 생성하고 각 호출자의 future 에 결과 전달"""
+        prompts = [prompt for prompt, _ in batch]
+        try:
+            if len(prompts) == 1:
+                response = await self.model.generate_content_async(prompts[0])
+                texts = [response.text]
+            else:
+                response = await self.model.generate_content_async(_frame_batch_prompt(prompts))
+                texts = _parse_batch_response(response.text, len(prompts))
+                if texts is None:
+                    logger.warning(f"배치 응답 형식 오류, {len(prompts)}개 요청을 개별 생성으로 재시도")
+                    # 배치는 동시 요청 한도(ai_limiter)의 슬롯 하나로 계산되므로 한 번에 하나씩 생성
+                    texts = []
+                    for prompt in prompts:
+                        texts.append((await self.model.generate_content_async(prompt)).text)
+        except Exception as e:
+            logger.error(f"배치 AI 분석 생성 실패: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), text in zip(batch, texts):
+            if not future.done():
+                future.set_result(text)
+
     async def analyze_with_strategy(self,
                                   strategy_name: str,
                                   ticker_list: Optional[List[str]] = None,
@@ -76,6 +200,12 @@ class DictAIAnalysisService:
                     "suggestion": "GOOGLE_API_KEY를 .env 파일에 설정해주세요."
                 }
 
+            # 같은 요청은 TTL 동안 이전 AI 응답 재사용
+            key = cache_key(strategy_name, sorted(ticker_list) if ticker_list else None, limit, analysis_type)
+            cached = self._strategy_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+
             # 주식 데이터 수집
             stock_data_list = await self._get_stock_data_list(ticker_list, limit)
             if not stock_data_list:
@@ -85,8 +215,9 @@ class DictAIAnalysisService:
                     "ticker_list": ticker_list
                 }
 
-            # 전략 스크리닝 실행
-            strategy_result = self.strategy_manager.screen_stocks(
+            # 전략 스크리닝 실행 (CPU 작업이므로 이벤트 루프 밖에서 실행)
+            strategy_result = await asyncio.to_thread(
+                self.strategy_manager.screen_stocks,
                 strategy_name=strategy_name,
                 stock_data_list=stock_data_list,
                 limit=limit
@@ -109,13 +240,13 @@ class DictAIAnalysisService:
                 }
 
             # AI 분석 실행
-            ai_analysis = await self._generate_strategy_analysis(
+            ai_analysis, generated = await self._generate_strategy_analysis(
                 strategy_result, analysis_type
             )
 
             execution_time = time.time() - start_time
 
-            return {
+            result = {
                 "success": True,
                 "strategy_name": strategy_name,
                 "strategy_result": strategy_result,
@@ -124,6 +255,10 @@ class DictAIAnalysisService:
                 "execution_time": execution_time,
                 "timestamp": datetime.now().isoformat()
             }
+            # 모델 호출이 실패한 응답은 캐시하지 않음
+            if generated:
+                self._strategy_cache.set(key, dict(result))
+            return result
 
         except Exception as e:
             logger.error(f"AI 전략 분석 실패: {e}")
@@ -150,20 +285,26 @@ class DictAIAnalysisService:
             if not self.is_available():
                 return self._get_unavailable_response()
 
+            key = cache_key(sorted(ticker_list), analysis_focus)
+            cached = self._portfolio_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+
             # 모든 전략으로 다중 분석
             strategy_names = list(self.strategy_manager.strategies.keys())
-            multi_result = self.strategy_manager.get_multi_strategy_analysis(
+            multi_result = await asyncio.to_thread(
+                self.strategy_manager.get_multi_strategy_analysis,
                 stock_data_list=await self._get_stock_data_list(ticker_list),
                 strategy_names=strategy_names,
                 limit_per_strategy=20
             )
 
             # 포트폴리오 AI 분석 생성
-            ai_analysis = await self._generate_portfolio_analysis(
+            ai_analysis, generated = await self._generate_portfolio_analysis(
                 multi_result, ticker_list, analysis_focus
             )
 
-            return {
+            result = {
                 "success": True,
                 "portfolio_tickers": ticker_list,
                 "multi_strategy_result": multi_result,
@@ -172,6 +313,9 @@ class DictAIAnalysisService:
                 "execution_time": time.time() - start_time,
                 "timestamp": datetime.now().isoformat()
             }
+            if generated:
+                self._portfolio_cache.set(key, dict(result))
+            return result
 
         except Exception as e:
             logger.error(f"포트폴리오 분석 실패: {e}")
@@ -186,42 +330,7 @@ class DictAIAnalysisService:
                                  limit: int = 100) -> List[Dict[str, Any]]:
         """MongoDB에서 주식 데이터 수집"""
         try:
-            client = get_mongodb_client()
-            db = client.stock_analyzed
-
-            stock_data_list = []
-
-            if ticker_list:
-                # 지정된 종목들만 조회
-                for ticker in ticker_list:
-                    collection = db[ticker]
-                    # 최신 데이터 1개 조회
-                    doc = collection.find_one(sort=[("date", -1)])
-                    if doc:
-                        # MongoDB ObjectId 제거
-                        if "_id" in doc:
-                            del doc["_id"]
-                        stock_data_list.append(doc)
-            else:
-                # 시가총액 상위 종목들 조회
-                system_db = client.system_info
-                target_tickers = system_db.target_tickers
-
-                # 활성 종목 조회 (시가총액 순)
-                active_tickers = target_tickers.find(
-                    {"is_active": True}
-                ).sort("market_cap", -1).limit(limit)
-
-                for ticker_doc in active_tickers:
-                    ticker = ticker_doc["ticker"]
-                    collection = db[ticker]
-                    doc = collection.find_one(sort=[("date", -1)])
-                    if doc:
-                        if "_id" in doc:
-                            del doc["_id"]
-                        stock_data_list.append(doc)
-
-            return stock_data_list
+            return await fetch_latest_stock_data(ticker_list, limit)
 
         except Exception as e:
             logger.error(f"주식 데이터 수집 실패: {e}")
@@ -229,33 +338,33 @@ class DictAIAnalysisService:
 
     async def _generate_strategy_analysis(self,
                                         strategy_result: Dict[str, Any],
-                                        analysis_type: str) -> str:
-        """전략 결과 기반 AI 분석 생성"""
+                                        analysis_type: str) -> Tuple[str, bool]:
+        """전략 결과 기반 AI 분석 생성 (분석 텍스트, 생성 성공 여부)"""
         try:
             # 프롬프트 생성
             prompt = self._create_strategy_prompt(strategy_result, analysis_type)
 
             # AI 분석 생성
-            response = self.model.generate_content(prompt)
-            return response.text
+            response = await self.model.generate_content_async(prompt)
+            return response.text, True
 
         except Exception as e:
             logger.error(f"AI 분석 생성 실패: {e}")
-            return f"AI 분석 생성 중 오류가 발생했습니다: {str(e)}"
+            return f"AI 분석 생성 중 오류가 발생했습니다: {str(e)}", False
 
     async def _generate_portfolio_analysis(self,
                                          multi_result: Dict[str, Any],
                                          ticker_list: List[str],
-                                         analysis_focus: str) -> str:
-        """포트폴리오 종합 분석 생성"""
+                                         analysis_focus: str) -> Tuple[str, bool]:
+        """포트폴리오 종합 분석 생성 (분석 텍스트, 생성 성공 여부)"""
         try:
             prompt = self._create_portfolio_prompt(multi_result, ticker_list, analysis_focus)
-            response = self.model.generate_content(prompt)
-            return response.text
+            response = await self.model.generate_content_async(prompt)
+            return response.text, True
 
         except Exception as e:
             logger.error(f"포트폴리오 분석 생성 실패: {e}")
-            return f"포트폴리오 분석 생성 중 오류가 발생했습니다: {str(e)}"
+            return f"포트폴리오 분석 생성 중 오류가 발생했습니다: {str(e)}", False
 
     def _create_strategy_prompt(self,
                               strategy_result: Dict[str, Any],
@@ -3,7 +3,7 @@
 Pydantic 우회를 위한 새로운 전략 시스템
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import logging
 
@@ -164,11 +164,15 @@ class DictStrategyManager:
 
     def __init__(self):
         self.strategies: Dict[str, DictBaseStrategy] = {}
+        # 등록/매개변수 변경 시 증가하는 버전과 그 버전의 목록 캐시
+        self._version = 0
+        self._listing: Optional[Tuple[int, List[Dict[str, Any]]]] = None
         self._register_default_strategies()
 
     def register_strategy(self, strategy: DictBaseStrategy) -> None:
         """새로운 전략 등록"""
         self.strategies[strategy.name.lower()] = strategy
+        self._version += 1
         logger.info(f"전략 등록됨: {strategy.name}")
 
     def get_strategy(self, strategy_name: str) -> Optional[DictBaseStrategy]:
@@ -176,16 +180,18 @@ class DictStrategyManager:
         return self.strategies.get(strategy_name.lower())
 
     def list_strategies(self) -> List[Dict[str, Any]]:
-        """사용 가능한 모든 전략 목록 반환"""
-        return [
-            {
-                "name": name,
-                "description": strategy.get_description(),
-                "parameters": strategy.get_parameters(),
-                "korean_optimized": strategy.korean_market_optimized
-            }
-            for name, strategy in self.strategies.items()
-        ]
+        """사용 가능한 모든 전략 목록 반환 (레지스트리가 바뀌기 전까지 같은 목록 재사용)"""
+        if self._listing is None or self._listing[0] != self._version:
+            self._listing = (self._version, [
+                {
+                    "name": name,
+                    "description": strategy.get_description(),
+                    "parameters": strategy.get_parameters(),
+                    "korean_optimized": strategy.korean_market_optimized
+                }
+                for name, strategy in self.strategies.items()
+            ])
+        return self._listing[1]
 
     def screen_stocks(self, strategy_name: str,
                      stock_data_list: List[Dict[str, Any]],
@@ -203,6 +209,7 @@ class DictStrategyManager:
         # 매개변수 설정
         if parameters:
             strategy.set_parameters(parameters)
+            self._version += 1
 
         results = []
         errors = []
@@ -255,13 +262,17 @@ class DictStrategyManager:
             )
             results[strategy_name] = strategy_result
 
-        # 전체 요약
+        return self.merge_strategy_results(results)
+
+    @staticmethod
+    def merge_strategy_results(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """전략별 screen_stocks 결과를 다중 전략 응답으로 합침"""
         total_matches = sum(r.get('matches_found', 0) for r in results.values())
         successful_strategies = sum(1 for r in results.values() if r.get('success', False))
 
         return {
             "success": True,
-            "strategies_analyzed": len(strategy_names),
+            "strategies_analyzed": len(results),
             "successful_strategies": successful_strategies,
             "total_matches_found": total_matches,
             "results_by_strategy": results
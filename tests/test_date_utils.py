@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+영업일 유틸리티 테스트 (네트워크/DB 없이 고정 휴장일로 검증)
+"""
+
+import sys
+import os
+from datetime import date, timedelta
+
+# 프로젝트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GOOGLE_API_KEY", "test_key")
+
+from utils import date_utils
+
+# 테스트용 고정 휴장일 (pykrx 호출 없이 캐시에 미리 적재)
+TEST_HOLIDAYS = {
+    2023: [date(2023, 1, 23), date(2023, 1, 24), date(2023, 5, 5), date(2023, 12, 29)],
+    2024: [date(2024, 1, 1), date(2024, 2, 9), date(2024, 2, 12), date(2024, 10, 3), date(2024, 12, 31)],
+    2025: [date(2025, 1, 1), date(2025, 1, 28), date(2025, 1, 29), date(2025, 1, 30)],
+}
+
+
+def _seed_holidays():
+    """고정 휴장일로 캐시 초기화"""
+    for year, holidays in TEST_HOLIDAYS.items():
+        date_utils._store_holidays(year, holidays)
+
+
+def _reference_business_days(start_date, end_date):
+    """하루씩 순회하는 기준 구현"""
+    result = []
+    current = start_date
+    while current <= end_date:
+        if current.weekday() < 5 and current not in TEST_HOLIDAYS[current.year]:
+            result.append(current)
+        current += timedelta(days=1)
+    return result
+
+
+def test_is_business_day():
+    """주말/휴장일 판별 테스트"""
+    print("=== is_business_day 테스트 ===")
+    _seed_holidays()
+
+    assert date_utils.is_business_day(date(2024, 1, 2))
+    assert not date_utils.is_business_day(date(2024, 1, 1))   # 신정
+    assert not date_utils.is_business_day(date(2024, 1, 6))   # 토요일
+    assert not date_utils.is_business_day(date(2024, 1, 7))   # 일요일
+    assert date_utils.get_market_holidays(2024) == sorted(TEST_HOLIDAYS[2024])
+    print("✅ is_business_day 정상")
+
+
+def test_business_days_between():
+    """기간 내 영업일 목록이 기준 구현과 일치하는지 테스트"""
+    print("\n=== get_business_days_between 테스트 ===")
+    _seed_holidays()
+
+    start, end = date(2023, 12, 1), date(2025, 1, 31)
+    expected = _reference_business_days(start, end)
+    result = date_utils.get_business_days_between(start, end)
+    assert result == expected
+    assert all(type(d) is date for d in result)
+
+    # 시작/종료일 포함 여부
+    assert date_utils.get_business_days_between(
+        date(2024, 1, 2), date(2024, 1, 5), include_start=False, include_end=False
+    ) == [date(2024, 1, 3), date(2024, 1, 4)]
+    assert date_utils.get_business_days_between(date(2024, 1, 5), date(2024, 1, 2)) == []
+    assert date_utils.get_business_days_between(
+        date(2024, 1, 2), date(2024, 1, 2), include_start=False
+    ) == []
+    print(f"✅ {len(result)}개 영업일 일치")
+
+
+def test_previous_next_business_day():
+    """연휴 및 연도 경계에서 전/다음 영업일 테스트"""
+    print("\n=== get_previous/next_business_day 테스트 ===")
+    _seed_holidays()
+
+    # 설 연휴 (2025-01-28 ~ 01-30) 전후
+    assert date_utils.get_next_business_day(date(2025, 1, 24)) == date(2025, 1, 27)
+    assert date_utils.get_next_business_day(date(2025, 1, 27)) == date(2025, 1, 31)
+    assert date_utils.get_previous_business_day(date(2025, 1, 31)) == date(2025, 1, 27)
+
+    # 연도 경계
+    assert date_utils.get_next_business_day(date(2024, 12, 30)) == date(2025, 1, 2)
+    assert date_utils.get_previous_business_day(date(2024, 1, 2)) == date(2023, 12, 28)
+
+    # 휴장일/주말 당일 기준
+    assert date_utils.get_next_business_day(date(2024, 1, 6)) == date(2024, 1, 8)
+    assert date_utils.get_previous_business_day(date(2024, 1, 7)) == date(2024, 1, 5)
+    assert type(date_utils.get_next_business_day(date(2024, 1, 6))) is date
+    print("✅ 전/다음 영업일 정상")
+
+
+def test_business_days_ago():
+    """N 영업일 전 날짜가 기준 구현과 일치하는지 테스트"""
+    print("\n=== calculate_business_days_ago 테스트 ===")
+    _seed_holidays()
+
+    reference = date(2025, 1, 31)
+    business_days = _reference_business_days(date(2024, 1, 1), reference - timedelta(days=1))
+    for days_ago in (1, 2, 5, 20, 60, 250):
+        assert date_utils.calculate_business_days_ago(days_ago, reference) == business_days[-days_ago]
+
+    # 기준일이 휴장일이어도 이전 영업일부터 센다
+    assert date_utils.calculate_business_days_ago(1, date(2025, 1, 29)) == date(2025, 1, 27)
+    assert date_utils.calculate_business_days_ago(0, date(2025, 1, 29)) == date(2025, 1, 29)
+    print("✅ N 영업일 전 계산 정상")
+
+
+def test_recent_business_days():
+    """최근 N 영업일 목록 테스트"""
+    print("\n=== get_recent_business_days 테스트 ===")
+    _seed_holidays()
+
+    end = date(2025, 1, 31)
+    business_days = _reference_business_days(date(2024, 1, 1), end)
+    for count in (1, 5, 60, 250):
+        result = date_utils.get_recent_business_days(count, end)
+        assert result == business_days[-count:]
+        assert all(type(d) is date for d in result)
+
+    # 종료일이 휴장일이면 그 이전 영업일까지
+    assert date_utils.get_recent_business_days(2, date(2025, 1, 29)) == [date(2025, 1, 24), date(2025, 1, 27)]
+    assert date_utils.get_recent_business_days(0, end) == []
+    assert date_utils.get_recent_business_days(5, date(2019, 12, 31)) == []
+    print("✅ 최근 영업일 목록 정상")
+
+
+def test_month_and_quarter_windows():
+    """월/분기 단위 영업일 범위 테스트"""
+    print("\n=== 월/분기 영업일 테스트 ===")
+    _seed_holidays()
+
+    # 12개월 이상 구간도 해당 월 1일부터 시작
+    result = date_utils.get_last_n_months_business_days(13, end_date=date(2025, 1, 31))
+    assert result == _reference_business_days(date(2023, 12, 1), date(2025, 1, 31))
+
+    assert date_utils.get_quarter_business_days(2024, 4) == \
+        _reference_business_days(date(2024, 10, 1), date(2024, 12, 31))
+    assert date_utils.get_quarter_business_days(2024, 1)[-1] == date(2024, 3, 29)
+    try:
+        date_utils.get_quarter_business_days(2024, 5)
+        assert False, "잘못된 분기가 허용됨"
+    except ValueError:
+        pass
+    print("✅ 월/분기 영업일 정상")
+
+
+def test_store_holidays_invalidates_derived_caches():
+    """휴장일을 교체하면 캐시된 영업일 판별/전후 영업일이 새 휴장일을 따름"""
+    print("\n=== 휴장일 교체 시 캐시 무효화 테스트 ===")
+    _seed_holidays()
+    assert not date_utils.is_business_day(date(2024, 10, 3))   # 개천절
+    assert date_utils.get_next_business_day(date(2024, 10, 2)) == date(2024, 10, 4)
+
+    try:
+        date_utils._store_holidays(2024, [d for d in TEST_HOLIDAYS[2024] if d != date(2024, 10, 3)])
+        assert date_utils.is_business_day(date(2024, 10, 3))
+        assert date_utils.get_next_business_day(date(2024, 10, 2)) == date(2024, 10, 3)
+
+        # replace=False 는 이미 적재된 연도를 유지 (최초 적재 우선)
+        kept = date_utils._store_holidays(2024, TEST_HOLIDAYS[2024], replace=False)
+        assert date(2024, 10, 3) not in kept
+        assert date_utils.is_business_day(date(2024, 10, 3))
+    finally:
+        _seed_holidays()
+    print("✅ 캐시 무효화 정상")
+
+
+def test_parse_date_string():
+    """지원 포맷별 날짜 파싱 테스트"""
+    print("\n=== parse_date_string 테스트 ===")
+    for text in ("2024-03-05", "20240305", "2024.03.05", "2024/03/05", "2024-3-5"):
+        assert date_utils.parse_date_string(text) == date(2024, 3, 5), text
+
+    for text in ("2024-02-30", "2024-03/05", "2024-+3-05", "20241305", "", "abc"):
+        assert date_utils.parse_date_string(text) is None, text
+    print("✅ 날짜 파싱 정상")
+
+
+def main():
+    """메인 테스트 실행"""
+    print("🚀 영업일 유틸리티 테스트 시작")
+    test_is_business_day()
+    test_business_days_between()
+    test_previous_next_business_day()
+    test_business_days_ago()
+    test_recent_business_days()
+    test_month_and_quarter_windows()
+    test_store_holidays_invalidates_derived_caches()
+    test_parse_date_string()
+    print("\n🎉 모든 영업일 유틸리티 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+AI 배치 생성 테스트 (프롬프트 묶기, 배치 응답 파싱, 개별 생성 폴백)
+"""
+
+import sys
+import os
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+# 프로젝트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GOOGLE_API_KEY", "test_key")
+
+from services.dict_ai_service import (
+    DictAIAnalysisService, _frame_batch_prompt, _parse_batch_response
+)
+
+
+class FakeModel:
+    """Gemini 모델 대체: 묶인 프롬프트에는 batch_reply, 개별 프롬프트에는 '응답:<프롬프트>' 반환"""
+
+    def __init__(self, batch_reply=None):
+        self.batch_reply = batch_reply
+        self.prompts = []
+        self.active = 0
+        self.max_active = 0
+
+    async def generate_content_async(self, prompt):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0)
+        self.active -= 1
+        if "### 요청 " in prompt:
+            return SimpleNamespace(text=self.batch_reply)
+        return SimpleNamespace(text=f"응답:{prompt}")
+
+
+def _reply(pairs):
+    return json.dumps([{"index": index, "analysis": analysis} for index, analysis in pairs], ensure_ascii=False)
+
+
+def _service(model):
+    service = DictAIAnalysisService()
+    service.model = model
+    return service
+
+
+def test_frame_batch_prompt():
+    """요청마다 번호가 붙은 섹션과 JSON 배열 응답 지시가 들어감"""
+    framed = _frame_batch_prompt(["  삼성전자 분석  ", "SK하이닉스 분석"])
+
+    assert framed.startswith("아래 2개의 독립적인 분석 요청")
+    assert '"index"' in framed and '"analysis"' in framed
+    assert framed.index("### 요청 0\n삼성전자 분석") < framed.index("### 요청 1\nSK하이닉스 분석")
+
+
+def test_parse_batch_response_orders_by_index():
+    """번호 순서가 섞여 있어도 요청 순서대로 반환"""
+    assert _parse_batch_response(_reply([(1, "둘"), (0, "하나")]), 2) == ["하나", "둘"]
+
+
+def test_parse_batch_response_code_fence():
+    """```json 코드 블록으로 감싼 응답도 파싱"""
+    fenced = f"```json\n{_reply([(0, '하나'), (1, '둘')])}\n```"
+    assert _parse_batch_response(fenced, 2) == ["하나", "둘"]
+
+
+@pytest.mark.parametrize("text", [
+    _reply([(0, "하나")]),                         # 번호 누락
+    _reply([(0, "하나"), (0, "또 하나"), (1, "둘")]),  # 번호 중복
+    _reply([(0, "하나"), (2, "셋")]),               # 범위 밖 번호
+    json.dumps({"index": 0, "analysis": "하나"}),   # 배열이 아님
+    "분석 결과를 드립니다",                          # JSON 아님
+])
+def test_parse_batch_response_rejects_malformed(text):
+    """번호가 빠지거나 중복되는 등 형식이 맞지 않으면 None"""
+    assert _parse_batch_response(text, 2) is None
+
+
+def test_generate_batch_falls_back_to_single_prompts():
+    """배치 응답 형식이 맞지 않으면 프롬프트마다 하나씩 다시 생성해 각 호출자에게 전달"""
+    model = FakeModel(batch_reply=_reply([(0, "하나"), (0, "또 하나")]))
+    service = _service(model)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        batch = [("가", loop.create_future()), ("나", loop.create_future())]
+        await service._generate_batch(batch)
+        return [future.result() for _, future in batch]
+
+    assert asyncio.run(run()) == ["응답:가", "응답:나"]
+    assert model.prompts[1:] == ["가", "나"]
+    # 배치가 차지한 동시 요청 슬롯 하나를 넘지 않음
+    assert model.max_active == 1
+
+
+def test_generate_batched_groups_concurrent_prompts():
+    """동시에 들어온 프롬프트는 한 번의 요청으로 묶이고, 종료 시 워커가 취소됨"""
+    model = FakeModel(batch_reply=_reply([(0, "하나"), (1, "둘")]))
+    service = _service(model)
+
+    async def run():
+        results = await asyncio.gather(service.generate_batched("가"), service.generate_batched("나"))
+        worker = service._batch_worker
+        service.close_batch_worker()
+        await asyncio.sleep(0)
+        return results, worker
+
+    results, worker = asyncio.run(run())
+
+    assert results == ["하나", "둘"]
+    assert len(model.prompts) == 1
+    assert worker.cancelled() and service._batch_worker is None
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+딕셔너리 기반 모델 검증 테스트 (MongoDB 없이 실행)
+"""
+
+import sys
+import os
+from datetime import date, datetime
+
+import numpy as np
+from bson import ObjectId
+
+# 프로젝트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import (
+    create_target_ticker, create_ohlcv_data, create_ohlcv_batch,
+    create_ohlcv_rows, ohlcv_rows_to_arrays, create_technical_indicators, create_job_status,
+    validate_target_ticker, validate_ohlcv_data, validate_technical_indicators, validate_job_status,
+    validate_ohlcv_batch, validate_technical_indicators_batch,
+    target_ticker_schema, ohlcv_data_schema,
+    convert_date_fields, convert_date_fields_inplace, sanitize_for_mongo, prepare_for_api,
+    create_stock_list_response
+)
+from models.dict_models import validate_schema, _DATE_FIELDS_OHLCV
+
+
+def _ohlcv(**overrides):
+    """검증을 통과하는 기본 OHLCV 데이터"""
+    data = create_ohlcv_data(
+        date=datetime(2024, 12, 20), ticker="005930",
+        open_price=52700.0, high=53100.0, low=51900.0, close=53000.0, volume=24674774
+    )
+    data.update(overrides)
+    return data
+
+
+def test_schema_validation():
+    """필수/Optional 필드 및 타입 검증 테스트"""
+    print("=== 스키마 검증 테스트 ===")
+
+    ticker = create_target_ticker("005930", "삼성전자", 400000000000000)
+    assert validate_target_ticker(ticker)
+
+    # Optional 필드는 None 이거나 누락되어도 통과
+    assert validate_target_ticker({**ticker, "last_analyzed_date": datetime(2024, 12, 20)})
+    assert validate_target_ticker({k: v for k, v in ticker.items() if k != "last_analyzed_date"})
+
+    # 필수 필드 누락 / 잘못된 타입
+    assert not validate_target_ticker({k: v for k, v in ticker.items() if k != "name"})
+    assert not validate_target_ticker({**ticker, "market_cap": "400조"})
+    assert not validate_target_ticker({**ticker, "last_analyzed_date": "2024-12-20"})
+
+    # float 필드는 int 허용
+    assert validate_ohlcv_data(_ohlcv(open=52700))
+    assert not validate_ohlcv_data(_ohlcv(volume=1.5))
+
+    # 스키마 딕셔너리를 직접 넘겨도 동일하게 동작
+    assert validate_schema(ticker, target_ticker_schema())
+    assert not validate_schema({"ticker": "005930"}, ohlcv_data_schema())
+
+    # bool 은 int/float 필드 값으로 허용하지 않음
+    assert not validate_schema({**ticker, "market_cap": True}, target_ticker_schema())
+    assert not validate_ohlcv_data(_ohlcv(close=True))
+    print("✅ 스키마 검증 정상")
+
+
+def test_business_rules():
+    """가격/지표/상태 값 범위 검증 테스트"""
+    print("\n=== 비즈니스 규칙 검증 테스트 ===")
+
+    assert validate_ohlcv_data(_ohlcv())
+    assert not validate_ohlcv_data(_ohlcv(close=0.0))
+    assert not validate_ohlcv_data(_ohlcv(high=51000.0))
+    assert not validate_ohlcv_data(_ohlcv(volume=-1))
+
+    indicators = create_technical_indicators(datetime(2024, 12, 20), "005930", rsi_14=55.0, stoch_k=80.0)
+    assert validate_technical_indicators(indicators)
+    assert validate_technical_indicators({**indicators, "rsi_14": 100})  # Optional[float] 도 int 허용
+    assert not validate_technical_indicators({**indicators, "macd": "1.2"})
+    assert not validate_technical_indicators({**indicators, "rsi_14": 100.5})
+    assert not validate_technical_indicators({**indicators, "stoch_d": -1.0})
+
+    job = create_job_status("2024-12-20_daily_update", "daily_update", datetime(2024, 12, 20))
+    assert validate_job_status(job)
+    assert validate_job_status({**job, "status": "completed", "records_processed": 10})
+    assert not validate_job_status({**job, "status": "paused"})
+    print("✅ 비즈니스 규칙 검증 정상")
+
+
+def test_ohlcv_batch_validation():
+    """일괄 검증 결과가 행별 검증과 일치하는지 테스트"""
+    print("\n=== OHLCV 일괄 검증 테스트 ===")
+
+    rows = [
+        _ohlcv(),
+        _ohlcv(close=0.0),
+        _ohlcv(high=51000.0),
+        _ohlcv(volume=-1),
+        _ohlcv(open=52700),
+        _ohlcv(volume=1.5),
+        {"ticker": "005930"},
+        _ohlcv(low=53100.0),
+    ]
+    mask = validate_ohlcv_batch(rows)
+    assert mask.dtype == bool
+    assert mask.tolist() == [validate_ohlcv_data(row) for row in rows]
+    assert mask.tolist() == [True, False, False, False, True, False, False, True]
+    assert validate_ohlcv_batch([]).tolist() == []
+    print("✅ 일괄 검증 정상")
+
+
+def test_ohlcv_batch_creation():
+    """일괄 생성 시 모든 행이 같은 created_at 을 공유하는지 테스트"""
+    print("\n=== OHLCV 일괄 생성 테스트 ===")
+
+    rows = [
+        (datetime(2024, 12, 19), "005930", 52000.0, 52800.0, 51700.0, 52700.0, 18000000),
+        (datetime(2024, 12, 20), "005930", 52700.0, 53100.0, 51900.0, 53000.0, 24674774),
+    ]
+    docs = create_ohlcv_batch(rows)
+    assert len(docs) == 2
+    assert docs[0]["created_at"] is docs[1]["created_at"]
+    assert docs[1] == create_ohlcv_data(*rows[1], created_at=docs[0]["created_at"])
+    assert validate_ohlcv_batch(docs).all()
+
+    fixed = datetime(2024, 12, 20, 9, 0)
+    assert all(doc["created_at"] == fixed for doc in create_ohlcv_batch(rows, created_at=fixed))
+    assert create_ohlcv_batch([]) == []
+    print("✅ 일괄 생성 정상")
+
+
+def test_ohlcv_rows():
+    """OHLCVRow 문서 변환 및 열 배열 변환 테스트"""
+    print("\n=== OHLCVRow 테스트 ===")
+
+    rows = create_ohlcv_rows([
+        (datetime(2024, 12, 19), "005930", 52000.0, 52800.0, 51700.0, 52700.0, 18000000),
+        (datetime(2024, 12, 20), "005930", 52700.0, 53100.0, 51900.0, 53000.0, 24674774),
+    ])
+    assert not hasattr(rows[0], "__dict__")
+    assert rows[1].as_mongo_dict() == _ohlcv(created_at=rows[1].created_at)
+
+    arrays = ohlcv_rows_to_arrays(rows)
+    assert arrays["date"].astype(str).tolist() == ["2024-12-19", "2024-12-20"]
+    assert arrays["close"].dtype == np.float64 and arrays["close"].tolist() == [52700.0, 53000.0]
+    assert arrays["volume"].dtype == np.int64 and arrays["volume"].tolist() == [18000000, 24674774]
+    assert len(ohlcv_rows_to_arrays([])["open"]) == 0
+    print("✅ OHLCVRow 정상")
+
+
+def test_technical_indicators_batch_validation():
+    """지표 일괄 검증 결과가 행별 검증과 일치하는지 테스트"""
+    print("\n=== 기술적 지표 일괄 검증 테스트 ===")
+
+    base = create_technical_indicators(datetime(2024, 12, 20), "005930", rsi_14=55.0, stoch_k=80.0)
+    rows = [
+        base,
+        {**base, "rsi_14": None, "stoch_k": None},
+        {**base, "rsi_14": 100.5},
+        {**base, "stoch_k": -0.1},
+        {**base, "stoch_d": 100},
+        {**base, "macd": "1.2"},
+        {**base, "rsi_14": 0.0, "stoch_d": 101.0},
+    ]
+    mask = validate_technical_indicators_batch(rows)
+    assert mask.tolist() == [validate_technical_indicators(row) for row in rows]
+    assert mask.tolist() == [True, True, False, False, True, False, False]
+    assert validate_technical_indicators_batch([]).tolist() == []
+    print("✅ 기술적 지표 일괄 검증 정상")
+
+
+def test_convert_date_fields():
+    """날짜 필드 변환 시 복사/직접 수정 동작 테스트"""
+    print("\n=== 날짜 필드 변환 테스트 ===")
+
+    stored = {"date": "2024-12-20T00:00:00", "created_at": datetime(2024, 12, 20, 9), "ticker": "005930"}
+    converted = convert_date_fields(stored, _DATE_FIELDS_OHLCV)
+    assert converted["date"] == datetime(2024, 12, 20)
+    assert stored["date"] == "2024-12-20T00:00:00"  # 원본은 그대로
+
+    # 변환할 필드가 없으면 복사하지 않음
+    assert convert_date_fields(converted, _DATE_FIELDS_OHLCV) is converted
+
+    assert convert_date_fields_inplace(stored, _DATE_FIELDS_OHLCV) is stored
+    assert stored["date"] == datetime(2024, 12, 20)
+
+    # 형식이 잘못된 값은 문자열 그대로 둠
+    assert convert_date_fields({"date": "20일"}, ["date"])["date"] == "20일"
+    print("✅ 날짜 필드 변환 정상")
+
+
+def test_sanitize_for_mongo():
+    """MongoDB 저장용 정리 (None 제거, date 변환, 정리할 것이 없으면 그대로 반환)"""
+    print("\n=== MongoDB 저장용 정리 테스트 ===")
+
+    clean = _ohlcv()
+    assert sanitize_for_mongo(clean) is clean
+
+    sanitized = sanitize_for_mongo({"date": date(2024, 12, 20), "ticker": "005930", "note": None})
+    assert sanitized == {"date": datetime(2024, 12, 20), "ticker": "005930"}
+    print("✅ MongoDB 저장용 정리 정상")
+
+
+def test_prepare_for_api():
+    """API 응답용 변환 (_id → id, datetime/numpy 값 직렬화)"""
+    print("\n=== API 응답용 변환 테스트 ===")
+
+    prepared = prepare_for_api({
+        "_id": ObjectId("6765a1f0c2a4b5e6f7a8b9c0"),
+        "ticker": "005930",
+        "date": datetime(2024, 12, 20),
+        "close": np.float64(53000.0),
+        "history": [{"date": datetime(2024, 12, 19, 15, 30)}],
+    })
+    assert prepared == {
+        "id": "6765a1f0c2a4b5e6f7a8b9c0",
+        "ticker": "005930",
+        "date": "2024-12-20T00:00:00",
+        "close": 53000.0,
+        "history": [{"date": "2024-12-19T15:30:00"}],
+    }
+    print("✅ API 응답용 변환 정상")
+
+
+def test_stock_list_response():
+    """주식 목록 응답의 활성 종목 수 (is_active 누락은 비활성)"""
+    print("\n=== 주식 목록 응답 테스트 ===")
+
+    tickers = [{"ticker": "005930", "is_active": True}, {"ticker": "000660", "is_active": False}, {"ticker": "035420"}]
+    response = create_stock_list_response(tickers)
+    assert response["data"]["total_count"] == 3
+    assert response["data"]["active_count"] == 1
+    print("✅ 주식 목록 응답 정상")
+
+
+def main():
+    """메인 테스트 실행"""
+    print("🚀 딕셔너리 모델 검증 테스트 시작")
+    test_schema_validation()
+    test_business_rules()
+    test_ohlcv_batch_validation()
+    test_ohlcv_batch_creation()
+    test_ohlcv_rows()
+    test_technical_indicators_batch_validation()
+    test_convert_date_fields()
+    test_sanitize_for_mongo()
+    test_prepare_for_api()
+    test_stock_list_response()
+    print("\n🎉 모든 딕셔너리 모델 검증 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
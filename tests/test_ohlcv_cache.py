@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+OHLCV Parquet 캐시 테스트 (MongoDB 없이 저장소 조회를 대체해 검증)
+"""
+
+import sys
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+
+# 프로젝트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GOOGLE_API_KEY", "test_key")
+
+pytest.importorskip("pyarrow")
+
+from repositories.base import BaseRepository
+from repositories.stock_data_repository import StockDataRepository
+from schemas import OHLCVData
+from utils import ohlcv_cache
+
+TICKER = "005930"
+START, END = date(2024, 12, 1), date(2024, 12, 31)
+WRITTEN_AT = datetime(2024, 12, 20, 10, 0)
+
+
+def _row(day, close, created_at=WRITTEN_AT):
+    """검증을 통과하는 OHLCV 행"""
+    return OHLCVData(
+        date=date(2024, 12, day), open_price=close, high=close + 10, low=close - 10,
+        close=close, volume=1000, ticker=TICKER, created_at=created_at
+    )
+
+
+class _FakeReads:
+    """StockDataRepository 의 일괄 조회를 대체하고 호출 인자를 기록"""
+
+    def __init__(self, full, changed=None):
+        self.full = full
+        self.changed = changed or []
+        self.full_calls = []
+        self.changed_calls = []
+
+    def get_date_range_bulk(self, tickers, start_date, end_date):
+        self.full_calls.append(list(tickers))
+        return {ticker: list(self.full) for ticker in tickers}
+
+    def get_changed_since_bulk(self, since, start_date, end_date):
+        self.changed_calls.append(dict(since))
+        return {ticker: list(self.changed) for ticker in since}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(ohlcv_cache, "CACHE_DIR", tmp_path / "ohlcv")
+    return tmp_path / "ohlcv"
+
+
+def _use_reads(monkeypatch, reads):
+    monkeypatch.setattr(StockDataRepository, "get_date_range_bulk", reads.get_date_range_bulk)
+    monkeypatch.setattr(StockDataRepository, "get_changed_since_bulk", reads.get_changed_since_bulk)
+
+
+def _closes(rows):
+    return [(row.date.day, row.close) for row in rows]
+
+
+def test_merge_fresh_rows_win():
+    """캐시 프레임과 변경된 행을 합치면 같은 날짜는 새 행, 새 날짜는 추가"""
+    cached = ohlcv_cache._merge(None, [_row(2, 100.0), _row(3, 110.0), _row(4, 120.0)])
+    later = WRITTEN_AT + timedelta(hours=1)
+    merged = ohlcv_cache._merge(cached, [_row(5, 130.0, later), _row(3, 111.0, later)])
+
+    assert list(merged["date"]) == ["2024-12-02", "2024-12-03", "2024-12-04", "2024-12-05"]
+    assert list(merged["close"]) == [100.0, 111.0, 120.0, 130.0]
+    assert merged["created_at"].max().to_pydatetime() == later
+
+
+def test_load_history_merges_changed_rows(cache_dir, monkeypatch):
+    """두 번째 로드는 created_at 이후 변경분만 읽어 캐시와 합침"""
+    _use_reads(monkeypatch, _FakeReads([_row(2, 100.0), _row(3, 110.0)]))
+    first = ohlcv_cache.load_history([TICKER], START, END)[TICKER]
+    assert _closes(first) == [(2, 100.0), (3, 110.0)]
+    assert (cache_dir / f"{TICKER}.parquet").exists()
+
+    later = WRITTEN_AT + timedelta(hours=1)
+    reads = _FakeReads([], changed=[_row(3, 115.0, later), _row(4, 120.0, later)])
+    _use_reads(monkeypatch, reads)
+    second = ohlcv_cache.load_history([TICKER], START, END)[TICKER]
+
+    assert _closes(second) == [(2, 100.0), (3, 115.0), (4, 120.0)]
+    assert reads.full_calls == [[]]
+    assert reads.changed_calls == [{TICKER: WRITTEN_AT}]
+
+
+def test_invalidate_forces_full_reload(cache_dir, monkeypatch):
+    """invalidate 후에는 캐시 대신 전체 구간을 다시 읽음 (삭제된 행 제거)"""
+    _use_reads(monkeypatch, _FakeReads([_row(2, 100.0), _row(3, 110.0)]))
+    ohlcv_cache.load_history([TICKER], START, END)
+
+    ohlcv_cache.invalidate(TICKER)
+    reads = _FakeReads([_row(3, 110.0)])
+    _use_reads(monkeypatch, reads)
+    reloaded = ohlcv_cache.load_history([TICKER], START, END)[TICKER]
+
+    assert _closes(reloaded) == [(3, 110.0)]
+    assert reads.full_calls == [[TICKER]]
+    assert reads.changed_calls == [{}]
+
+
+def test_repository_delete_invalidates_cache(cache_dir, monkeypatch):
+    """저장소에서 행을 삭제하면 해당 종목 캐시 파일이 삭제됨"""
+    _use_reads(monkeypatch, _FakeReads([_row(2, 100.0)]))
+    ohlcv_cache.load_history([TICKER], START, END)
+    monkeypatch.setattr(BaseRepository, "delete_many", lambda self, filter_dict: 1)
+
+    StockDataRepository(TICKER).delete_data_before_date(date(2024, 12, 3))
+
+    assert not (cache_dir / f"{TICKER}.parquet").exists()
+
+
+def test_repository_restore_invalidates_cache(cache_dir, monkeypatch):
+    """백업 복원 행은 기존 created_at 을 유지하므로 캐시 파일을 삭제함"""
+    _use_reads(monkeypatch, _FakeReads([_row(2, 100.0)]))
+    ohlcv_cache.load_history([TICKER], START, END)
+    monkeypatch.setattr(BaseRepository, "insert_many", lambda self, documents: [])
+
+    restored = StockDataRepository(TICKER).restore_from_dict(
+        [{"date": "2024-12-02", "close": 105.0, "created_at": WRITTEN_AT - timedelta(days=30)}]
+    )
+
+    assert restored == 1
+    assert not (cache_dir / f"{TICKER}.parquet").exists()
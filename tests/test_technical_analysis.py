@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+기술적 분석기 테스트 (일괄 패널 계산과 calculate_* 메서드의 일치 여부 검증)
+"""
+
+import sys
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+# 프로젝트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GOOGLE_API_KEY", "test_key")
+
+from collectors.technical_analysis import TechnicalAnalyzer, INDICATOR_COLUMNS
+from schemas import OHLCVData
+
+START = date(2024, 1, 1)
+
+
+def _rows(ticker, closes):
+    """종가 목록으로 일봉 생성 (고가/저가는 종가의 ±1%)"""
+    return [
+        OHLCVData(
+            date=START + timedelta(days=i), open_price=close * 0.995, high=close * 1.01,
+            low=close * 0.99, close=close, volume=1000 + i, ticker=ticker
+        )
+        for i, close in enumerate(closes)
+    ]
+
+
+def _random_walk(seed, count):
+    """양수 가격의 랜덤 워크"""
+    rng = np.random.default_rng(seed)
+    return list(50000 * np.exp(np.cumsum(rng.normal(0, 0.02, count))))
+
+
+def _reference(analyzer, rows):
+    """calculate_* 메서드로 계산한 지표 (열 이름 -> 값 목록)"""
+    closes = [row.close for row in rows]
+    highs = [row.high for row in rows]
+    lows = [row.low for row in rows]
+    macd = analyzer.calculate_macd(closes)
+    bollinger = analyzer.calculate_bollinger_bands(closes)
+    stochastic = analyzer.calculate_stochastic(highs, lows, closes)
+    return {
+        "sma_5": analyzer.calculate_sma(closes, 5),
+        "sma_20": analyzer.calculate_sma(closes, 20),
+        "sma_60": analyzer.calculate_sma(closes, 60),
+        "ema_12": analyzer.calculate_ema(closes, 12),
+        "ema_26": analyzer.calculate_ema(closes, 26),
+        "macd": macd["macd"],
+        "macd_signal": macd["signal"],
+        "macd_histogram": macd["histogram"],
+        "rsi_14": analyzer.calculate_rsi(closes),
+        "bollinger_upper": bollinger["upper"],
+        "bollinger_middle": bollinger["middle"],
+        "bollinger_lower": bollinger["lower"],
+        "stoch_k": stochastic["k"],
+        "stoch_d": stochastic["d"],
+    }
+
+
+def _as_array(values):
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def test_analyze_panel_matches_calculate_methods():
+    """길이가 다른 여러 종목과 가격 변동 없는 종목에서 패널 결과가 calculate_* 와 일치"""
+    analyzer = TechnicalAnalyzer()
+    history = {
+        "005930": _rows("005930", _random_walk(1, 120)),
+        "000660": _rows("000660", _random_walk(2, 61)),
+        "035420": _rows("035420", _random_walk(3, 90)),
+        "105560": _rows("105560", [70000.0] * 75),  # 가격 변동 없음
+    }
+
+    indicators = analyzer.analyze_panel(analyzer.build_panel(history))
+
+    assert list(indicators.columns) == INDICATOR_COLUMNS
+    for ticker, rows in history.items():
+        panel = indicators.loc[ticker]
+        assert len(panel) == len(rows)
+        expected = _reference(analyzer, rows)
+        for column in INDICATOR_COLUMNS:
+            np.testing.assert_allclose(
+                panel[column].to_numpy(dtype=np.float64), _as_array(expected[column]),
+                rtol=1e-9, atol=1e-6, equal_nan=True, err_msg=f"{ticker} {column}"
+            )
+
+
+def test_flat_prices_use_neutral_fallbacks():
+    """가격 변동이 없으면 RSI 100, 스토캐스틱 50, 볼린저 밴드 폭 0"""
+    analyzer = TechnicalAnalyzer()
+    rows = _rows("105560", [70000.0] * 75)
+
+    last = analyzer.analyze_panel(analyzer.build_panel({"105560": rows})).iloc[-1]
+
+    assert last["rsi_14"] == 100.0
+    assert last["stoch_k"] == 50.0
+    assert last["bollinger_upper"] == last["bollinger_lower"] == 70000.0
+
+
+def test_calculate_rsi_aligned_with_prices():
+    """RSI 목록은 가격과 길이가 같고 첫 값은 14번째 변동이 있는 봉에 위치 (회귀 테스트)"""
+    analyzer = TechnicalAnalyzer()
+    closes = _random_walk(4, 40)
+
+    rsi = analyzer.calculate_rsi(closes)
+
+    assert len(rsi) == len(closes)
+    assert all(value is None for value in rsi[:14])
+    assert all(value is not None for value in rsi[14:])
+
+
+def test_analyze_ohlcv_data_keeps_open_price():
+    """15개 이상 봉도 분석되고 시가(open_price)가 그대로 저장됨 (회귀 테스트)"""
+    analyzer = TechnicalAnalyzer()
+    rows = _rows("005930", _random_walk(5, 30))
+
+    analyzed = analyzer.analyze_ohlcv_data(list(reversed(rows)))
+
+    assert [doc["date"] for doc in analyzed] == [row.date.isoformat() for row in rows]
+    assert [doc["ohlcv"]["open_price"] for doc in analyzed] == [row.open_price for row in rows]
+    assert analyzed[-1]["technical_indicators"]["rsi_14"] == pytest.approx(
+        analyzer.calculate_rsi([row.close for row in rows])[-1]
+    )
+
+
+def _state_after(analyzer, ticker, rows):
+    """rows 까지 일괄 계산한 뒤의 지표 상태"""
+    indicators = analyzer.analyze_panel(analyzer.build_panel({ticker: rows}), with_state=True)
+    return analyzer.extract_state(ticker, rows, indicators.loc[ticker])
+
+
+def test_advance_state_matches_full_panel():
+    """N개 봉의 상태에서 M개 봉을 이어 계산한 값이 N+M개 일괄 계산과 일치"""
+    analyzer = TechnicalAnalyzer()
+    rows = _rows("005930", _random_walk(6, 130))
+    split = 100
+
+    state = _state_after(analyzer, "005930", rows[:split])
+    advanced, new_state = analyzer.advance_state(state, rows[split:])
+    full = analyzer.analyze_panel(analyzer.build_panel({"005930": rows})).loc["005930"]
+
+    assert list(advanced.columns) == INDICATOR_COLUMNS
+    np.testing.assert_allclose(
+        advanced.to_numpy(dtype=np.float64), full.iloc[split:].to_numpy(dtype=np.float64),
+        rtol=1e-9, atol=1e-6
+    )
+
+    # 이어 계산한 상태도 전체 구간에서 추출한 상태와 같아야 다음 실행이 이어짐
+    expected_state = _state_after(analyzer, "005930", rows)
+    assert new_state["date"] == expected_state["date"] == rows[-1].date.isoformat()
+    for key in ("closes", "highs", "lows", "stoch_k"):
+        np.testing.assert_allclose(new_state[key], expected_state[key], rtol=1e-9, atol=1e-6)
+    for key in ("ema_12", "ema_26", "macd_signal", "rsi_avg_gain", "rsi_avg_loss"):
+        assert new_state[key] == pytest.approx(expected_state[key], rel=1e-9)
+
+
+def test_extract_state_none_while_warming_up():
+    """상태 창(60봉)보다 짧으면 상태를 만들지 않음"""
+    analyzer = TechnicalAnalyzer()
+    assert _state_after(analyzer, "005930", _rows("005930", _random_walk(7, 59))) is None
+
+
+def test_resume_index_fits_unchanged_history():
+    """저장된 상태 이후 봉이 추가된 이력에서는 다음 봉의 위치를 반환"""
+    analyzer = TechnicalAnalyzer()
+    rows = _rows("005930", _random_walk(8, 90))
+    state = _state_after(analyzer, "005930", rows[:80])
+
+    assert analyzer.resume_index(state, rows) == 80
+
+
+@pytest.mark.parametrize("field", ["close", "high", "low"])
+def test_resume_index_rejects_changed_window(field):
+    """상태 창 안의 과거 종가/고가/저가가 바뀌면 None (재계산 필요)"""
+    analyzer = TechnicalAnalyzer()
+    rows = _rows("005930", _random_walk(9, 90))
+    state = _state_after(analyzer, "005930", rows[:80])
+
+    changed = list(rows)
+    changed[50] = rows[50].model_copy(update={field: getattr(rows[50], field) + 1.0})
+
+    assert analyzer.resume_index(state, changed) is None
+
+
+def test_resume_index_rejects_missing_date():
+    """상태의 마지막 날짜가 이력에 없으면 None"""
+    analyzer = TechnicalAnalyzer()
+    rows = _rows("005930", _random_walk(10, 90))
+    state = _state_after(analyzer, "005930", rows[:80])
+
+    assert analyzer.resume_index(state, rows[:79] + rows[80:]) is None
+    assert analyzer.resume_index({**state, "date": "2023-01-01"}, rows) is None
+
+
+def test_indicator_state_repository_round_trip(monkeypatch):
+    """상태 저장 시 _id 를 빼고 종목별로 교체, 조회는 종목 -> 상태"""
+    from repositories.indicator_state_repository import IndicatorStateRepository
+
+    class FakeCollection:
+        def __init__(self):
+            self.docs = {}
+
+        def replace_one(self, filter_dict, doc, upsert=False):
+            assert upsert and "_id" not in doc
+            self.docs[filter_dict["ticker"]] = doc
+
+        def find(self, filter_dict):
+            return FakeCursor([self.docs[t] for t in filter_dict["ticker"]["$in"] if t in self.docs])
+
+    class FakeCursor(list):
+        def sort(self, *args):
+            return self
+
+        def limit(self, *args):
+            return self
+
+    collection = FakeCollection()
+    monkeypatch.setattr(IndicatorStateRepository, "collection", property(lambda self: collection))
+    repo = IndicatorStateRepository()
+    analyzer = TechnicalAnalyzer()
+    state = _state_after(analyzer, "005930", _rows("005930", _random_walk(11, 70)))
+
+    assert repo.save_state({**state, "_id": "old"})
+    states = repo.get_states(["005930", "000660"])
+
+    assert list(states) == ["005930"]
+    assert analyzer.resume_index(states["005930"], _rows("005930", _random_walk(11, 70))) == 70
@@ -1,18 +1,34 @@
 """
 Date and business day utilities for Korean stock market.
 """
-from datetime import date, datetime, timedelta
-from typing import List, Optional
-import pytz
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 import logging
+import threading
 from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
 
 from config import settings
+from database import db_manager
 
 logger = logging.getLogger(__name__)
 
 # Cache for Korean market holidays by year
-_HOLIDAY_CACHE = {}
+_HOLIDAY_CACHE: Dict[int, FrozenSet[date]] = {}
+_HOLIDAY_CACHE_LOCK = threading.Lock()
+
+# Holidays persisted in system_info so worker restarts skip the pykrx round trip
+_HOLIDAY_COLLECTION = "market_holidays"
+_HOLIDAY_REFRESH_DAYS = 30  # Re-fetch current/future years after this many days
+_PERSISTED_HOLIDAYS: Optional[Dict[int, Dict[str, Any]]] = None
+
+# Regular session hours (KST)
+MARKET_OPEN_TIME = time(9, 0)
+MARKET_CLOSE_TIME = time(15, 30)
 
 
 def get_kst_now() -> datetime:
@@ -28,24 +44,113 @@ def get_kst_today() -> date:
 def utc_to_kst(utc_dt: datetime) -> datetime:
     """Convert UTC datetime to KST."""
     if utc_dt.tzinfo is None:
-        utc_dt = pytz.UTC.localize(utc_dt)
+        utc_dt = utc_dt.replace(tzinfo=timezone.utc)
     return utc_dt.astimezone(settings.kst_timezone)
 
 
 def kst_to_utc(kst_dt: datetime) -> datetime:
     """Convert KST datetime to UTC."""
     if kst_dt.tzinfo is None:
-        kst_dt = settings.kst_timezone.localize(kst_dt)
-    return kst_dt.astimezone(pytz.UTC)
+        kst_dt = kst_dt.replace(tzinfo=settings.kst_timezone)
+    return kst_dt.astimezone(timezone.utc)
 
 
 def get_market_holidays(year: int) -> List[date]:
     """Get Korean stock market holidays for the given year using pykrx."""
-    global _HOLIDAY_CACHE
+    return sorted(_get_holiday_set(year))
+
+
+def _get_holiday_set(year: int) -> FrozenSet[date]:
+    """Get the cached holiday set for the given year, loading it on first use."""
+    holidays = _HOLIDAY_CACHE.get(year)
+    if holidays is not None:
+        return holidays
+    
+    # Load outside the lock so different years can load concurrently;
+    # if two threads race on the same year, the first insert wins.
+    return _store_holidays(year, _resolve_market_holidays(year), replace=False)
+
+
+def warm_holiday_cache(years: Optional[Iterable[int]] = None) -> None:
+    """Load holidays for several years in parallel (default: 5 years back, 1 ahead)."""
+    if years is None:
+        current_year = get_kst_today().year
+        years = range(current_year - 5, current_year + 2)
+    
+    years = list(years)
+    try:
+        with ThreadPoolExecutor(max_workers=len(years) or 1) as executor:
+            list(executor.map(_get_holiday_set, years))
+        logger.info(f"Market holiday cache warmed for {years[0]}-{years[-1]}")
+    except Exception as e:
+        logger.warning(f"Failed to warm market holiday cache: {e}")
+
+
+def _resolve_market_holidays(year: int) -> List[date]:
+    """Resolve holidays from the persisted copy, pykrx, or the fixed fallback."""
+    persisted = _load_persisted_holidays().get(year)
+    if persisted is not None and not _is_persisted_stale(year, persisted):
+        return [date.fromisoformat(d) for d in persisted["dates"]]
+    
+    holidays = _fetch_market_holidays(year)
+    if holidays is not None:
+        _persist_holidays(year, holidays)
+        return holidays
+    
+    if persisted is not None:
+        logger.warning(f"Using stale persisted market holidays for {year}")
+        return [date.fromisoformat(d) for d in persisted["dates"]]
+    
+    logger.warning(f"Using fallback market holidays for {year}")
+    return _fallback_market_holidays(year)
+
+
+def _load_persisted_holidays() -> Dict[int, Dict[str, Any]]:
+    """Load persisted holiday documents once per process."""
+    global _PERSISTED_HOLIDAYS
     
-    if year in _HOLIDAY_CACHE:
-        return _HOLIDAY_CACHE[year]
+    if _PERSISTED_HOLIDAYS is None:
+        try:
+            collection = db_manager.get_collection("system_info", _HOLIDAY_COLLECTION)
+            _PERSISTED_HOLIDAYS = {doc["_id"]: doc for doc in collection.find()}
+            logger.debug(f"Loaded persisted market holidays for {len(_PERSISTED_HOLIDAYS)} years")
+        except Exception as e:
+            # Database not connected yet; try again on the next cache miss
+            logger.debug(f"Persisted market holidays unavailable: {e}")
+            return {}
+    
+    return _PERSISTED_HOLIDAYS
+
+
+def _is_persisted_stale(year: int, doc: Dict[str, Any]) -> bool:
+    """Past years never change; current and future years are refreshed periodically."""
+    if year < get_kst_today().year:
+        return False
     
+    fetched_at = doc.get("fetched_at")
+    if fetched_at is None:
+        return True
+    return datetime.utcnow() - fetched_at > timedelta(days=_HOLIDAY_REFRESH_DAYS)
+
+
+def _persist_holidays(year: int, holidays: List[date]) -> None:
+    """Save holidays fetched from pykrx so other processes can reuse them."""
+    doc = {
+        "dates": sorted(d.isoformat() for d in holidays),
+        "fetched_at": datetime.utcnow()
+    }
+    
+    try:
+        collection = db_manager.get_collection("system_info", _HOLIDAY_COLLECTION)
+        collection.update_one({"_id": year}, {"$set": doc}, upsert=True)
+        if _PERSISTED_HOLIDAYS is not None:
+            _PERSISTED_HOLIDAYS[year] = {"_id": year, **doc}
+    except Exception as e:
+        logger.debug(f"Could not persist market holidays for {year}: {e}")
+
+
+def _fetch_market_holidays(year: int) -> Optional[List[date]]:
+    """Fetch holidays for the given year from pykrx (None on failure)."""
     try:
         import pykrx.stock.stock as krx_stock
         holidays_df = krx_stock.get_market_holidays(str(year))
@@ -62,61 +167,105 @@ def get_market_holidays(year: int) -> List[date]:
                 else:
                     holidays.append(holiday_date)
         
-        _HOLIDAY_CACHE[year] = holidays
         logger.debug(f"Loaded {len(holidays)} holidays for {year}")
         return holidays
         
     except Exception as e:
-        logger.warning(f"Failed to get market holidays for {year}, using fallback: {e}")
-        
-        # Fallback to basic Korean holidays if pykrx fails
-        fallback_holidays = [
-            date(year, 1, 1),   # 신정
-            date(year, 3, 1),   # 삼일절  
-            date(year, 5, 5),   # 어린이날
-            date(year, 6, 6),   # 현충일
-            date(year, 8, 15),  # 광복절
-            date(year, 10, 3),  # 개천절
-            date(year, 10, 9),  # 한글날
-            date(year, 12, 25), # 크리스마스
-        ]
-        
-        _HOLIDAY_CACHE[year] = fallback_holidays
-        return fallback_holidays
+        logger.warning(f"Failed to get market holidays for {year}: {e}")
+        return None
+
+
+def _fallback_market_holidays(year: int) -> List[date]:
+    """Basic fixed Korean holidays used when pykrx is unavailable."""
+    return [
+        date(year, 1, 1),   # 신정
+        date(year, 3, 1),   # 삼일절  
+        date(year, 5, 5),   # 어린이날
+        date(year, 6, 6),   # 현충일
+        date(year, 8, 15),  # 광복절
+        date(year, 10, 3),  # 개천절
+        date(year, 10, 9),  # 한글날
+        date(year, 12, 25), # 크리스마스
+    ]
+
+
+def _store_holidays(year: int, holidays: Iterable[date], replace: bool = True) -> FrozenSet[date]:
+    """Cache a year's holidays and drop caches derived from them.
+    
+    Every write to _HOLIDAY_CACHE goes through here. With replace=False an
+    already-cached year is kept as is. Returns the set cached for the year.
+    """
+    holidays = frozenset(holidays)
+    with _HOLIDAY_CACHE_LOCK:
+        if not replace and year in _HOLIDAY_CACHE:
+            return _HOLIDAY_CACHE[year]
+        _HOLIDAY_CACHE[year] = holidays
+    _is_business_ordinal.cache_clear()
+    _busday_calendar.cache_clear()
+    _business_day_index.cache_clear()
+    return holidays
 
 
 def is_business_day(target_date: date) -> bool:
     """Check if given date is a business day (excludes weekends and holidays)."""
-    # Check weekend (Saturday=5, Sunday=6)
-    if target_date.weekday() >= 5:
+    return _is_business_ordinal(target_date.toordinal())
+
+
+@lru_cache(maxsize=32768)
+def _is_business_ordinal(ordinal: int) -> bool:
+    """Business day check keyed on the proleptic Gregorian ordinal."""
+    # Check weekend (Saturday=5, Sunday=6); ordinal 1 (0001-01-01) is a Monday
+    if (ordinal + 6) % 7 >= 5:
         return False
     
     # Check Korean market holidays using pykrx
-    year_holidays = get_market_holidays(target_date.year)
-    if target_date in year_holidays:
-        return False
-    
-    return True
+    target_date = date.fromordinal(ordinal)
+    return target_date not in _year_holidays_fast(target_date.year)
+
+
+def _year_holidays_fast(year: int) -> FrozenSet[date]:
+    """Read the cached holiday set directly, loading it only on a miss."""
+    holidays = _HOLIDAY_CACHE.get(year)
+    if holidays is None:
+        holidays = _get_holiday_set(year)
+    return holidays
 
 
 def get_previous_business_day(target_date: date) -> date:
     """Get the previous business day."""
-    prev_date = target_date - timedelta(days=1)
-    
-    while not is_business_day(prev_date):
-        prev_date -= timedelta(days=1)
-    
-    return prev_date
+    # The span starts a year earlier, so a business day always precedes target_date
+    business_days = _business_day_index(target_date.year - 1, target_date.year)
+    idx = np.searchsorted(business_days, np.datetime64(target_date, 'D'), side='left')
+    return business_days[idx - 1].item()
 
 
 def get_next_business_day(target_date: date) -> date:
     """Get the next business day."""
-    next_date = target_date + timedelta(days=1)
-    
-    while not is_business_day(next_date):
-        next_date += timedelta(days=1)
+    # The span ends a year later, so a business day always follows target_date
+    business_days = _business_day_index(target_date.year, target_date.year + 1)
+    idx = np.searchsorted(business_days, np.datetime64(target_date, 'D'), side='right')
+    return business_days[idx].item()
+
+
+@lru_cache(maxsize=64)
+def _business_day_index(start_year: int, end_year: int) -> np.ndarray:
+    """Sorted datetime64[D] array of every business day in the year span."""
+    days = np.arange(
+        np.datetime64(date(start_year, 1, 1), 'D'),
+        np.datetime64(date(end_year + 1, 1, 1), 'D'),
+        dtype='datetime64[D]'
+    )
+    return days[np.is_busday(days, busdaycal=_busday_calendar(start_year, end_year))]
+
+
+@lru_cache(maxsize=64)
+def _busday_calendar(start_year: int, end_year: int) -> np.busdaycalendar:
+    """Build a NumPy business-day calendar covering holidays of the year span."""
+    holidays = set()
+    for year in range(start_year, end_year + 1):
+        holidays.update(_get_holiday_set(year))
     
-    return next_date
+    return np.busdaycalendar(holidays=np.array(sorted(holidays), dtype='datetime64[D]'))
 
 
 def get_business_days_between(start_date: date, end_date: date, 
@@ -126,24 +275,22 @@ def get_business_days_between(start_date: date, end_date: date,
     if start_date > end_date:
         return []
     
-    business_days = []
-    current_date = start_date
-    
-    # Handle start date
-    if not include_start:
-        current_date = current_date + timedelta(days=1)
+    # Handle start/end inclusion
+    first_date = start_date if include_start else start_date + timedelta(days=1)
+    last_date = end_date if include_end else end_date - timedelta(days=1)
     
-    # Handle end date
-    actual_end_date = end_date
-    if not include_end:
-        actual_end_date = actual_end_date - timedelta(days=1)
+    if first_date > last_date:
+        return []
     
-    while current_date <= actual_end_date:
-        if is_business_day(current_date):
-            business_days.append(current_date)
-        current_date += timedelta(days=1)
+    days = np.arange(
+        np.datetime64(first_date, 'D'),
+        np.datetime64(last_date, 'D') + 1,
+        dtype='datetime64[D]'
+    )
+    mask = np.is_busday(days, busdaycal=_busday_calendar(first_date.year, last_date.year))
     
-    return business_days
+    # datetime64[D].tolist() yields datetime.date objects
+    return days[mask].tolist()
 
 
 def get_recent_business_days(count: int, end_date: Optional[date] = None) -> List[date]:
@@ -151,15 +298,22 @@ def get_recent_business_days(count: int, end_date: Optional[date] = None) -> Lis
     if end_date is None:
         end_date = get_kst_today()
     
-    business_days = []
-    current_date = end_date
+    # History is not looked up before 2020-01-01
+    floor_year = 2020
+    if count <= 0 or end_date.year < floor_year:
+        return []
     
-    while len(business_days) < count and current_date >= date(2020, 1, 1):
-        if is_business_day(current_date):
-            business_days.append(current_date)
-        current_date -= timedelta(days=1)
+    years_back = count // 240 + 1
+    start_year = max(end_date.year - years_back, floor_year)
+    end = np.datetime64(end_date, 'D')
+    while True:
+        business_days = _business_day_index(start_year, end_date.year)
+        end_idx = np.searchsorted(business_days, end, side='right')
+        if end_idx >= count or start_year == floor_year:
+            break
+        start_year = max(start_year - years_back, floor_year)
     
-    return sorted(business_days)
+    return business_days[max(end_idx - count, 0):end_idx].tolist()
 
 
 def get_last_n_months_business_days(months: int, 
@@ -168,32 +322,28 @@ def get_last_n_months_business_days(months: int,
     if end_date is None:
         end_date = get_kst_today()
     
-    # Calculate start date (approximately)
-    start_year = end_date.year
-    start_month = end_date.month - months
-    
-    if start_month <= 0:
-        start_year -= 1
-        start_month += 12
-    
-    start_date = date(start_year, start_month, 1)
+    # relativedelta handles windows longer than a year, which plain month subtraction did not
+    start_date = (end_date - relativedelta(months=months)).replace(day=1)
     
     return get_business_days_between(start_date, end_date)
 
 
-def is_market_open_time() -> bool:
-    """Check if Korean stock market is currently open."""
-    now_kst = get_kst_now()
+def _compute_market_state(now_kst: datetime) -> Tuple[bool, bool, datetime, datetime]:
+    """Derive (is_business, is_open, market_open, market_close) for a KST timestamp."""
+    today = now_kst.date()
+    market_open = datetime.combine(today, MARKET_OPEN_TIME, tzinfo=now_kst.tzinfo)
+    market_close = datetime.combine(today, MARKET_CLOSE_TIME, tzinfo=now_kst.tzinfo)
     
     # Market is closed on weekends and holidays
-    if not is_business_day(now_kst.date()):
-        return False
-    
-    # Market hours: 9:00 - 15:30 KST
-    market_open = now_kst.replace(hour=9, minute=0, second=0, microsecond=0)
-    market_close = now_kst.replace(hour=15, minute=30, second=0, microsecond=0)
+    is_business = is_business_day(today)
+    is_open = is_business and market_open <= now_kst <= market_close
     
-    return market_open <= now_kst <= market_close
+    return is_business, is_open, market_open, market_close
+
+
+def is_market_open_time() -> bool:
+    """Check if Korean stock market is currently open."""
+    return _compute_market_state(get_kst_now())[1]
 
 
 def get_market_status() -> dict:
@@ -201,8 +351,7 @@ def get_market_status() -> dict:
     now_kst = get_kst_now()
     today = now_kst.date()
     
-    is_business = is_business_day(today)
-    is_open = is_market_open_time()
+    is_business, is_open, market_open, market_close = _compute_market_state(now_kst)
     
     status = {
         "current_kst_time": now_kst.strftime("%Y-%m-%d %H:%M:%S KST"),
@@ -213,9 +362,6 @@ def get_market_status() -> dict:
     }
     
     if is_business:
-        market_open = now_kst.replace(hour=9, minute=0, second=0, microsecond=0)
-        market_close = now_kst.replace(hour=15, minute=30, second=0, microsecond=0)
-        
         status.update({
             "market_open_time": market_open.strftime("%H:%M:%S KST"),
             "market_close_time": market_close.strftime("%H:%M:%S KST")
@@ -225,14 +371,14 @@ def get_market_status() -> dict:
             status["market_opens_in"] = str(market_open - now_kst)
         elif now_kst > market_close:
             next_business_day = get_next_business_day(today)
-            next_open = settings.kst_timezone.localize(
-                datetime.combine(next_business_day, market_open.time())
+            next_open = datetime.combine(
+                next_business_day, MARKET_OPEN_TIME, tzinfo=settings.kst_timezone
             )
             status["next_market_open"] = next_open.strftime("%Y-%m-%d %H:%M:%S KST")
     else:
         next_business_day = get_next_business_day(today)
-        next_open = settings.kst_timezone.localize(
-            datetime.combine(next_business_day, datetime.min.time().replace(hour=9))
+        next_open = datetime.combine(
+            next_business_day, MARKET_OPEN_TIME, tzinfo=settings.kst_timezone
         )
         status["next_market_open"] = next_open.strftime("%Y-%m-%d %H:%M:%S KST")
     
@@ -264,16 +410,26 @@ def format_date_for_display(target_date: date) -> str:
     return target_date.strftime("%Y년 %m월 %d일")
 
 
+_DATE_FORMATS = ("%Y-%m-%d", "%Y%m%d", "%Y.%m.%d", "%Y/%m/%d")
+
+
 def parse_date_string(date_str: str) -> Optional[date]:
     """Parse date string in various formats."""
-    formats = [
-        "%Y-%m-%d",
-        "%Y%m%d", 
-        "%Y.%m.%d",
-        "%Y/%m/%d"
-    ]
-    
-    for fmt in formats:
+    # Fast path for the zero-padded forms; anything else goes through strptime
+    n = len(date_str)
+    try:
+        if n == 8 and date_str.isdigit():
+            return date(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:]))
+        if n == 10:
+            sep = date_str[4]
+            if sep in '-./' and date_str[7] == sep:
+                year, month, day = date_str[:4], date_str[5:7], date_str[8:]
+                if year.isdigit() and month.isdigit() and day.isdigit():
+                    return date(int(year), int(month), int(day))
+    except ValueError:
+        pass
+
+    for fmt in _DATE_FORMATS:
         try:
             return datetime.strptime(date_str, fmt).date()
         except ValueError:
@@ -297,34 +453,30 @@ def calculate_business_days_ago(days_ago: int,
     if reference_date is None:
         reference_date = get_kst_today()
     
-    current_date = reference_date
-    business_days_counted = 0
-    
-    while business_days_counted < days_ago:
-        current_date -= timedelta(days=1)
-        if is_business_day(current_date):
-            business_days_counted += 1
+    if days_ago <= 0:
+        return reference_date
     
-    return current_date
+    # Start with a span that normally holds enough business days (~245 per year)
+    # and widen it only when it falls short
+    reference = np.datetime64(reference_date, 'D')
+    years_back = days_ago // 240 + 1
+    start_year = reference_date.year - years_back
+    while True:
+        business_days = _business_day_index(start_year, reference_date.year)
+        idx = np.searchsorted(business_days, reference, side='left') - days_ago
+        if idx >= 0:
+            return business_days[idx].item()
+        start_year -= years_back
 
 
 def get_quarter_business_days(year: int, quarter: int) -> List[date]:
     """Get all business days in a specific quarter."""
-    quarter_months = {
-        1: [1, 2, 3],
-        2: [4, 5, 6], 
-        3: [7, 8, 9],
-        4: [10, 11, 12]
-    }
-    
-    if quarter not in quarter_months:
+    if quarter not in (1, 2, 3, 4):
         raise ValueError("Quarter must be 1, 2, 3, or 4")
     
-    months = quarter_months[quarter]
-    start_date = date(year, months[0], 1)
+    start_date = date(year, quarter * 3 - 2, 1)
     
-    # Get last day of last month in quarter
-    _, last_day = monthrange(year, months[2])
-    end_date = date(year, months[2], last_day)
+    # Last day of the quarter is the day before the next quarter starts
+    end_date = date(year + (quarter == 4), (quarter * 3) % 12 + 1, 1) - timedelta(days=1)
     
     return get_business_days_between(start_date, end_date)
\ No newline at end of file
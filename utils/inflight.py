@@ -0,0 +1,35 @@
+"""
+Concurrency cap for API handlers that call the AI provider.
+"""
+import asyncio
+
+from fastapi import HTTPException
+
+from config import settings
+
+
+class InflightLimiter:
+    """Async context manager allowing at most `limit` bodies to run at once.
+
+    A caller that cannot get a slot within `acquire_timeout` seconds gets a
+    429 instead of queueing behind a burst until the provider times out.
+    """
+
+    def __init__(self, limit: int, acquire_timeout: float = 2.0):
+        self.limit = limit
+        self.acquire_timeout = acquire_timeout
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __aenter__(self) -> "InflightLimiter":
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=429, detail="Server busy, please retry shortly")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._semaphore.release()
+
+
+# Shared by every AI route so the cap matches the provider's concurrent-request budget
+ai_limiter = InflightLimiter(settings.ai_max_inflight, settings.ai_acquire_timeout)
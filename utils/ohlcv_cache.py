@@ -0,0 +1,115 @@
+"""
+Local Parquet cache of per-ticker OHLCV history for the hourly analysis job.
+"""
+from datetime import date
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+import shutil
+
+import pandas as pd
+
+from repositories import StockDataRepository
+from schemas import OHLCVData
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path("cache/ohlcv")
+
+
+def is_cache_available() -> bool:
+    """Parquet I/O needs pyarrow; without it callers read straight from MongoDB."""
+    return find_spec("pyarrow") is not None
+
+
+def load_history(tickers: List[str], start_date: date,
+                 end_date: date) -> Dict[str, List[OHLCVData]]:
+    """Get OHLCV history for tickers, reading MongoDB only for rows not yet cached."""
+    if not is_cache_available():
+        logger.warning("pyarrow not installed; OHLCV cache disabled")
+        return StockDataRepository.get_date_range_bulk(tickers, start_date, end_date)
+
+    cached = {ticker: _read_cache(ticker) for ticker in tickers}
+    uncached = [ticker for ticker, frame in cached.items() if frame is None]
+
+    # Upserts restamp created_at, so this also picks up backfilled or corrected
+    # dates inside the cached window; restores and deletes drop the ticker's
+    # file instead (see invalidate)
+    since = {
+        ticker: frame["created_at"].max().to_pydatetime()
+        for ticker, frame in cached.items()
+        if frame is not None and frame["created_at"].notna().any()
+    }
+    uncached.extend(t for t, frame in cached.items() if frame is not None and t not in since)
+
+    fresh = StockDataRepository.get_date_range_bulk(uncached, start_date, end_date)
+    fresh.update(StockDataRepository.get_changed_since_bulk(since, start_date, end_date))
+
+    history = {}
+    for ticker in tickers:
+        frame = _merge(cached[ticker] if ticker in since else None, fresh.get(ticker, []))
+        frame = frame[(frame["date"] >= start_date.isoformat()) & (frame["date"] <= end_date.isoformat())]
+        _write_cache(ticker, frame)
+        history[ticker] = _to_ohlcv(frame)
+
+    logger.info(f"Loaded OHLCV history for {len(tickers)} tickers ({len(since)} from cache)")
+    return history
+
+
+def invalidate(ticker: str) -> None:
+    """Delete one ticker's cached file so its next load rereads the full window.
+    
+    Needed after writes the created_at refresh cannot see: rows restored with
+    their original created_at and rows deleted from MongoDB.
+    """
+    _cache_path(ticker).unlink(missing_ok=True)
+
+
+def clear_cache() -> None:
+    """Delete every cached ticker file so the next run reloads from MongoDB."""
+    if CACHE_DIR.exists():
+        shutil.rmtree(CACHE_DIR)
+        logger.info(f"Cleared OHLCV cache at {CACHE_DIR}")
+
+
+def _cache_path(ticker: str) -> Path:
+    return CACHE_DIR / f"{ticker}.parquet"
+
+
+def _read_cache(ticker: str) -> Optional[pd.DataFrame]:
+    """Read a ticker's cached frame, treating unreadable files as a cache miss."""
+    path = _cache_path(ticker)
+    if not path.exists():
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable OHLCV cache for {ticker}: {e}")
+        return None
+
+
+def _write_cache(ticker: str, frame: pd.DataFrame) -> None:
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        frame.to_parquet(_cache_path(ticker), index=False)
+    except Exception as e:
+        logger.warning(f"Failed to write OHLCV cache for {ticker}: {e}")
+
+
+def _merge(cached: Optional[pd.DataFrame], rows: List[OHLCVData]) -> pd.DataFrame:
+    """Combine cached and freshly read rows; fresh rows win on the same date."""
+    fresh = pd.DataFrame(
+        [{**row.model_dump(), "date": row.date.isoformat()} for row in rows],
+        columns=list(OHLCVData.model_fields)
+    )
+    fresh["created_at"] = pd.to_datetime(fresh["created_at"])
+    frames = [fresh] if cached is None else [cached, fresh]
+    merged = pd.concat(frames, ignore_index=True)
+    return merged.drop_duplicates("date", keep="last").sort_values("date", ignore_index=True)
+
+
+def _to_ohlcv(frame: pd.DataFrame) -> List[OHLCVData]:
+    # NaT/NaN become None so optional fields validate
+    records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    return [OHLCVData(**record) for record in records]
@@ -0,0 +1,20 @@
+"""
+Parsing of comma-separated KRX ticker query parameters.
+"""
+from typing import List, Optional
+import re
+
+# Six-character KRX short codes (digits, or digits and capitals for newer listings)
+TICKER_LIST_RE = re.compile(r"[0-9A-Z]{6}(?:,[0-9A-Z]{6})*")
+
+
+def parse_ticker_csv(tickers: str) -> Optional[List[str]]:
+    """Split "005930,000660" into tickers, or None when the string is malformed.
+
+    Spaces are dropped first so "005930, 000660" is still accepted; the whole
+    string is validated by one regex match, so the split needs no per-item strip.
+    """
+    tickers = tickers.replace(" ", "")
+    if not TICKER_LIST_RE.fullmatch(tickers):
+        return None
+    return tickers.split(",")
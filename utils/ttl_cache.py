@@ -0,0 +1,81 @@
+"""
+Time-based caches for read-mostly async API handlers and AI responses.
+"""
+from functools import wraps
+from hashlib import blake2b
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+import json
+import time
+
+T = TypeVar("T")
+
+
+def async_ttl_cache(ttl: float) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Cache an async function's result per argument set for `ttl` seconds.
+
+    Only successful results are stored; exceptions propagate and the next call
+    retries. The wrapper keeps the wrapped signature, so FastAPI still sees the
+    handler's parameters. The cached object is returned as-is, so callers must
+    not mutate it. `cache_clear()` drops every entry.
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        entries: Dict[Tuple[Any, ...], Tuple[float, T]] = {}
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            entry = entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            value = await func(*args, **kwargs)
+            entries[key] = (now + ttl, value)
+            return value
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+
+    return decorator
+
+
+def cache_key(*parts: Any) -> str:
+    """Stable digest of JSON-serializable request parts (dict keys are sorted)."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class TTLCache:
+    """Bounded in-process key -> value store whose entries expire `ttl` seconds after being set.
+
+    When full, expired entries are dropped first, then the oldest insertion.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a live entry, or None when it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting to stay within maxsize."""
+        now = time.monotonic()
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.maxsize:
+            for stale in [k for k, (expiry, _) in self._entries.items() if expiry <= now]:
+                del self._entries[stale]
+            if len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (now + self.ttl, value)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()